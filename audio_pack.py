@@ -0,0 +1,247 @@
+import json
+import mmap
+import os
+import struct
+from typing import Dict, List, Optional
+
+import arcade
+import numpy as np
+from pyglet import media
+from pyglet.media.codecs.base import AudioData, AudioFormat, StaticMemorySource, StaticSource
+
+
+# Формат пакета: все звуки - моно, 16 бит, PACK_RATE Гц (моно нужно и для
+# панорамы в OpenAL). Громкость выравнивается к TARGET_RMS без клиппинга.
+PACK_PATH = 'data/sounds.pack'
+PACK_MAGIC = b'FEARPAK1'
+PACK_RATE = 44100
+PACK_CHANNELS = 1
+PACK_SAMPLE_SIZE = 16
+TARGET_RMS = 0.1
+PEAK_LIMIT = 0.98
+_HEADER = struct.Struct('<8sI')
+_ALIGN = 16
+
+
+def decode_pcm(path: str) -> Optional[np.ndarray]:
+    """Декодировать файл в float32 моно PACK_RATE Гц (None - не декодируется)"""
+    try:
+        source = media.load(path, streaming=True)
+    except Exception as e:
+        print(f"Не удалось декодировать {path}: {e}")
+        return None
+
+    audio_format = source.audio_format
+    chunks = []
+    while True:
+        audio_data = source.get_audio_data(1 << 16)
+        if audio_data is None:
+            break
+        chunks.append(bytes(audio_data.data[:audio_data.length]))
+    source.delete()
+    raw = b''.join(chunks)
+
+    if audio_format.sample_size == 8:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    else:
+        samples = np.frombuffer(raw[:len(raw) // 2 * 2], dtype='<i2').astype(np.float32) / 32768.0
+
+    channels = audio_format.channels
+    samples = samples[:len(samples) // channels * channels].reshape(-1, channels).mean(axis=1)
+
+    if audio_format.sample_rate != PACK_RATE and len(samples):
+        duration = len(samples) / audio_format.sample_rate
+        positions = np.arange(int(duration * PACK_RATE)) * (audio_format.sample_rate / PACK_RATE)
+        samples = np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+    return samples
+
+
+def normalize(samples: np.ndarray) -> np.ndarray:
+    """Выровнять громкость по RMS, не поднимая пик выше PEAK_LIMIT"""
+    if not len(samples):
+        return samples
+    rms = float(np.sqrt(np.mean(samples * samples)))
+    peak = float(np.abs(samples).max())
+    if rms <= 0 or peak <= 0:
+        return samples
+    gain = min(TARGET_RMS / rms, PEAK_LIMIT / peak)
+    return samples * gain
+
+
+def build_pack(folder: str = 'custom_sounds', pack_path: str = PACK_PATH) -> Dict[str, int]:
+    """Собрать пакет из всех звуков папки; вернуть число упакованных и пропущенных"""
+    # Манифест импортирует реестр, а реестр - пакет
+    from audio_registry import should_stream
+    from sound_manifest import sound_manifest
+
+    entries = []
+    blobs = []
+    offset = 0
+    skipped = 0
+    # Музыка и длинные клипы играют потоком и в пакет не входят
+    music_folder = os.path.join(os.path.normpath(folder), 'music') + os.sep
+    for sound in sound_manifest.sounds(folder):
+        if os.path.normpath(sound['path']).startswith(music_folder):
+            continue
+        if should_stream(sound['duration'], sound['size']):
+            continue
+        samples = decode_pcm(sound['path'])
+        if samples is None:
+            skipped += 1
+            continue
+        pcm = (np.clip(normalize(samples), -1.0, 1.0) * 32767).astype('<i2').tobytes()
+        padding = -len(pcm) % _ALIGN
+        entries.append({
+            'path': os.path.normpath(sound['path']),
+            'size': sound['size'],
+            'mtime': sound['mtime'],
+            'offset': offset,
+            'length': len(pcm)
+        })
+        blobs.append(pcm + b'\0' * padding)
+        offset += len(pcm) + padding
+
+    index = json.dumps({
+        'rate': PACK_RATE,
+        'channels': PACK_CHANNELS,
+        'sample_size': PACK_SAMPLE_SIZE,
+        'sounds': entries
+    }, ensure_ascii=False).encode('utf-8')
+    index += b' ' * (-(_HEADER.size + len(index)) % _ALIGN)
+
+    os.makedirs(os.path.dirname(pack_path) or '.', exist_ok=True)
+    with open(pack_path, 'wb') as f:
+        f.write(_HEADER.pack(PACK_MAGIC, len(index)))
+        f.write(index)
+        for blob in blobs:
+            f.write(blob)
+
+    return {'packed': len(entries), 'skipped': skipped, 'bytes': offset}
+
+
+class PackedSound(arcade.Sound):
+    """Звук из пакета: источник строится из памяти, без открытия и декодирования файла"""
+
+    def __init__(self, file_name: str, source: StaticSource):
+        self.file_name = file_name
+        self.source = source
+        self.min_distance = 100000000
+
+
+class _PackedSource(StaticSource):
+    """PCM из отображенного в память пакета (memoryview, без копии в куче)"""
+
+    def __init__(self, data: memoryview, audio_format: AudioFormat):
+        self.audio_format = audio_format
+        self._data = data
+        self._duration = len(data) / audio_format.bytes_per_second
+
+    def get_queue_source(self) -> '_MappedQueueSource':
+        return _MappedQueueSource(self._data, self.audio_format)
+
+
+class _MappedQueueSource(StaticMemorySource):
+    """Источник для плеера: читает пакеты прямо из отображения
+
+    StaticMemorySource оборачивает данные в BytesIO, а это скопировало бы
+    весь звук при каждом запуске; здесь копируется только читаемый кусок.
+    """
+
+    def __init__(self, data: memoryview, audio_format: AudioFormat):
+        self._data = data
+        self._offset = 0
+        self._max_offset = len(data)
+        self.audio_format = audio_format
+        self._duration = len(data) / audio_format.bytes_per_second
+
+    def seek(self, timestamp: float):
+        offset = self.audio_format.align(int(timestamp * self.audio_format.bytes_per_second))
+        self._offset = min(offset, self._max_offset)
+
+    def get_audio_data(self, num_bytes: float, compensation_time: float = 0.0) -> Optional[AudioData]:
+        if self._offset >= self._max_offset:
+            return None
+        start = self._offset
+        data = bytes(self._data[start:start + int(num_bytes)])
+        self._offset += len(data)
+
+        bytes_per_second = self.audio_format.bytes_per_second
+        return AudioData(data, len(data), start / bytes_per_second, len(data) / bytes_per_second)
+
+
+class AudioPack:
+    """Пакет звуков, отображенный в память
+
+    Файл открывается один раз при первом обращении, тогда же один раз
+    проверяется, не менялись ли исходные файлы после сборки (размер и
+    mtime). sound(path) отдает звук, чьи данные остаются в отображении,
+    если исходный файл упакован и не менялся; иначе None, и звук грузится
+    из файла.
+    """
+
+    def __init__(self, path: Optional[str] = PACK_PATH):
+        self.path = path
+        self._opened = False
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self._view: Optional[memoryview] = None
+        self._data_start = 0
+        self._entries: Dict[str, dict] = {}
+        self._format: Optional[AudioFormat] = None
+
+    def sound(self, path: str) -> Optional[PackedSound]:
+        self._open()
+        entry = self._entries.get(os.path.normpath(path))
+        if entry is None or not entry['fresh']:
+            return None
+
+        start = self._data_start + entry['offset']
+        data = self._view[start:start + entry['length']]
+        return PackedSound(path, _PackedSource(data, self._format))
+
+    def names(self) -> List[str]:
+        self._open()
+        return list(self._entries)
+
+    def _open(self):
+        if self._opened:
+            return
+        self._opened = True
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            self._file = open(self.path, 'rb')
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, index_length = _HEADER.unpack_from(self._map, 0)
+            if magic != PACK_MAGIC:
+                raise ValueError("неизвестный формат")
+            index = json.loads(self._map[_HEADER.size:_HEADER.size + index_length].decode('utf-8'))
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Не удалось открыть пакет звуков {self.path}: {e}")
+            self._entries = {}
+            return
+
+        self._data_start = _HEADER.size + index_length
+        self._view = memoryview(self._map)
+        self._format = AudioFormat(index['channels'], index['sample_size'], index['rate'])
+        self._entries = {entry['path']: entry for entry in index['sounds']}
+        for path, entry in self._entries.items():
+            entry['fresh'] = self._is_fresh(path, entry)
+
+    @staticmethod
+    def _is_fresh(path: str, entry: dict) -> bool:
+        """Исходный файл не менялся после сборки пакета"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        return stat.st_size == entry['size'] and stat.st_mtime == entry['mtime']
+
+
+audio_pack = AudioPack()
+
+
+if __name__ == "__main__":
+    result = build_pack()
+    print(f"Упаковано звуков: {result['packed']}, пропущено: {result['skipped']}, "
+          f"PCM: {result['bytes'] / 1024 / 1024:.1f} МБ -> {PACK_PATH}")
@@ -0,0 +1,367 @@
+import itertools
+import os
+import queue
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Future
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import arcade
+
+from audio_pack import PackedSound, audio_pack
+from config import AUDIO_MEMORY_BUDGET_MB, AUDIO_STREAM_MIN_SECONDS
+
+
+AUDIO_EXTENSIONS = ('.wav', '.ogg', '.mp3')
+
+# Фоновая загрузка: число потоков и приоритеты (меньше - раньше)
+LOADER_WORKERS = 2
+CRITICAL_PRIORITY = 1
+
+# Политика памяти: длинные клипы играют потоком, короткие держатся в памяти
+# в пределах бюджета. Для файлов без известной длительности (сжатых) она
+# оценивается по размеру при ~128 кбит/с
+AUDIO_MEMORY_BUDGET = AUDIO_MEMORY_BUDGET_MB * 1024 * 1024
+STREAM_MIN_DURATION = AUDIO_STREAM_MIN_SECONDS
+COMPRESSED_BYTES_PER_SECOND = 16000
+
+
+def should_stream(duration: Optional[float], size: int) -> bool:
+    """Играть ли клип потоком, а не держать в памяти"""
+    if duration is None:
+        duration = size / COMPRESSED_BYTES_PER_SECOND
+    return duration > STREAM_MIN_DURATION
+
+
+def resident_size(sound: Optional[arcade.Sound]) -> int:
+    """Сколько байт PCM декодированный звук занимает в куче
+
+    PCM звука из пакета лежит в отображенном файле, его страницами управляет
+    ОС, поэтому такой звук бюджет памяти не расходует.
+    """
+    if sound is None or isinstance(sound, PackedSound):
+        return 0
+    return len(getattr(sound.source, '_data', b''))
+
+
+class AudioHandle:
+    """Ссылка на звуковой файл из реестра
+
+    Файл декодируется при первом обращении к sound (или при preload) и
+    дальше используется всеми держателями ссылки. Потоковый звук (музыка,
+    длинные клипы) проигрывается только одним плеером, поэтому ссылка
+    держит открытые потоки: свободный (плеер доиграл или был очищен)
+    отдается снова с начала, а новый открывается, только если все заняты.
+    Каждое обращение к звуку в памяти сообщается реестру, который по ним
+    вытесняет давно не звучавшее.
+    """
+
+    def __init__(self, path: str, streaming: bool = False, group: str = '',
+                 registry: Optional['AudioRegistry'] = None):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.streaming = streaming
+        self.group = group
+        self.registry = registry
+        self.refs = 0
+        self.failed = False
+        self.pinned = False
+        self.size = 0
+        self.last_used = 0.0
+        self.future: Optional[Future] = None
+        self._sound: Optional[arcade.Sound] = None
+        self._streams: List[arcade.Sound] = []
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._sound is not None or bool(self._streams)
+
+    @property
+    def pending(self) -> bool:
+        """Звук стоит в очереди фоновой загрузки или декодируется"""
+        return self.future is not None and not self.future.done()
+
+    @property
+    def sound(self) -> Optional[arcade.Sound]:
+        """Звук (None, если файл не загружается)"""
+        if self.streaming:
+            return self._free_stream()
+        sound = self._sound
+        if sound is None and not self.failed:
+            # Замок: фоновый поток и игра не декодируют файл дважды
+            with self._lock:
+                sound = self._sound
+                if sound is None and not self.failed:
+                    sound = self._sound = self._load()
+                    self.size = resident_size(sound)
+        if sound is not None and self.registry is not None:
+            self.registry.touch(self)
+        return sound
+
+    def _free_stream(self) -> Optional[arcade.Sound]:
+        """Открытый поток, который не играет ни в одном плеере"""
+        with self._lock:
+            for sound in self._streams:
+                if not sound.source.is_player_source:
+                    sound.source.seek(0.0)
+                    return sound
+            sound = self._load()
+            if sound is not None:
+                self._streams.append(sound)
+            return sound
+
+    def _load(self) -> Optional[arcade.Sound]:
+        if self.failed:
+            return None
+        if not self.streaming:
+            # Готовый PCM из пакета: без открытия и декодирования файла
+            sound = audio_pack.sound(self.path)
+            if sound is not None:
+                return sound
+        try:
+            return arcade.load_sound(self.path, streaming=self.streaming)
+        except Exception as e:
+            # Битый файл не пытаемся декодировать повторно
+            self.failed = True
+            print(f"Не удалось загрузить звук {self.path}: {e}")
+            return None
+
+    def unload(self):
+        self._sound = None
+        self._streams = []
+
+    def play(self, volume: float = 1.0, loop: bool = False):
+        """Воспроизвести звук, вернуть плеер (или None, пока звук грузится в фоне)"""
+        if self.pending:
+            return None
+        sound = self.sound
+        if sound is None:
+            return None
+        return sound.play(volume=volume, loop=loop)
+
+
+def _all_done(futures: List[Future]) -> Future:
+    """Future, который завершается вместе с последним из futures"""
+    result = Future()
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def on_done(_):
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            result.set_result(None)
+
+    if not futures:
+        result.set_result(None)
+    for future in futures:
+        future.add_done_callback(on_done)
+    return result
+
+
+class PreloadBatch:
+    """Ход фоновой загрузки набора звуков
+
+    progress - доля загруженных, ready - Future критичных звуков (скримеры,
+    сердцебиение), complete - Future всех звуков. Экран загрузки или меню
+    опрашивают их в on_update/on_draw, не блокируя игру.
+    """
+
+    def __init__(self, futures: List[Future], critical: List[Future]):
+        self.futures = futures
+        self.ready = _all_done(critical)
+        self.complete = _all_done(futures)
+
+    @property
+    def progress(self) -> float:
+        if not self.futures:
+            return 1.0
+        return sum(1 for future in self.futures if future.done()) / len(self.futures)
+
+    @property
+    def done(self) -> bool:
+        return self.complete.done()
+
+
+class AudioLoader:
+    """Пул потоков, декодирующих звуки по приоритету
+
+    Очередь общая для всех запросов: критичный звук новой сцены обгоняет
+    фоновые звуки, поставленные раньше. Потоковые звуки здесь же заранее
+    открываются. Потоки создаются при первой задаче.
+    """
+
+    def __init__(self, workers: int = LOADER_WORKERS):
+        self.workers = workers
+        self._queue = queue.PriorityQueue()
+        self._order = itertools.count()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def submit(self, handle: AudioHandle, priority: int) -> Future:
+        """Поставить звук в очередь, вернуть Future его загрузки"""
+        with self._lock:
+            if handle.future is None:
+                handle.future = Future()
+                if handle.loaded or handle.failed:
+                    handle.future.set_result(handle)
+                    return handle.future
+            elif handle.future.done():
+                return handle.future
+
+            # Повторный запрос с другим приоритетом просто добавляет запись:
+            # звук загрузит та, что раньше выйдет из очереди
+            self._queue.put((priority, next(self._order), handle))
+            self._start_workers()
+            return handle.future
+
+    def _start_workers(self):
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, name="audio-loader", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def _work(self):
+        while True:
+            priority, order, handle = self._queue.get()
+            # Выгрузка обнуляет future, а в очереди могут остаться старые записи звука
+            with self._lock:
+                future = handle.future
+            if future is not None and not future.done():
+                try:
+                    handle.sound
+                except Exception as e:
+                    print(f"Не удалось загрузить звук {handle.path}: {e}")
+                with self._lock:
+                    if not future.done():
+                        future.set_result(handle)
+            self._queue.task_done()
+
+
+class AudioRegistry:
+    """Общий для всего процесса реестр звуков
+
+    SoundManager и MusicManager берут ссылки через acquire() и отдают через
+    release(); на один файл приходится одна ссылка и одно декодирование,
+    сколько бы сцен ни создавалось. Списки файлов в папках тоже
+    сканируются один раз.
+
+    Декодированные звуки занимают не больше budget байт: при превышении
+    выгружаются звуки из групп (категорий), которые дольше всех не звучали,
+    сначала те, что никому не нужны. Закрепленные (критичные) звуки не
+    выгружаются. Выгруженный звук снова загрузится при следующем обращении.
+    """
+
+    def __init__(self, budget: int = AUDIO_MEMORY_BUDGET):
+        self._handles: Dict[Tuple[str, bool], AudioHandle] = {}
+        self._listings: Dict[Tuple[str, bool], List[str]] = {}
+        self.loader = AudioLoader()
+        self.budget = budget
+        self.resident_bytes = 0
+        self.evicted = 0
+        self._resident: Dict[int, AudioHandle] = {}
+        self._group_used: Dict[str, float] = defaultdict(float)
+        self._lock = threading.RLock()
+
+    def files(self, folder: str, recursive: bool = True) -> List[str]:
+        """Звуковые файлы папки (пустой список, если папки нет)"""
+        key = (os.path.normpath(folder), recursive)
+        listing = self._listings.get(key)
+        if listing is None:
+            listing = []
+            if os.path.isdir(folder):
+                if recursive:
+                    for root, dirs, files in os.walk(folder):
+                        dirs.sort()
+                        listing.extend(os.path.join(root, file) for file in sorted(files))
+                else:
+                    listing = [os.path.join(folder, file) for file in sorted(os.listdir(folder))]
+                listing = [path for path in listing if path.lower().endswith(AUDIO_EXTENSIONS)]
+            self._listings[key] = listing
+        return list(listing)
+
+    def acquire(self, path: str, streaming: bool = False, group: str = '') -> AudioHandle:
+        """Взять ссылку на звук (без загрузки); group - категория для вытеснения"""
+        key = (os.path.normpath(path), streaming)
+        handle = self._handles.get(key)
+        if handle is None:
+            handle = AudioHandle(path, streaming, group, registry=self)
+            self._handles[key] = handle
+        handle.refs += 1
+        return handle
+
+    def release(self, handle: AudioHandle):
+        """Отдать ссылку"""
+        handle.refs = max(0, handle.refs - 1)
+
+    def preload(self, handles: Iterable[AudioHandle]):
+        """Декодировать звуки заранее, при загрузке сцены"""
+        for handle in handles:
+            if not handle.streaming:
+                handle.sound
+
+    def preload_async(self, handles: Iterable[Tuple[AudioHandle, int]],
+                      critical: int = CRITICAL_PRIORITY) -> PreloadBatch:
+        """Декодировать звуки в фоне: пары (ссылка, приоритет), меньший приоритет - раньше"""
+        ordered = sorted(handles, key=lambda item: item[1])
+        futures = []
+        critical_futures = []
+        for handle, priority in ordered:
+            future = self.loader.submit(handle, priority)
+            futures.append(future)
+            if priority <= critical:
+                # Критичные звуки должны сработать без задержки на загрузку
+                handle.pinned = True
+                critical_futures.append(future)
+        return PreloadBatch(futures, critical_futures)
+
+    def touch(self, handle: AudioHandle):
+        """Отметить обращение к звуку; новый звук в памяти может вытеснить старые"""
+        now = time.monotonic()
+        with self._lock:
+            handle.last_used = now
+            self._group_used[handle.group] = now
+            # Бюджет - только для PCM в куче: выгрузка звука из пакета или потока память не освободит
+            if id(handle) not in self._resident and handle.loaded and handle.size > 0:
+                self._resident[id(handle)] = handle
+                self.resident_bytes += handle.size
+                self._enforce_budget(keep=handle)
+
+    def _enforce_budget(self, keep: AudioHandle):
+        """Выгружать звуки, пока память не уложится в бюджет"""
+        if self.resident_bytes <= self.budget:
+            return
+        candidates = [handle for handle in self._resident.values()
+                      if handle is not keep and not handle.pinned and not handle.pending]
+        # Сначала ненужные никому, затем по давности группы и самого звука
+        candidates.sort(key=lambda handle: (handle.refs > 0, self._group_used[handle.group], handle.last_used))
+        for handle in candidates:
+            if self.resident_bytes <= self.budget:
+                break
+            self._evict(handle)
+            self.evicted += 1
+
+    def _evict(self, handle: AudioHandle):
+        with self._lock:
+            if self._resident.pop(id(handle), None) is not None:
+                self.resident_bytes -= handle.size
+            handle.unload()
+            handle.future = None
+
+    def unload_unused(self) -> int:
+        """Выгрузить звуки без держателей, вернуть их число"""
+        unloaded = 0
+        for handle in list(self._handles.values()):
+            if handle.refs == 0 and handle.loaded and not handle.pending:
+                self._evict(handle)
+                unloaded += 1
+        return unloaded
+
+    def loaded_count(self) -> int:
+        return sum(1 for handle in self._handles.values() if handle.loaded)
+
+
+audio_registry = AudioRegistry()
@@ -0,0 +1,95 @@
+import random
+import time
+from typing import Callable, List, Optional, Tuple
+
+import arcade
+import numpy as np
+from PIL import Image
+
+
+# Генератор фона: (width, height, rng) -> (пиксели RGBA по клеткам, ширина клетки, высота клетки)
+PatternGenerator = Callable[[int, int, random.Random], Tuple[np.ndarray, int, int]]
+
+
+def maze_pattern(cell_size: int = 30, density: float = 0.2,
+                 low=(30, 20, 40), high=(60, 40, 70)) -> PatternGenerator:
+    """Случайные закрашенные клетки, как схема лабиринта"""
+    def generate(width, height, rng):
+        cols = (width + cell_size - 1) // cell_size
+        rows = (height + cell_size - 1) // cell_size
+        np_rng = np.random.default_rng(rng.randrange(2 ** 32))
+
+        pixels = np.zeros((rows, cols, 4), dtype=np.uint8)
+        filled = np_rng.random((rows, cols)) < density
+        for channel in range(3):
+            pixels[..., channel] = np_rng.integers(low[channel], high[channel] + 1, (rows, cols))
+        pixels[..., 3] = np.where(filled, 255, 0)
+        return pixels, cell_size, cell_size
+
+    return generate
+
+
+def gradient_bands(bands: int = 20, base=(60, 10, 10), step=(8, 2, 2),
+                   alpha_base: int = 50, alpha_step: int = 10) -> PatternGenerator:
+    """Горизонтальные полосы, светлеющие снизу вверх"""
+    def generate(width, height, rng):
+        index = np.arange(bands)
+        pixels = np.zeros((bands, 1, 4), dtype=np.uint8)
+        for channel in range(3):
+            pixels[:, 0, channel] = np.clip(base[channel] + index * step[channel], 0, 255)
+        pixels[:, 0, 3] = np.clip(alpha_base + index * alpha_step, 0, 255)
+        # Первая строка изображения - верх экрана, а полосы считаются снизу
+        return pixels[::-1], width, height // bands
+
+    return generate
+
+
+class PatternBackground:
+    """Фон, сгенерированный один раз в текстуру
+
+    Генератор вызывается при первой отрисовке и при смене размера окна.
+    Для мерцания заранее готовится несколько кадров, которые сменяются
+    с частотой fps; сама отрисовка - один прямоугольник с текстурой.
+    """
+
+    def __init__(self, generator: PatternGenerator, frames: int = 1, fps: float = 0.0,
+                 seed: Optional[int] = None):
+        self.generator = generator
+        self.frame_count = max(1, frames)
+        self.fps = fps
+        self.rng = random.Random(seed)
+
+        self.textures: List[arcade.Texture] = []
+        self.rect_size = (0, 0)
+        self._size = None
+
+    def _generate(self, width: int, height: int):
+        """Сгенерировать кадры под размер окна"""
+        atlas = arcade.get_window().ctx.default_atlas
+        for texture in self.textures:
+            if atlas.has_texture(texture):
+                atlas.remove(texture)
+
+        self.textures = []
+        for _ in range(self.frame_count):
+            pixels, cell_w, cell_h = self.generator(width, height, self.rng)
+            image = Image.fromarray(np.ascontiguousarray(pixels), 'RGBA')
+            self.textures.append(arcade.Texture(image))
+        rows, cols = pixels.shape[:2]
+        self.rect_size = (cols * cell_w, rows * cell_h)
+        self._size = (width, height)
+
+    def draw(self, offset_x: float = 0, offset_y: float = 0, alpha: int = 255):
+        """Нарисовать текущий кадр фона"""
+        window = arcade.get_window()
+        if self._size != (window.width, window.height):
+            self._generate(window.width, window.height)
+
+        index = int(time.time() * self.fps) % self.frame_count if self.fps else 0
+        width, height = self.rect_size
+        arcade.draw_texture_rect(
+            self.textures[index],
+            arcade.LBWH(offset_x, offset_y, width, height),
+            alpha=alpha,
+            pixelated=True
+        )
@@ -0,0 +1,246 @@
+from typing import Callable, Dict, Optional, Tuple
+
+import arcade
+from PIL import Image, ImageDraw, ImageFont
+
+
+# Размеры текстур (диаметр в пикселях), под которые запекаются спрайты
+SIZE_BUCKETS = (32, 64, 128, 256)
+SUPERSAMPLE = 4
+
+Color = Tuple[int, ...]
+
+
+def size_bucket(diameter: float, buckets: Tuple[int, ...] = SIZE_BUCKETS) -> int:
+    """Наименьшая корзина, не меньше нужного диаметра"""
+    for size in buckets:
+        if size >= diameter:
+            return size
+    return buckets[-1]
+
+
+def _load_font(size: int):
+    """Жирный шрифт для букв на ключе и выходе"""
+    try:
+        return ImageFont.truetype("DejaVuSans-Bold.ttf", size)
+    except OSError:
+        return ImageFont.load_default(size)
+
+
+class SpriteCanvas:
+    """Холст в координатах радиуса спрайта: центр (0, 0), ось y вверх
+
+    extent - во сколько раз половина стороны текстуры больше радиуса,
+    чтобы поместились выступающие части (тень монстра).
+    """
+
+    def __init__(self, bucket: int, extent: float):
+        self.side = bucket * SUPERSAMPLE
+        self.scale = self.side / 2 / extent
+        self.bucket = bucket
+        self.image = Image.new("RGBA", (self.side, self.side), (0, 0, 0, 0))
+
+    def _point(self, x: float, y: float) -> Tuple[float, float]:
+        return self.side / 2 + x * self.scale, self.side / 2 - y * self.scale
+
+    def _layer(self, color: Optional[Color] = None) -> Tuple[Image.Image, ImageDraw.ImageDraw]:
+        """Слой для примитива; непрозрачный цвет рисуется прямо на холст
+
+        Наложение непрозрачного слоя только заменило бы пиксели, поэтому
+        отдельный слой нужен лишь полупрозрачным примитивам и буквам.
+        """
+        if color is not None and (len(color) == 3 or color[3] == 255):
+            return self.image, ImageDraw.Draw(self.image)
+        layer = Image.new("RGBA", self.image.size, (0, 0, 0, 0))
+        return layer, ImageDraw.Draw(layer)
+
+    def _compose(self, layer: Image.Image, box=None):
+        """Наложить слой; смешивается только прямоугольник box (по умолчанию - рисунок слоя)"""
+        if layer is self.image:
+            return
+        if box is None:
+            box = layer.getbbox()
+            if box is None:
+                return
+        pad = 2
+        x0 = max(0, int(min(box[0], box[2])) - pad)
+        y0 = max(0, int(min(box[1], box[3])) - pad)
+        x1 = min(self.side, int(max(box[0], box[2])) + pad + 1)
+        y1 = min(self.side, int(max(box[1], box[3])) + pad + 1)
+        if x0 < x1 and y0 < y1:
+            self.image.alpha_composite(layer, dest=(x0, y0), source=(x0, y0, x1, y1))
+
+    def circle(self, x: float, y: float, radius: float, color: Color, outline: float = 0):
+        """Круг (или окружность толщиной outline) поверх уже нарисованного"""
+        layer, draw = self._layer(color)
+        cx, cy = self._point(x, y)
+        r = radius * self.scale
+        box = (cx - r, cy - r, cx + r, cy + r)
+        if outline:
+            draw.ellipse(box, outline=color, width=max(1, int(outline * self.scale)))
+        else:
+            draw.ellipse(box, fill=color)
+        self._compose(layer, box)
+
+    def ellipse(self, x: float, y: float, width: float, height: float, color: Color):
+        """Эллипс по полным ширине и высоте, как arcade.draw_ellipse_filled"""
+        layer, draw = self._layer(color)
+        cx, cy = self._point(x, y)
+        w, h = width * self.scale / 2, height * self.scale / 2
+        draw.ellipse((cx - w, cy - h, cx + w, cy + h), fill=color)
+        self._compose(layer, (cx - w, cy - h, cx + w, cy + h))
+
+    def arc(self, x: float, y: float, width: float, height: float, color: Color,
+            start: float, end: float):
+        """Сектор эллипса, углы в градусах против часовой стрелки"""
+        layer, draw = self._layer(color)
+        cx, cy = self._point(x, y)
+        w, h = width * self.scale / 2, height * self.scale / 2
+        # В PIL ось y направлена вниз, поэтому углы зеркалятся
+        draw.pieslice((cx - w, cy - h, cx + w, cy + h), -end, -start, fill=color)
+        self._compose(layer, (cx - w, cy - h, cx + w, cy + h))
+
+    def triangle(self, points, color: Color):
+        layer, draw = self._layer(color)
+        corners = [self._point(x, y) for x, y in points]
+        draw.polygon(corners, fill=color)
+        xs, ys = [x for x, _ in corners], [y for _, y in corners]
+        self._compose(layer, (min(xs), min(ys), max(xs), max(ys)))
+
+    def line(self, x1: float, y1: float, x2: float, y2: float, color: Color, width: float):
+        layer, draw = self._layer(color)
+        line_width = max(1, int(width * self.scale))
+        (ax, ay), (bx, by) = self._point(x1, y1), self._point(x2, y2)
+        draw.line([(ax, ay), (bx, by)], fill=color, width=line_width)
+        self._compose(layer, (min(ax, bx) - line_width, min(ay, by) - line_width,
+                              max(ax, bx) + line_width, max(ay, by) + line_width))
+
+    def glyph(self, text: str, x: float, y: float, height: float, color: Color):
+        """Буква по центру точки"""
+        layer, draw = self._layer()
+        font = _load_font(max(1, int(height * self.scale)))
+        draw.text(self._point(x, y), text, fill=color, font=font, anchor="mm")
+        self._compose(layer)
+
+    def reduced(self) -> Image.Image:
+        """Картинка в размере корзины (усреднение SUPERSAMPLE x SUPERSAMPLE)"""
+        return self.image.reduce(SUPERSAMPLE)
+
+    def texture(self, name: str, image: Optional[Image.Image] = None) -> arcade.Texture:
+        """Создать текстуру из уменьшенной картинки (image - если уже уменьшена)"""
+        if image is None:
+            image = self.reduced()
+        # Спрайты только рисуются: точная hit box не нужна, а по умолчанию
+        # arcade обходит края картинки попиксельно
+        return arcade.Texture(image, hit_box_algorithm=arcade.hitbox.algo_bounding_box,
+                              hash=f"billboard_{name}_{self.bucket}")
+
+
+def _bake_disk(canvas: SpriteCanvas):
+    """Белый круг - тело монстра, ядро и свечение ключа и выхода (цвет задает tint)"""
+    canvas.circle(0, 0, 1, (255, 255, 255, 255))
+
+
+def _bake_monster_features(canvas: SpriteCanvas):
+    """Тень и глаза монстра, они не затемняются вместе с телом"""
+    canvas.circle(-0.2, -0.2, 0.9, (100, 30, 30, 150))
+    eye_size, eye_offset, eye_y = 0.18, 0.35, 0.1
+    pupil_offset = eye_size * 0.3
+    for side in (-1, 1):
+        canvas.circle(side * eye_offset, eye_y, eye_size, (255, 255, 255, 220))
+    for side in (-1, 1):
+        canvas.circle(side * eye_offset, eye_y + pupil_offset, eye_size * 0.6, (255, 0, 0, 255))
+    for side in (-1, 1):
+        canvas.circle(side * eye_offset - eye_size * 0.2, eye_y + eye_size * 0.3,
+                      eye_size * 0.2, (255, 255, 255, 200))
+
+
+def _mark_baker(letter: str, outline_color: Color, letter_color: Color):
+    """Обводка и буква объекта (K - ключ, E - выход)"""
+    def bake(canvas: SpriteCanvas):
+        canvas.circle(0, 0, 1, outline_color, outline=0.08)
+        canvas.glyph(letter, 0, -0.1, 1.2, letter_color)
+    return bake
+
+
+# Вид спрайта: (функция запекания, половина стороны текстуры в радиусах)
+BILLBOARD_KINDS: Dict[str, Tuple[Callable[[SpriteCanvas], None], float]] = {
+    'disk': (_bake_disk, 1.0),
+    'monster_features': (_bake_monster_features, 1.1),
+    'key_mark': (_mark_baker("K", (255, 255, 200, 200), (100, 80, 0, 200)), 1.05),
+    'exit_mark': (_mark_baker("E", (255, 200, 200, 200), (150, 0, 0, 200)), 1.05),
+}
+
+
+class BillboardTextures:
+    """Запеченные один раз текстуры спрайтов по корзинам размеров"""
+
+    def __init__(self):
+        self._textures: Dict[Tuple[str, int], arcade.Texture] = {}
+
+    def get(self, kind: str, diameter: float) -> arcade.Texture:
+        """Текстура вида kind для спрайта диаметром diameter пикселей"""
+        bucket = size_bucket(diameter)
+        key = (kind, bucket)
+        texture = self._textures.get(key)
+        if texture is None:
+            bake, extent = BILLBOARD_KINDS[kind]
+            canvas = SpriteCanvas(bucket, extent)
+            bake(canvas)
+            texture = canvas.texture(kind)
+            self._textures[key] = texture
+        return texture
+
+
+billboard_textures = BillboardTextures()
+
+
+class BillboardBatch:
+    """Все спрайты-билборды кадра в одном SpriteList
+
+    Спрайты переиспользуются между кадрами: begin() сбрасывает счетчик,
+    add() настраивает очередной спрайт (текстура, масштаб, tint, альфа),
+    draw() прячет неиспользованные и рисует список одним вызовом.
+    Порядок добавления - порядок отрисовки.
+    """
+
+    def __init__(self, textures: BillboardTextures = billboard_textures):
+        self.textures = textures
+        self.sprite_list = arcade.SpriteList()
+        self.used = 0
+
+    def begin(self):
+        self.used = 0
+
+    def add(self, kind: str, x: float, y: float, radius: float,
+            color: Color = (255, 255, 255), alpha: int = 255):
+        """Добавить спрайт вида kind с центром (x, y) и радиусом radius"""
+        extent = BILLBOARD_KINDS[kind][1]
+        half = radius * extent
+        texture = self.textures.get(kind, half * 2)
+
+        if self.used < len(self.sprite_list):
+            sprite = self.sprite_list[self.used]
+            if sprite.texture is not texture:
+                sprite.texture = texture
+        else:
+            sprite = arcade.Sprite(texture)
+            self.sprite_list.append(sprite)
+        self.used += 1
+
+        sprite.visible = True
+        sprite.position = (x, y)
+        sprite.scale = half * 2 / texture.width
+        sprite.color = (
+            min(255, max(0, int(color[0]))),
+            min(255, max(0, int(color[1]))),
+            min(255, max(0, int(color[2]))),
+            min(255, max(0, int(alpha)))
+        )
+
+    def draw(self):
+        for sprite in self.sprite_list[self.used:]:
+            if sprite.visible:
+                sprite.visible = False
+        if self.used:
+            self.sprite_list.draw()
@@ -8,6 +8,12 @@ MOUSE_SENSITIVITY = 0.002
 PLAYER_SPEED = 3.0
 PLAYER_ROTATION_SPEED = 0.05
 
+# Лабиринт первого уровня
+LEVEL1_MAZE_SIZE = 15  # Нечетный размер, поддерживается как минимум до 101x101
+LEVEL1_MAZE_ALGORITHM = 'backtracker'
+LEVEL1_MAZE_SEED = None  # None - новый лабиринт каждый запуск
+MAZE_SEED_POOL = None  # Число - случайные сиды только из пула (кэш на диске дает попадания)
+
 # Страхи
 FEAR_TYPES = {
     'claustrophobia': 'Клаустрофобия (боязнь замкнутого пространства)',
@@ -29,4 +35,9 @@ COLORS = {
     'ghost_white': (200, 200, 200, 150),
     'acid_green': (100, 255, 50),
     'toxic_yellow': (200, 255, 0)
-}
\ No newline at end of file
+}
+
+# Звук: клипы длиннее порога играют потоком, остальные держатся в памяти
+# в пределах бюджета (давно не звучавшие категории выгружаются)
+AUDIO_MEMORY_BUDGET_MB = 48
+AUDIO_STREAM_MIN_SECONDS = 8.0
@@ -3,6 +3,11 @@ import random
 import time
 import math
 
+import numpy as np
+
+from particles import ParticleEmitter
+from backgrounds import PatternBackground, gradient_bands
+
 
 class GameOverView(arcade.View):
     """Экран проигрыша (смерть или безумие)"""
@@ -11,8 +16,15 @@ class GameOverView(arcade.View):
         super().__init__()
         self.reason = reason
         self.game_stats = game_stats or {}
-        self.particles = []
-        self.blood_drops = []
+        self.particles = ParticleEmitter(capacity=4096, fade=False, spawn_budget=512)
+        self.blood_drops = ParticleEmitter(capacity=256, fade=False)
+        self.particle_count = 100
+        if reason == "БЕЗУМИЕ":
+            # Безумие - фиолетовые тона
+            self.background = PatternBackground(gradient_bands(base=(80, 20, 60), step=(8, 2, 6)))
+        else:
+            # Смерть - красные тона
+            self.background = PatternBackground(gradient_bands(base=(60, 10, 10), step=(8, 2, 2)))
         self.flash_alpha = 255
         self.shake_intensity = 1.0
         self.start_time = time.time()
@@ -92,28 +104,23 @@ class GameOverView(arcade.View):
 
     def create_effects(self):
         """Создать эффекты для экрана проигрыша"""
-        # Кровавые капли
-        for _ in range(50):
-            self.blood_drops.append({
-                'x': random.randint(0, self.window.width),
-                'y': random.randint(0, self.window.height),
-                'size': random.randint(2, 8),
-                'alpha': random.randint(100, 200)
-            })
+        # Кровавые капли (неподвижные, живут весь экран)
+        self.blood_drops.emit(
+            np.random.uniform(0, self.window.width, 50),
+            np.random.uniform(0, self.window.height, 50), 50,
+            size=(2, 8), color=(150, 20, 20), alpha=75
+        )
 
         # Частицы крови
-        for _ in range(100):
-            self.particles.append({
-                'x': self.window.width // 2,
-                'y': self.window.height // 2,
-                'vx': random.uniform(-5, 5),
-                'vy': random.uniform(-5, 5),
-                'life': random.uniform(1.0, 3.0),
-                'size': random.uniform(3, 10),
-                'color': (180 + random.randint(0, 50),
-                          20 + random.randint(0, 30),
-                          20 + random.randint(0, 30))
-            })
+        self.spawn_particles(self.particle_count)
+
+    def spawn_particles(self, count):
+        """Выпустить частицы крови из центра экрана"""
+        self.particles.emit(
+            self.window.width // 2, self.window.height // 2, count,
+            vx=(-5, 5), vy=(-5, 5), life=(1.0, 3.0), size=(3, 10),
+            color=(180, 20, 20), color_jitter=(50, 30, 30), gravity=0.1
+        )
 
     def on_draw(self):
         """Отрисовка экрана проигрыша"""
@@ -125,56 +132,14 @@ class GameOverView(arcade.View):
 
         elapsed = time.time() - self.start_time
 
-        # Фон - красный градиент
-        for i in range(20):
-            alpha = 50 + i * 10
-            height = self.window.height // 20
-            y = i * height
-
-            if self.reason == "БЕЗУМИЕ":
-                # Безумие - фиолетовые тона
-                color = (
-                    80 + i * 8,
-                    20 + i * 2,
-                    60 + i * 6,
-                    alpha
-                )
-            else:
-                # Смерть - красные тона
-                color = (
-                    60 + i * 8,
-                    10 + i * 2,
-                    10 + i * 2,
-                    alpha
-                )
-
-            arcade.draw_lrbt_rectangle_filled(
-                0 + shake_x, self.window.width + shake_x,
-                y + shake_y, y + height + shake_y,
-                color
-            )
+        # Фон - градиент, сгенерированный один раз
+        self.background.draw(shake_x, shake_y)
 
         # Кровавые капли на фоне
-        for drop in self.blood_drops:
-            # ИСПРАВЛЕНИЕ: ограничиваем alpha 0-255
-            alpha = max(0, min(255, drop['alpha'] // 2))
-            arcade.draw_circle_filled(
-                drop['x'] + shake_x,
-                drop['y'] + shake_y,
-                drop['size'],
-                (150, 20, 20, alpha)
-            )
+        self.blood_drops.draw(shake_x, shake_y)
 
         # Частицы крови
-        for particle in self.particles:
-            if particle['life'] > 0:
-                alpha = max(0, min(255, int(particle['life'] * 100)))
-                arcade.draw_circle_filled(
-                    particle['x'] + shake_x,
-                    particle['y'] + shake_y,
-                    particle['size'],
-                    (*particle['color'], alpha)
-                )
+        self.particles.draw(shake_x, shake_y)
 
         # Вспышка
         if self.flash_alpha > 0:
@@ -274,28 +239,16 @@ class GameOverView(arcade.View):
         if self.flash_alpha > 0:
             self.flash_alpha = max(0, self.flash_alpha - delta_time * 100)
 
-        # Обновляем частицы
-        for particle in self.particles:
-            particle['x'] += particle['vx']
-            particle['y'] += particle['vy']
-            particle['life'] -= delta_time
-
-            # Гравитация
-            particle['vy'] -= 0.1
-
-            # Если частица умерла, респавним ее
-            if particle['life'] <= 0:
-                particle['x'] = self.window.width // 2
-                particle['y'] = self.window.height // 2
-                particle['vx'] = random.uniform(-5, 5)
-                particle['vy'] = random.uniform(-5, 5)
-                particle['life'] = random.uniform(1.0, 3.0)
+        # Обновляем частицы, умершие респавним из центра
+        self.particles.update(delta_time)
+        missing = self.particle_count - len(self.particles)
+        if missing > 0:
+            self.spawn_particles(missing)
+        self.particles.set_alpha(self.particles.life[:len(self.particles)] * 100)
 
         # Мерцание кровавых капель
-        for drop in self.blood_drops:
-            # ИСПРАВЛЕНИЕ: ограничиваем alpha 0-255
-            new_alpha = 100 + int((math.sin(elapsed * 2 + drop['x'] * 0.01) + 1) * 50)
-            drop['alpha'] = max(0, min(255, new_alpha))
+        drops_x = self.blood_drops.pos[:len(self.blood_drops), 0]
+        self.blood_drops.set_alpha((100 + (np.sin(elapsed * 2 + drops_x * 0.01) + 1) * 50) // 2)
 
     def on_key_press(self, symbol: int, modifiers: int):
         """Обработка нажатия клавиш"""
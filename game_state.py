@@ -1,3 +1,4 @@
+import base64
 import json
 import os
 from datetime import datetime
@@ -14,6 +15,7 @@ class GameState:
             cls._instance.current_fear_profile = None
             cls._instance.calibration_data = None
             cls._instance.level1_results = None
+            cls._instance.level2_exploration = None
         return cls._instance
 
     def save_level1_results(self, results: dict):
@@ -41,6 +43,29 @@ class GameState:
         with open(filename, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
 
+    def save_level2_exploration(self, exploration, coverage=None, endless=False):
+        """Сохранить маску исследованных клеток уровня 2 (1 бит на клетку)"""
+        self.level2_exploration = {
+            'width': exploration.width,
+            'height': exploration.height,
+            'row_start': exploration.row_start,
+            'explored_cells': exploration.count(),
+            'coverage': coverage,
+            'endless': endless,
+            'bits': base64.b64encode(exploration.to_bytes()).decode('ascii')
+        }
+
+        os.makedirs('data', exist_ok=True)
+        filename = f"data/exploration_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+
+        data = {
+            'fear_profile': self.current_fear_profile,
+            'level2_exploration': self.level2_exploration
+        }
+
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
     def get_fear_profile(self):
         """Получить текущий профиль страхов"""
         return self.current_fear_profile
@@ -1,4 +1,5 @@
 import arcade
+from text_cache import draw_text
 
 
 class HelpButton:
@@ -27,7 +28,7 @@ class HelpButton:
         )
 
         # Знак вопроса
-        arcade.draw_text(
+        draw_text(
             "?",
             self.button_x, self.button_y - 5,
             arcade.color.WHITE,
@@ -39,7 +40,7 @@ class HelpButton:
 
         # Текст при наведении
         if self.hovered:
-            arcade.draw_text(
+            draw_text(
                 "Помощь (H)",
                 self.button_x - 100, self.button_y + 40,
                 arcade.color.LIGHT_GRAY,
@@ -0,0 +1,156 @@
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+import arcade
+from arcade.gl import geometry
+
+
+COMPOSITE_VERTEX_SHADER = """
+#version 330
+
+in vec2 in_vert;
+in vec2 in_uv;
+
+out vec2 v_uv;
+
+void main() {
+    gl_Position = vec4(in_vert, 0.0, 1.0);
+    v_uv = in_uv;
+}
+"""
+
+COMPOSITE_FRAGMENT_SHADER = """
+#version 330
+
+uniform sampler2D layer;
+
+in vec2 v_uv;
+
+out vec4 f_color;
+
+void main() {
+    f_color = texture(layer, v_uv);
+}
+"""
+
+Rect = Tuple[int, int, int, int]
+
+_MISSING = object()
+
+
+class DirtyTracker:
+    """Отслеживание изменившихся значений элементов интерфейса
+
+    Элементы сравниваются по уже квантованным значениям (то, что реально
+    видно на экране: целые проценты, фаза мигания), поэтому дробные
+    изменения между кадрами не вызывают перерисовку.
+    """
+
+    def __init__(self):
+        self.values: Dict[str, object] = {}
+
+    def update(self, values: Dict[str, object]) -> List[str]:
+        """Запомнить новые значения и вернуть имена изменившихся"""
+        changed = []
+        for name, value in values.items():
+            if self.values.get(name, _MISSING) != value:
+                self.values[name] = value
+                changed.append(name)
+        return changed
+
+    def invalidate(self):
+        """Считать все элементы изменившимися"""
+        self.values.clear()
+
+
+class HudLayer:
+    """Интерфейс в offscreen-текстуре
+
+    Каждый элемент - функция отрисовки и прямоугольник на экране. Когда
+    квантованное значение элемента меняется, перерисовывается только его
+    прямоугольник (с подложкой под ним), при смене размера окна - весь слой.
+    На экран слой выводится одним вызовом.
+    """
+
+    def __init__(self):
+        self.elements: "OrderedDict[str, Tuple[Callable, Callable[[int, int], Rect]]]" = OrderedDict()
+        self.background: Optional[Callable[[], None]] = None
+        self.tracker = DirtyTracker()
+        self.redraws = 0
+
+        self._ctx = None
+        self._size = None
+        self._fbo = None
+        self._quad = None
+        self._program = None
+
+    def set_background(self, draw_fn: Callable[[], None]):
+        """Подложка, которая рисуется под любым перерисованным элементом"""
+        self.background = draw_fn
+        self.tracker.invalidate()
+
+    def add(self, name: str, draw_fn: Callable[[object], None], rect: Callable[[int, int], Rect]):
+        """Добавить элемент: draw_fn(value) и rect(width, height) -> (x, y, w, h)"""
+        self.elements[name] = (draw_fn, rect)
+        self.tracker.invalidate()
+
+    def invalidate(self):
+        self.tracker.invalidate()
+
+    def draw(self, values: Dict[str, object]):
+        """Обновить изменившиеся элементы и вывести слой на экран"""
+        window = arcade.get_window()
+        size = (window.width, window.height)
+        if size != self._size:
+            self._create_target(window, size)
+
+        dirty = self.tracker.update(values)
+        if dirty:
+            self._render(dirty, full=len(dirty) >= len(self.elements))
+
+        self._fbo.color_attachments[0].use(0)
+        self._ctx.blend_func = self._ctx.ONE, self._ctx.ONE_MINUS_SRC_ALPHA
+        with self._ctx.enabled(self._ctx.BLEND):
+            self._quad.render(self._program)
+        self._ctx.blend_func = self._ctx.BLEND_DEFAULT
+
+    def _create_target(self, window, size):
+        """Создать текстуру под размер окна"""
+        ctx = window.ctx
+        self._ctx = ctx
+        self._size = size
+        self._fbo = ctx.framebuffer(color_attachments=[ctx.texture(size, components=4)])
+        if self._quad is None:
+            self._quad = geometry.quad_2d_fs()
+            self._program = ctx.program(
+                vertex_shader=COMPOSITE_VERTEX_SHADER,
+                fragment_shader=COMPOSITE_FRAGMENT_SHADER
+            )
+        self.tracker.invalidate()
+
+    def _render(self, dirty: List[str], full: bool):
+        """Перерисовать элементы в текстуру слоя"""
+        ctx = self._ctx
+        width, height = self._size
+        self.redraws += 1
+
+        # Цвет в текстуре хранится с уже умноженной альфой
+        ctx.blend_func = ctx.SRC_ALPHA, ctx.ONE_MINUS_SRC_ALPHA, ctx.ONE, ctx.ONE_MINUS_SRC_ALPHA
+        with self._fbo.activate():
+            if full:
+                self._fbo.clear()
+                if self.background:
+                    self.background()
+                for name, (draw_fn, _) in self.elements.items():
+                    draw_fn(self.tracker.values.get(name))
+            else:
+                for name in dirty:
+                    draw_fn, rect = self.elements[name]
+                    region = rect(width, height)
+                    self._fbo.clear(viewport=region)
+                    self._fbo.scissor = region
+                    if self.background:
+                        self.background()
+                    draw_fn(self.tracker.values[name])
+                    self._fbo.scissor = None
+        ctx.blend_func = ctx.BLEND_DEFAULT
@@ -1,48 +1,418 @@
 import math
+import os
 import random
-from typing import List, Tuple
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+WALL = 1
+PASSAGE = 0
+
+# Направления по клеткам лабиринта (шаг 2 в координатах сетки)
+CELL_DIRECTIONS = [(0, 2), (2, 0), (0, -2), (-2, 0)]
+NEIGHBORS_4 = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+
+
+class MazeGrid:
+    """Компактная сетка лабиринта: 1 байт на клетку (1-стена, 0-проход)
+
+    Строки отдаются как memoryview поверх общего буфера, поэтому старый код
+    вида ``maze[y][x]`` продолжает работать и на чтение, и на запись.
+    """
+
+    __slots__ = ('width', 'height', 'cells', '_rows')
+
+    def __init__(self, width: int, height: int, fill: int = WALL, cells: Optional[bytearray] = None):
+        self.width = width
+        self.height = height
+        if cells is None:
+            cells = bytearray([fill]) * (width * height)
+        elif len(cells) != width * height:
+            raise ValueError(f"Размер буфера {len(cells)} не совпадает с {width}x{height}")
+        self.cells = cells
+        view = memoryview(self.cells)
+        self._rows = [view[y * width:(y + 1) * width] for y in range(height)]
+
+    @classmethod
+    def from_rows(cls, rows: List[List[int]]) -> 'MazeGrid':
+        """Создать сетку из списка списков"""
+        height = len(rows)
+        width = len(rows[0]) if height else 0
+        cells = bytearray(width * height)
+        for y, row in enumerate(rows):
+            cells[y * width:(y + 1) * width] = bytes(row)
+        return cls(width, height, cells=cells)
+
+    @classmethod
+    def from_bytes(cls, width: int, height: int, data: bytes) -> 'MazeGrid':
+        """Восстановить сетку из сериализованного буфера"""
+        return cls(width, height, cells=bytearray(data))
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __getitem__(self, y: int) -> memoryview:
+        return self._rows[y]
+
+    def __iter__(self) -> Iterator[memoryview]:
+        return iter(self._rows)
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def is_wall(self, x: int, y: int) -> bool:
+        """Стена ли в клетке (за пределами сетки - всегда стена)"""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.cells[y * self.width + x] == WALL
+        return True
+
+    def carve(self, x: int, y: int):
+        """Сделать клетку проходом"""
+        self.cells[y * self.width + x] = PASSAGE
+
+    def copy(self) -> 'MazeGrid':
+        return MazeGrid(self.width, self.height, cells=bytearray(self.cells))
+
+    def to_rows(self) -> List[List[int]]:
+        """Преобразовать в список списков"""
+        return [list(row) for row in self._rows]
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.cells)
+
+    def as_array(self) -> np.ndarray:
+        """Представление сетки в виде массива (height, width) без копирования"""
+        return np.frombuffer(self.cells, dtype=np.uint8).reshape(self.height, self.width)
+
+    def resident_range(self) -> Tuple[int, int]:
+        """Диапазон строк, доступных в памяти (для конечной сетки - все)"""
+        return 0, self.height
+
+    def open_cells(self) -> List[Tuple[int, int]]:
+        """Все проходимые клетки"""
+        width = self.width
+        return [(i % width, i // width) for i, cell in enumerate(self.cells) if cell == PASSAGE]
+
+
+# РЕЕСТР АЛГОРИТМОВ
+
+MAZE_ALGORITHMS: Dict[str, Callable[[MazeGrid, random.Random], None]] = {}
+
+
+def register_algorithm(name: str):
+    """Зарегистрировать алгоритм генерации
+
+    Алгоритм получает сетку, заполненную стенами, и генератор случайных чисел,
+    и прорезает в ней идеальный лабиринт по клеткам с нечетными координатами.
+    """
+
+    def decorator(func):
+        MAZE_ALGORITHMS[name] = func
+        return func
+
+    return decorator
+
+
+def _cell_counts(grid: MazeGrid) -> Tuple[int, int]:
+    """Количество клеток лабиринта по горизонтали и вертикали"""
+    return (grid.width - 1) // 2, (grid.height - 1) // 2
+
+
+@register_algorithm('backtracker')
+def recursive_backtracker(grid: MazeGrid, rng: random.Random):
+    """Рекурсивный поиск с возвратом (длинные извилистые коридоры)"""
+    cols, rows = _cell_counts(grid)
+    if cols == 0 or rows == 0:
+        return
+
+    width = grid.width
+    cells = grid.cells
+    start_x = 2 * rng.randrange(cols) + 1
+    start_y = 2 * rng.randrange(rows) + 1
+    cells[start_y * width + start_x] = PASSAGE
+
+    stack = [(start_x, start_y)]
+    directions = list(CELL_DIRECTIONS)
+    max_x, max_y = 2 * cols - 1, 2 * rows - 1
+
+    while stack:
+        x, y = stack[-1]
+        rng.shuffle(directions)
+
+        for dx, dy in directions:
+            nx, ny = x + dx, y + dy
+            if 1 <= nx <= max_x and 1 <= ny <= max_y and cells[ny * width + nx] == WALL:
+                cells[(y + dy // 2) * width + x + dx // 2] = PASSAGE
+                cells[ny * width + nx] = PASSAGE
+                stack.append((nx, ny))
+                break
+        else:
+            stack.pop()
+
+
+@register_algorithm('kruskal')
+def kruskal(grid: MazeGrid, rng: random.Random):
+    """Рандомизированный алгоритм Краскала (много коротких тупиков)"""
+    cols, rows = _cell_counts(grid)
+    if cols == 0 or rows == 0:
+        return
+
+    width = grid.width
+    cells = grid.cells
+    parent = list(range(cols * rows))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    edges = []
+    for cy in range(rows):
+        for cx in range(cols):
+            index = cy * cols + cx
+            cells[(2 * cy + 1) * width + 2 * cx + 1] = PASSAGE
+            if cx + 1 < cols:
+                edges.append((index, index + 1, 2 * cx + 2, 2 * cy + 1))
+            if cy + 1 < rows:
+                edges.append((index, index + cols, 2 * cx + 1, 2 * cy + 2))
+
+    rng.shuffle(edges)
+    remaining = cols * rows - 1
+    for a, b, wx, wy in edges:
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[root_a] = root_b
+            cells[wy * width + wx] = PASSAGE
+            remaining -= 1
+            if remaining == 0:
+                break
+
+
+@register_algorithm('wilson')
+def wilson(grid: MazeGrid, rng: random.Random):
+    """Алгоритм Уилсона (равномерное остовное дерево, без перекоса)"""
+    cols, rows = _cell_counts(grid)
+    if cols == 0 or rows == 0:
+        return
+
+    width = grid.width
+    cells = grid.cells
+    total = cols * rows
+    in_maze = bytearray(total)
+    steps = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+
+    first = rng.randrange(total)
+    in_maze[first] = 1
+    cells[(2 * (first // cols) + 1) * width + 2 * (first % cols) + 1] = PASSAGE
+    unvisited = [i for i in range(total) if i != first]
+    rng.shuffle(unvisited)
+
+    for start in unvisited:
+        if in_maze[start]:
+            continue
+
+        # Случайное блуждание с запоминанием последнего выхода из клетки
+        exits = {}
+        current = start
+        while not in_maze[current]:
+            cx, cy = current % cols, current // cols
+            while True:
+                dx, dy = steps[rng.randrange(4)]
+                nx, ny = cx + dx, cy + dy
+                if 0 <= nx < cols and 0 <= ny < rows:
+                    break
+            exits[current] = (dx, dy)
+            current = ny * cols + nx
+
+        # Прокладываем путь без петель
+        current = start
+        while not in_maze[current]:
+            in_maze[current] = 1
+            cx, cy = current % cols, current // cols
+            dx, dy = exits[current]
+            cells[(2 * cy + 1) * width + 2 * cx + 1] = PASSAGE
+            cells[(2 * cy + 1 + dy) * width + 2 * cx + 1 + dx] = PASSAGE
+            current = (cy + dy) * cols + cx + dx
+
+
+class EllerRowGenerator:
+    """Построчный генератор Эллера
+
+    Хранит только состояние текущей строки (метки множеств), поэтому может
+    выдавать строки бесконечно с постоянной памятью.
+    """
+
+    def __init__(self, cols: int, rng: random.Random, join_chance: float = 0.5, down_chance: float = 0.35):
+        self.cols = cols
+        self.rng = rng
+        self.join_chance = join_chance
+        self.down_chance = down_chance
+        self.width = 2 * cols + 1
+        self.sets: List[int] = [0] * cols
+        self.next_label = 1
+
+    def _fill_sets(self):
+        for i in range(self.cols):
+            if self.sets[i] == 0:
+                self.sets[i] = self.next_label
+                self.next_label += 1
+
+    def next_rows(self, last: bool = False) -> Tuple[bytearray, bytearray]:
+        """Сгенерировать строку клеток и строку стен под ней
+
+        Для последней строки все множества объединяются, а нижняя строка
+        остается сплошной стеной.
+        """
+        cols = self.cols
+        rng = self.rng
+        sets = self.sets
+        self._fill_sets()
+
+        cell_row = bytearray([WALL]) * self.width
+        wall_row = bytearray([WALL]) * self.width
+        for i in range(cols):
+            cell_row[2 * i + 1] = PASSAGE
+
+        # Горизонтальные соединения
+        for i in range(cols - 1):
+            if sets[i] != sets[i + 1] and (last or rng.random() < self.join_chance):
+                old, new = sets[i + 1], sets[i]
+                for j in range(cols):
+                    if sets[j] == old:
+                        sets[j] = new
+                cell_row[2 * i + 2] = PASSAGE
+
+        if last:
+            self.sets = [0] * cols
+            return cell_row, wall_row
+
+        # Вертикальные соединения: минимум одно на каждое множество
+        members: Dict[int, List[int]] = {}
+        for i, label in enumerate(sets):
+            members.setdefault(label, []).append(i)
+
+        next_sets = [0] * cols
+        for label, indices in members.items():
+            down = [i for i in indices if rng.random() < self.down_chance]
+            if not down:
+                down = [rng.choice(indices)]
+            for i in down:
+                next_sets[i] = label
+                wall_row[2 * i + 1] = PASSAGE
+
+        self.sets = next_sets
+        return cell_row, wall_row
+
+
+@register_algorithm('eller')
+def eller(grid: MazeGrid, rng: random.Random):
+    """Алгоритм Эллера (строка за строкой, длинные горизонтальные коридоры)"""
+    cols, rows = _cell_counts(grid)
+    if cols == 0 or rows == 0:
+        return
+
+    width = grid.width
+    generator = EllerRowGenerator(cols, rng)
+    for cy in range(rows):
+        cell_row, wall_row = generator.next_rows(last=(cy == rows - 1))
+        y = 2 * cy + 1
+        grid.cells[y * width:y * width + len(cell_row)] = cell_row
+        if cy < rows - 1:
+            grid.cells[(y + 1) * width:(y + 1) * width + len(wall_row)] = wall_row
 
 
 class MazeGenerator:
     """Генератор лабиринтов"""
 
+    DEFAULT_ALGORITHM = 'backtracker'
+
+    @staticmethod
+    def available_algorithms() -> List[str]:
+        return sorted(MAZE_ALGORITHMS)
+
     @staticmethod
-    def generate_perfect_maze(width: int, height: int) -> List[List[int]]:
+    def generate(width: int, height: int, algorithm: str = DEFAULT_ALGORITHM,
+                 seed: Optional[int] = None) -> MazeGrid:
+        """Сгенерировать идеальный лабиринт выбранным алгоритмом
+
+        Четные размеры увеличиваются на 1, чтобы лабиринт был окружен стеной.
+        """
+        if algorithm not in MAZE_ALGORITHMS:
+            raise KeyError(f"Неизвестный алгоритм лабиринта: {algorithm}")
+
+        if width % 2 == 0:
+            width += 1
+        if height % 2 == 0:
+            height += 1
+
+        grid = MazeGrid(width, height)
+        MAZE_ALGORITHMS[algorithm](grid, random.Random(seed))
+        return grid
+
+    @staticmethod
+    def generate_perfect_maze(width: int, height: int) -> MazeGrid:
         """Сгенерировать идеальный лабиринт"""
-        # Все стены
-        maze = [[1 for _ in range(width)] for _ in range(height)]
+        return MazeGenerator.generate(width, height)
 
-        # Начальная точка
-        start_x, start_y = 1, 1
-        maze[start_y][start_x] = 0
+    @staticmethod
+    def braid(grid: MazeGrid, rng: Optional[random.Random] = None,
+              extra_ratio: float = 1 / 30, dead_end_chance: float = 0.3) -> MazeGrid:
+        """Добавить петли: дополнительные проходы и соединение части тупиков"""
+        rng = rng or random.Random()
+        MazeGenerator.add_extra_passages(grid, rng, extra_ratio)
+        MazeGenerator.connect_dead_ends(grid, rng, dead_end_chance)
+        return grid
 
-        # Стек для DFS
-        stack = [(start_x, start_y)]
-        directions = [(0, 2), (2, 0), (0, -2), (-2, 0)]
+    @staticmethod
+    def add_extra_passages(grid: MazeGrid, rng: random.Random, extra_ratio: float = 1 / 30):
+        """Добавить дополнительные проходы для лучшей проходимости"""
+        width, height = grid.width, grid.height
+        if width < 3 or height < 3:
+            return
 
-        while stack:
-            x, y = stack[-1]
-            random.shuffle(directions)
+        for _ in range(int(width * height * extra_ratio)):
+            x = rng.randint(1, width - 2)
+            y = rng.randint(1, height - 2)
 
-            moved = False
-            for dx, dy in directions:
-                nx, ny = x + dx, y + dy
-                if 1 <= nx < width - 1 and 1 <= ny < height - 1:
-                    if maze[ny][nx] == 1:
-                        # Убираем стену между
-                        maze[y + dy // 2][x + dx // 2] = 0
-                        maze[ny][nx] = 0
-                        stack.append((nx, ny))
-                        moved = True
-                        break
+            if grid[y][x] != WALL:
+                continue
 
-            if not moved:
-                stack.pop()
+            # Если стена окружена проходами, делаем проход
+            passable_count = sum(1 for dx, dy in NEIGHBORS_4 if not grid.is_wall(x + dx, y + dy))
+            if passable_count >= 2:
+                grid[y][x] = PASSAGE
 
-        return maze
+                # С небольшим шансом делаем дополнительные проходы вокруг
+                if rng.random() < 0.2:
+                    for dx, dy in NEIGHBORS_4:
+                        nx, ny = x + dx, y + dy
+                        if (0 < nx < width - 1 and 0 < ny < height - 1 and
+                                grid[ny][nx] == WALL and rng.random() < 0.5):
+                            grid[ny][nx] = PASSAGE
 
     @staticmethod
-    def add_exit_path(maze: List[List[int]], exit_pos: Tuple[int, int]) -> List[List[int]]:
+    def connect_dead_ends(grid: MazeGrid, rng: random.Random, chance: float = 0.3):
+        """Соединить часть тупиков с соседними коридорами"""
+        for x, y in dead_ends(grid):
+            if rng.random() >= chance:
+                continue
+
+            directions = []
+            for dx, dy in NEIGHBORS_4:
+                nx, ny = x + dx, y + dy
+                if (0 < nx < grid.width - 1 and 0 < ny < grid.height - 1 and
+                        grid[ny][nx] == WALL and not grid.is_wall(x + dx * 2, y + dy * 2)):
+                    directions.append((dx, dy))
+
+            if directions:
+                dx, dy = rng.choice(directions)
+                grid[y + dy][x + dx] = PASSAGE
+
+    @staticmethod
+    def add_exit_path(maze: MazeGrid, exit_pos: Tuple[int, int]) -> MazeGrid:
         """Добавить гарантированный путь к выходу"""
         width = len(maze[0])
         height = len(maze)
@@ -71,4 +441,671 @@ class MazeGenerator:
                     if 0 <= nx < width and 0 <= ny < height:
                         maze[ny][nx] = 0
 
-        return maze
\ No newline at end of file
+        return maze
+
+
+class MazeCache:
+    """Кэш сгенерированных лабиринтов по сиду: LRU в памяти и файлы на диске
+
+    Один и тот же (алгоритм, размер, сид) всегда дает один и тот же лабиринт,
+    поэтому повторный запуск уровня берет готовую сетку вместо генерации.
+    Запеченное освещение (light_map) кэшируется так же, файлом .light.
+    На диске хранится не больше max_files лабиринтов, давно не
+    открывавшиеся удаляются.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = 'data/mazes', max_entries: int = 8,
+                 max_files: int = 32):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_files = max_files
+        self._entries: 'OrderedDict[str, MazeGrid]' = OrderedDict()
+        self._light_maps: 'OrderedDict[str, LightMap]' = OrderedDict()
+
+    @staticmethod
+    def random_seed(pool: Optional[int] = None) -> int:
+        """Случайный сид; с пулом - один из pool сидов, чьи лабиринты могут уже лежать на диске"""
+        return random.randrange(pool if pool else 2 ** 31)
+
+    @staticmethod
+    def make_key(width: int, height: int, algorithm: str, seed: int, braid: bool) -> str:
+        suffix = "_braid" if braid else ""
+        return f"{algorithm}_{width}x{height}_{seed}{suffix}"
+
+    def get(self, width: int, height: int, algorithm: str = MazeGenerator.DEFAULT_ALGORITHM,
+            seed: int = 0, braid: bool = False) -> MazeGrid:
+        """Получить копию лабиринта (генерируется только при промахе кэша)"""
+        width += 1 - width % 2
+        height += 1 - height % 2
+        key = self.make_key(width, height, algorithm, seed, braid)
+
+        grid = self._entries.get(key)
+        if grid is not None:
+            self._entries.move_to_end(key)
+            return grid.copy()
+
+        grid = self._load(key, width, height)
+        if grid is None:
+            grid = MazeGenerator.generate(width, height, algorithm, seed=seed)
+            if braid:
+                MazeGenerator.braid(grid, random.Random(seed))
+            self._save(key, grid)
+
+        self._entries[key] = grid
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+        return grid.copy()
+
+    def light_map(self, width: int, height: int, algorithm: str = MazeGenerator.DEFAULT_ALGORITHM,
+                  seed: int = 0, braid: bool = False) -> 'LightMap':
+        """Запеченное освещение лабиринта; хранится на диске рядом с ним"""
+        width += 1 - width % 2
+        height += 1 - height % 2
+        key = self.make_key(width, height, algorithm, seed, braid)
+
+        light_map = self._light_maps.get(key)
+        if light_map is not None:
+            self._light_maps.move_to_end(key)
+            return light_map
+
+        path = self._path(key, ".light")
+        light_map = None
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'rb') as f:
+                    light_map = LightMap.from_bytes(width, height, f.read())
+                os.utime(path)
+            except (OSError, ValueError):
+                light_map = None
+
+        if light_map is None:
+            light_map = LightMap(width, seed=seed)
+            light_map.bake(self.get(width, height, algorithm, seed, braid))
+            self._write(path, light_map.to_bytes())
+
+        self._light_maps[key] = light_map
+        while len(self._light_maps) > self.max_entries:
+            self._light_maps.popitem(last=False)
+        return light_map
+
+    def _path(self, key: str, extension: str = ".maze") -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, f"{key}{extension}")
+
+    def _load(self, key: str, width: int, height: int) -> Optional[MazeGrid]:
+        path = self._path(key)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            # Время изменения файла служит отметкой последнего использования
+            os.utime(path)
+            return MazeGrid.from_bytes(width, height, data)
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, key: str, grid: MazeGrid):
+        self._write(self._path(key), grid.to_bytes())
+
+    def _write(self, path: Optional[str], data: bytes):
+        if not path:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(data)
+            self._trim_files()
+        except OSError:
+            pass
+
+    def _trim_files(self):
+        """Удалить с диска лабиринты (с их освещением), открывавшиеся давнее всех"""
+        last_used: Dict[str, float] = {}
+        for name in os.listdir(self.cache_dir):
+            key, extension = os.path.splitext(name)
+            if extension not in (".maze", ".light"):
+                continue
+            mtime = os.path.getmtime(os.path.join(self.cache_dir, name))
+            last_used[key] = max(last_used.get(key, 0.0), mtime)
+
+        for key in sorted(last_used, key=last_used.get)[:max(0, len(last_used) - self.max_files)]:
+            for extension in (".maze", ".light"):
+                path = self._path(key, extension)
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+maze_cache = MazeCache()
+
+
+# БЕСКОНЕЧНЫЙ ЛАБИРИНТ
+
+class ChunkedMazeGrid:
+    """Бесконечный по вертикали лабиринт, генерируемый кусками по строкам
+
+    Куски строятся генератором Эллера по мере продвижения игрока вниз по оси Y.
+    В памяти держится только окно кусков вокруг игрока; дальние куски
+    выгружаются на диск (если задан spill_dir) или отбрасываются и дальше
+    считаются сплошной стеной. Интерфейс совпадает с MazeGrid: ``is_wall``,
+    ``grid[y][x]``, ``width``, ``height``, ``resident_range``.
+    """
+
+    def __init__(self, width: int, chunk_cells: int = 8, keep_behind: int = 2, keep_ahead: int = 2,
+                 seed: Optional[int] = None, spill_dir: Optional[str] = None):
+        self.cols = max(1, (width - 1) // 2)
+        self.width = 2 * self.cols + 1
+        self.chunk_rows = 2 * chunk_cells
+        self.keep_behind = keep_behind
+        self.keep_ahead = keep_ahead
+        self.spill_dir = spill_dir
+        self.generated_chunks = 0
+
+        self._eller = EllerRowGenerator(self.cols, random.Random(seed))
+        self._chunks: Dict[int, MazeGrid] = {}
+        self._spilled = set()
+        self._wall_row = memoryview(bytes([WALL]) * self.width)
+
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+        self.ensure_around(1)
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __getitem__(self, y: int) -> memoryview:
+        return self.row(y)
+
+    @property
+    def height(self) -> int:
+        """Количество уже сгенерированных строк (вместе с верхней стеной)"""
+        return 1 + self.generated_chunks * self.chunk_rows
+
+    def chunk_index(self, y: int) -> int:
+        return (y - 1) // self.chunk_rows
+
+    def chunk_bounds(self, index: int) -> Tuple[int, int]:
+        """Строки куска [начало, конец)"""
+        start = 1 + index * self.chunk_rows
+        return start, start + self.chunk_rows
+
+    def row(self, y: int) -> memoryview:
+        """Строка сетки; несгенерированные и выгруженные строки - сплошная стена"""
+        if y < 1:
+            return self._wall_row
+        chunk = self._chunks.get((y - 1) // self.chunk_rows)
+        if chunk is None:
+            return self._wall_row
+        return chunk[(y - 1) % self.chunk_rows]
+
+    def is_wall(self, x: int, y: int) -> bool:
+        if not 0 <= x < self.width:
+            return True
+        return self.row(y)[x] == WALL
+
+    def resident_range(self) -> Tuple[int, int]:
+        """Диапазон строк, находящихся в памяти"""
+        if not self._chunks:
+            return 0, 1
+        first = min(self._chunks)
+        last = max(self._chunks)
+        start = 0 if first == 0 else self.chunk_bounds(first)[0]
+        return start, self.chunk_bounds(last)[1]
+
+    def ensure_around(self, y: float) -> List[Tuple[int, int]]:
+        """Догенерировать куски впереди и выгрузить куски позади позиции y
+
+        Возвращает диапазоны строк, сгенерированных за этот вызов.
+        """
+        current = self.chunk_index(max(1, int(y)))
+        new_ranges = []
+
+        while self.generated_chunks <= current + self.keep_ahead:
+            new_ranges.append(self._generate_chunk())
+
+        for index in list(self._chunks):
+            if index < current - self.keep_behind:
+                self._evict(index)
+
+        if self.spill_dir:
+            for index in range(max(0, current - self.keep_behind), current):
+                if index not in self._chunks and index in self._spilled:
+                    self._load(index)
+
+        return new_ranges
+
+    def _generate_chunk(self) -> Tuple[int, int]:
+        index = self.generated_chunks
+        chunk = MazeGrid(self.width, self.chunk_rows)
+        for pair in range(self.chunk_rows // 2):
+            cell_row, wall_row = self._eller.next_rows()
+            chunk.cells[2 * pair * self.width:(2 * pair + 1) * self.width] = cell_row
+            chunk.cells[(2 * pair + 1) * self.width:(2 * pair + 2) * self.width] = wall_row
+
+        self._chunks[index] = chunk
+        self.generated_chunks += 1
+        return self.chunk_bounds(index)
+
+    def _chunk_path(self, index: int) -> str:
+        return os.path.join(self.spill_dir, f"chunk_{index}.bin")
+
+    def _evict(self, index: int):
+        chunk = self._chunks.pop(index)
+        if self.spill_dir:
+            with open(self._chunk_path(index), 'wb') as f:
+                f.write(chunk.to_bytes())
+            self._spilled.add(index)
+
+    def _load(self, index: int):
+        try:
+            with open(self._chunk_path(index), 'rb') as f:
+                data = f.read()
+        except OSError:
+            self._spilled.discard(index)
+            return
+        self._chunks[index] = MazeGrid.from_bytes(self.width, self.chunk_rows, data)
+
+
+# АНАЛИЗ СТРУКТУРЫ
+
+def wall_window(grid, row_start: int, row_end: int) -> np.ndarray:
+    """Маска стен строк row_start..row_end: bool-массив [y - row_start, x]
+
+    Работает и с MazeGrid, и с ChunkedMazeGrid; строки за пределами
+    сетки считаются сплошной стеной.
+    """
+    wall_row = bytes([WALL]) * grid.width
+    rows = b''.join(
+        bytes(grid[y]) if 0 <= y < len(grid) else wall_row
+        for y in range(row_start, row_end)
+    )
+    return np.frombuffer(rows, dtype=np.uint8).reshape(row_end - row_start, grid.width) == WALL
+
+
+def distance_field(grid: MazeGrid, start: Tuple[int, int]) -> np.ndarray:
+    """Геодезические расстояния (шагов по проходам) от клетки start; -1 - недостижимо"""
+    width, height = grid.width, grid.height
+    cells = grid.cells
+    dist = [-1] * (width * height)
+
+    start_x, start_y = start
+    if grid.is_wall(start_x, start_y):
+        return np.array(dist, dtype=np.int32).reshape(height, width)
+
+    start_index = start_y * width + start_x
+    dist[start_index] = 0
+    queue = deque([start_index])
+
+    while queue:
+        index = queue.popleft()
+        next_dist = dist[index] + 1
+        x = index % width
+        for neighbor in (index - width, index + width,
+                         index - 1 if x > 0 else -1,
+                         index + 1 if x < width - 1 else -1):
+            if 0 <= neighbor < len(cells) and dist[neighbor] < 0 and cells[neighbor] != WALL:
+                dist[neighbor] = next_dist
+                queue.append(neighbor)
+
+    return np.array(dist, dtype=np.int32).reshape(height, width)
+
+
+def distance_window(grid, start: Tuple[int, int], max_steps: int) -> Tuple[np.ndarray, int]:
+    """Шаги по проходам от клетки start, не дальше max_steps; -1 - дальше или недостижимо
+
+    Считается в окне строк вокруг start (через wall_window), поэтому
+    работает и с бесконечным лабиринтом. Возвращает массив
+    [y - row_start, x] и row_start.
+    """
+    start_x, start_y = start
+    row_start = start_y - max_steps
+    open_cells = ~wall_window(grid, row_start, start_y + max_steps + 1)
+    dist = np.full(open_cells.shape, -1, dtype=np.int32)
+    if not (0 <= start_x < grid.width) or not open_cells[max_steps, start_x]:
+        return dist, row_start
+
+    reached = np.zeros(open_cells.shape, dtype=bool)
+    reached[max_steps, start_x] = True
+    dist[max_steps, start_x] = 0
+
+    frontier = reached.copy()
+    for step in range(1, max_steps + 1):
+        grown = np.zeros_like(frontier)
+        grown[1:] |= frontier[:-1]
+        grown[:-1] |= frontier[1:]
+        grown[:, 1:] |= frontier[:, :-1]
+        grown[:, :-1] |= frontier[:, 1:]
+        frontier = grown & open_cells & ~reached
+        if not frontier.any():
+            break
+        reached |= frontier
+        dist[frontier] = step
+
+    return dist, row_start
+
+
+def dead_ends(grid: MazeGrid) -> List[Tuple[int, int]]:
+    """Тупики: проходы с единственным проходимым соседом"""
+    result = []
+    for y in range(1, grid.height - 1):
+        row = grid[y]
+        for x in range(1, grid.width - 1):
+            if row[x] == PASSAGE:
+                open_neighbors = sum(1 for dx, dy in NEIGHBORS_4 if grid[y + dy][x + dx] == PASSAGE)
+                if open_neighbors == 1:
+                    result.append((x, y))
+    return result
+
+
+def corridor_stats(grid: MazeGrid) -> Dict[str, float]:
+    """Характеристики коридоров: доля тупиков, развилок и средняя длина участка"""
+    passages = 0
+    ends = 0
+    junctions = 0
+    for y in range(1, grid.height - 1):
+        row = grid[y]
+        for x in range(1, grid.width - 1):
+            if row[x] != PASSAGE:
+                continue
+            passages += 1
+            degree = sum(1 for dx, dy in NEIGHBORS_4 if grid[y + dy][x + dx] == PASSAGE)
+            if degree == 1:
+                ends += 1
+            elif degree >= 3:
+                junctions += 1
+
+    nodes = max(1, ends + junctions)
+    return {
+        'passages': passages,
+        'dead_end_ratio': ends / max(1, passages),
+        'junction_ratio': junctions / max(1, passages),
+        'mean_segment': passages / nodes
+    }
+
+
+class ExplorationBitset:
+    """Исследованные клетки: один бит на клетку, строки упакованы по байтам
+
+    Высота может расти (бесконечный лабиринт). В памяти хранятся только
+    строки row_start..height: строки выгруженных кусков отбрасываются через
+    drop_before, от них остается лишь число исследованных клеток.
+    mark принимает массивы координат и возвращает только клетки, открытые
+    впервые.
+    """
+
+    def __init__(self, width: int, height: int = 0):
+        self.width = width
+        self.row_bytes = (width + 7) // 8
+        self.row_start = 0
+        self.dropped_count = 0
+        self.bits = np.zeros((height, self.row_bytes), dtype=np.uint8)
+
+    @property
+    def height(self) -> int:
+        return self.row_start + self.bits.shape[0]
+
+    def ensure_height(self, height: int):
+        """Дорастить маску до height строк"""
+        if height > self.height:
+            grown = np.zeros((height - self.row_start, self.row_bytes), dtype=np.uint8)
+            grown[:self.bits.shape[0]] = self.bits
+            self.bits = grown
+
+    def drop_before(self, row: int):
+        """Отбросить строки выше row (куски, выгруженные из лабиринта)"""
+        count = min(row, self.height) - self.row_start
+        if count <= 0:
+            return
+        self.dropped_count += int(np.unpackbits(self.bits[:count]).sum())
+        self.bits = self.bits[count:].copy()
+        self.row_start += count
+
+    def mark(self, xs: np.ndarray, ys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Отметить клетки исследованными; вернуть координаты новых клеток"""
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        inside = (xs >= 0) & (xs < self.width) & (ys >= self.row_start) & (ys < self.height)
+        if not inside.all():
+            xs, ys = xs[inside], ys[inside]
+        if xs.size == 0:
+            return xs, ys
+
+        # Дальше ys - номер строки в окне
+        flat = np.unique((ys - self.row_start) * self.width + xs)
+        xs, ys = flat % self.width, flat // self.width
+        byte_index = xs >> 3
+        bit = (0x80 >> (xs & 7)).astype(np.uint8)
+
+        fresh = (self.bits[ys, byte_index] & bit) == 0
+        xs, ys, byte_index, bit = xs[fresh], ys[fresh], byte_index[fresh], bit[fresh]
+        # Несколько клеток могут попасть в один байт - накапливаем через bitwise_or.at
+        np.bitwise_or.at(self.bits, (ys, byte_index), bit)
+        return xs, ys + self.row_start
+
+    def is_explored(self, x: int, y: int) -> bool:
+        if not (0 <= x < self.width and self.row_start <= y < self.height):
+            return False
+        return bool(self.bits[y - self.row_start, x >> 3] & (0x80 >> (x & 7)))
+
+    def as_mask(self, row_start: int = 0, row_end: Optional[int] = None) -> np.ndarray:
+        """Булева маска строк row_start..row_end"""
+        row_end = self.height if row_end is None else row_end
+        mask = np.zeros((row_end - row_start, self.width), dtype=bool)
+        lo, hi = max(self.row_start, row_start), min(self.height, row_end)
+        if lo < hi:
+            mask[lo - row_start:hi - row_start] = np.unpackbits(
+                self.bits[lo - self.row_start:hi - self.row_start], axis=1, count=self.width).astype(bool)
+        return mask
+
+    def count(self) -> int:
+        """Число исследованных клеток (вместе с отброшенными строками)"""
+        return self.dropped_count + int(np.unpackbits(self.bits).sum())
+
+    def coverage(self, grid) -> float:
+        """Доля исследованных проходов лабиринта"""
+        height = min(self.height, grid.height)
+        passable = np.frombuffer(
+            b''.join(bytes(grid[y]) for y in range(height)), dtype=np.uint8
+        ).reshape(height, grid.width) != WALL
+        total = int(passable.sum())
+        if total == 0:
+            return 0.0
+        return int((self.as_mask(0, height) & passable).sum()) / total
+
+    def to_bytes(self) -> bytes:
+        """Строки row_start..height"""
+        return self.bits.tobytes()
+
+    @classmethod
+    def from_bytes(cls, width: int, height: int, data: bytes, row_start: int = 0) -> 'ExplorationBitset':
+        bitset = cls(width, 0)
+        bitset.row_start = row_start
+        bitset.bits = np.frombuffer(data, dtype=np.uint8).reshape(height - row_start, bitset.row_bytes).copy()
+        return bitset
+
+
+# Запеченное освещение: окклюзия в углах и тупиках и статические источники света
+AO_STRENGTH = 0.35
+DEAD_END_DARKEN = 0.1
+LIGHT_RADIUS = 6
+LIGHT_INTENSITY = 0.6
+CELLS_PER_LIGHT = 40
+MAX_LIGHT_LEVEL = 1.6
+
+
+class LightMap:
+    """Запеченная освещенность клеток: float32 [y, x], 1.0 - обычный свет
+
+    Считается один раз при загрузке уровня (в бесконечном лабиринте - для
+    каждого нового куска): окклюзия по числу соседних стен, дополнительное
+    затемнение тупиков и свет статических ламп на развилках, который
+    расходится по проходам, а не сквозь стены. Рейкастер только читает
+    значения в клетках, поэтому в кадре освещение ничего не стоит.
+    В памяти хранятся только строки row_start..height: строки и лампы
+    выгруженных кусков отбрасываются через drop_before.
+
+    Запекание по кускам дает ту же карту, что и запекание всей сетки с
+    теми же лампами: строки над новым куском, на которые он влияет
+    (окклюзия у границы, свет ламп через новые проходы), пересчитываются.
+    """
+
+    def __init__(self, width: int, height: int = 0, seed: Optional[int] = None):
+        self.width = width
+        self.row_start = 0
+        self.values = np.ones((height, width), dtype=np.float32)
+        self.lights: List[Tuple[int, int]] = []
+        self.rng = random.Random(seed)
+
+    @property
+    def height(self) -> int:
+        return self.row_start + self.values.shape[0]
+
+    def ensure_height(self, height: int):
+        """Дорастить карту до height строк (новые строки - обычный свет)"""
+        if height > self.height:
+            grown = np.ones((height - self.row_start, self.width), dtype=np.float32)
+            grown[:self.values.shape[0]] = self.values
+            self.values = grown
+
+    def drop_before(self, row: int):
+        """Отбросить строки выше row (куски, выгруженные из лабиринта) и лампы, которые до них не светят"""
+        count = min(row, self.height) - self.row_start
+        if count <= 0:
+            return
+        self.values = self.values[count:].copy()
+        self.row_start += count
+        self.lights = [(x, y) for x, y in self.lights if y >= self.row_start - LIGHT_RADIUS]
+
+    def bake(self, grid, row_start: int = 0, row_end: Optional[int] = None):
+        """Расставить лампы в строках row_start..row_end и запечь эти строки"""
+        row_end = grid.height if row_end is None else row_end
+        self.ensure_height(row_end)
+
+        pad = LIGHT_RADIUS + 1
+        walls = wall_window(grid, row_start - pad, row_end + pad)
+        for x, y in self._place_lights(walls, slice(pad, pad + row_end - row_start)):
+            self.lights.append((x, y + row_start - pad))
+
+        # Новые проходы меняют окклюзию последней строки выше и пути света
+        # ламп не дальше LIGHT_RADIUS шагов от границы
+        self.relight(grid, max(self.row_start, row_start - pad), row_end)
+
+    def relight(self, grid, row_start: int, row_end: int):
+        """Пересчитать строки row_start..row_end по стенам сетки и уже расставленным лампам"""
+        # Лампа светит на LIGHT_RADIUS шагов, и стены нужны на столько же вокруг нее
+        pad = 2 * LIGHT_RADIUS + 1
+        top = row_start - pad
+        walls = wall_window(grid, top, row_end + pad)
+
+        light = np.zeros(walls.shape, dtype=np.float32)
+        for x, y in self.lights:
+            if row_start - LIGHT_RADIUS <= y < row_end + LIGHT_RADIUS:
+                self._spread_light(walls, light, x, y - top)
+
+        rows = slice(pad, pad + row_end - row_start)
+        self.values[row_start - self.row_start:row_end - self.row_start] = np.minimum(
+            self._occlusion(walls)[rows] + light[rows], MAX_LIGHT_LEVEL
+        )
+
+    @staticmethod
+    def _occlusion(walls: np.ndarray) -> np.ndarray:
+        """Окклюзия проходов: 1.0 на развилке, темнее в коридорах, углах и тупиках"""
+        padded = np.pad(walls, 1, constant_values=True).astype(np.int8)
+        height, width = walls.shape
+        orthogonal = sum(padded[1 + dy:1 + dy + height, 1 + dx:1 + dx + width] for dx, dy in NEIGHBORS_4)
+        diagonal = sum(padded[1 + dy:1 + dy + height, 1 + dx:1 + dx + width]
+                       for dx in (-1, 1) for dy in (-1, 1))
+
+        occlusion = 1.0 - AO_STRENGTH * np.clip((orthogonal + diagonal - 4) / 4, 0.0, 1.0)
+        occlusion -= DEAD_END_DARKEN * (orthogonal == 3)
+        return np.where(walls, 1.0, occlusion).astype(np.float32)
+
+    def _place_lights(self, walls: np.ndarray, rows: slice) -> List[Tuple[int, int]]:
+        """Лампы на развилках (если их нет - в случайных проходах) в строках rows"""
+        padded = np.pad(walls, 1, constant_values=True).astype(np.int8)
+        height, width = walls.shape
+        openings = 4 - sum(padded[1 + dy:1 + dy + height, 1 + dx:1 + dx + width] for dx, dy in NEIGHBORS_4)
+
+        passages = ~walls[rows]
+        junctions = passages & (openings[rows] >= 3)
+        count = int(passages.sum()) // CELLS_PER_LIGHT
+        if count == 0:
+            return []
+
+        candidates = np.argwhere(junctions if junctions.any() else passages)
+        picked = self.rng.sample(range(len(candidates)), min(count, len(candidates)))
+        return [(int(candidates[i][1]), int(candidates[i][0]) + rows.start) for i in picked]
+
+    @staticmethod
+    def _spread_light(walls: np.ndarray, light: np.ndarray, x: int, y: int):
+        """Свет лампы по проходам: затухает с числом шагов до LIGHT_RADIUS"""
+        y0, y1 = max(0, y - LIGHT_RADIUS), min(walls.shape[0], y + LIGHT_RADIUS + 1)
+        x0, x1 = max(0, x - LIGHT_RADIUS), min(walls.shape[1], x + LIGHT_RADIUS + 1)
+        open_cells = ~walls[y0:y1, x0:x1]
+
+        reached = np.zeros(open_cells.shape, dtype=bool)
+        reached[y - y0, x - x0] = True
+        level = np.zeros(open_cells.shape, dtype=np.float32)
+        level[y - y0, x - x0] = LIGHT_INTENSITY
+
+        frontier = reached.copy()
+        for step in range(1, LIGHT_RADIUS + 1):
+            grown = np.zeros_like(frontier)
+            grown[1:] |= frontier[:-1]
+            grown[:-1] |= frontier[1:]
+            grown[:, 1:] |= frontier[:, :-1]
+            grown[:, :-1] |= frontier[:, 1:]
+            frontier = grown & open_cells & ~reached
+            if not frontier.any():
+                break
+            reached |= frontier
+            level[frontier] = LIGHT_INTENSITY * (1.0 - step / (LIGHT_RADIUS + 1))
+
+        light[y0:y1, x0:x1] += level
+
+    def sample(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Освещенность клеток (за пределами карты - 1.0)"""
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        result = np.ones(xs.shape, dtype=np.float32)
+        inside = (xs >= 0) & (xs < self.width) & (ys >= self.row_start) & (ys < self.height)
+        result[inside] = self.values[ys[inside] - self.row_start, xs[inside]]
+        return result
+
+    def to_bytes(self) -> bytes:
+        return self.values.astype(np.float16).tobytes()
+
+    @classmethod
+    def from_bytes(cls, width: int, height: int, data: bytes) -> 'LightMap':
+        light_map = cls(width, 0)
+        light_map.values = np.frombuffer(data, dtype=np.float16).reshape(height, width).astype(np.float32)
+        return light_map
+
+
+def benchmark_algorithms(sizes=(31, 101, 255), repeats: int = 3, seed: int = 0,
+                         algorithms: Optional[List[str]] = None) -> List[Dict[str, float]]:
+    """Микробенчмарк всех алгоритмов: лучшее время из нескольких запусков и структура"""
+    results = []
+    for name in algorithms or MazeGenerator.available_algorithms():
+        for size in sizes:
+            best = math.inf
+            grid = None
+            for attempt in range(repeats):
+                start = time.perf_counter()
+                grid = MazeGenerator.generate(size, size, name, seed=seed + attempt)
+                best = min(best, time.perf_counter() - start)
+
+            row = {'algorithm': name, 'size': size, 'ms': best * 1000}
+            row.update(corridor_stats(grid))
+            results.append(row)
+    return results
+
+
+if __name__ == "__main__":
+    print(f"{'алгоритм':<12}{'размер':>8}{'мс':>10}{'тупики':>9}{'развилки':>10}{'участок':>9}")
+    for row in benchmark_algorithms():
+        print(f"{row['algorithm']:<12}{row['size']:>8}{row['ms']:>10.2f}"
+              f"{row['dead_end_ratio']:>9.3f}{row['junction_ratio']:>10.3f}{row['mean_segment']:>9.2f}")
@@ -0,0 +1,180 @@
+from typing import Optional, Tuple
+
+import arcade
+import numpy as np
+from arcade.gl import BufferDescription
+
+from maze_helper import WALL, ExplorationBitset
+
+
+WALL_COLOR = (80, 80, 80, 255)
+FLOOR_COLOR = (40, 40, 50, 255)
+FOG_COLOR = (0, 0, 0, 0)
+
+MINIMAP_VERTEX_SHADER = """
+#version 330
+
+uniform WindowBlock {
+    mat4 projection;
+    mat4 view;
+} window;
+
+in vec2 in_vert;
+in vec2 in_uv;
+
+out vec2 v_uv;
+
+void main() {
+    gl_Position = window.projection * window.view * vec4(in_vert, 0.0, 1.0);
+    v_uv = in_uv;
+}
+"""
+
+MINIMAP_FRAGMENT_SHADER = """
+#version 330
+
+uniform sampler2D cells;
+uniform vec2 grid_size;
+uniform float cell_size;
+
+in vec2 v_uv;
+
+out vec4 f_color;
+
+void main() {
+    // Зазор в один пиксель между клетками, как у прежней покадровой отрисовки
+    if (cell_size >= 4.0) {
+        vec2 local = fract(v_uv * grid_size) * cell_size;
+        if (any(lessThan(local, vec2(1.0))) || any(greaterThan(local, vec2(cell_size - 1.0)))) {
+            discard;
+        }
+    }
+    vec4 color = texture(cells, v_uv);
+    if (color.a == 0.0) {
+        discard;
+    }
+    f_color = color;
+}
+"""
+
+
+class MinimapLayer:
+    """Статический слой миникарты в текстуре, один тексель на клетку
+
+    Лабиринт растеризуется один раз при загрузке (в бесконечном режиме -
+    при смене загруженных строк). Карта транспонирована, как и раньше:
+    строки лабиринта идут по горизонтали экрана. В режиме тумана видны
+    только клетки из exploration, и в текстуру дописываются лишь вновь
+    открытые клетки.
+    """
+
+    def __init__(self, exploration: Optional[ExplorationBitset] = None, fog: bool = False):
+        self.exploration = exploration
+        self.fog = fog
+        self.rows: Optional[Tuple[int, int]] = None
+        self.width = 0
+
+        self._image: Optional[np.ndarray] = None
+        self._texture = None
+        self._ctx = None
+        self._program = None
+        self._geometry = None
+        self._vertex_buffer = None
+
+    def build(self, grid, row_start: int, row_end: int):
+        """Растеризовать строки лабиринта row_start..row_end в текстуру"""
+        width = grid.width
+        rows = np.frombuffer(
+            b''.join(bytes(grid[y]) for y in range(row_start, row_end)),
+            dtype=np.uint8
+        ).reshape(row_end - row_start, width)
+
+        self.rows = (row_start, row_end)
+        self.width = width
+
+        # Тексель (tx, ty) = клетка (x=ty, y=row_start+tx)
+        image = np.empty((width, row_end - row_start, 4), dtype=np.uint8)
+        image[:] = FLOOR_COLOR
+        image[rows.T == WALL] = WALL_COLOR
+        self._image = image
+
+        ctx = arcade.get_window().ctx
+        self._ctx = ctx
+        self._texture = ctx.texture(
+            (row_end - row_start, width), components=4,
+            filter=(ctx.NEAREST, ctx.NEAREST)
+        )
+        self._upload(0, 0, row_end - row_start, width)
+
+    def _upload(self, tx: int, ty: int, w: int, h: int):
+        """Залить в текстуру часть изображения с учетом тумана"""
+        part = self._image[ty:ty + h, tx:tx + w]
+        if self.fog:
+            row_start = self.rows[0]
+            if self.exploration is not None:
+                mask = self.exploration.as_mask(row_start + tx, row_start + tx + w)[:, ty:ty + h].T
+            else:
+                mask = np.zeros(part.shape[:2], dtype=bool)
+            part = np.where(mask[..., None], part, np.array(FOG_COLOR, dtype=np.uint8))
+
+        data = np.ascontiguousarray(part).tobytes()
+        if (w, h) == self._texture.size:
+            self._texture.write(data)
+        else:
+            self._texture.write(data, viewport=(tx, ty, w, h))
+
+    def set_fog(self, fog: bool):
+        """Включить или выключить туман и перезалить текстуру"""
+        self.fog = fog
+        if self._texture is not None:
+            w, h = self._texture.size
+            self._upload(0, 0, w, h)
+
+    def reveal(self, xs: np.ndarray, ys: np.ndarray):
+        """Дописать в текстуру впервые открытые клетки (координаты лабиринта)"""
+        if not self.fog or self._texture is None or len(xs) == 0:
+            return
+
+        row_start, row_end = self.rows
+        inside = (ys >= row_start) & (ys < row_end)
+        if not inside.any():
+            return
+
+        xs, ys = xs[inside], ys[inside]
+        tx, ty = int(ys.min()) - row_start, int(xs.min())
+        w, h = int(ys.max()) - row_start - tx + 1, int(xs.max()) - ty + 1
+        self._upload(tx, ty, w, h)
+
+    def draw(self, left: float, bottom: float, cell_size: float):
+        """Вывести слой одним прямоугольником"""
+        if self._texture is None:
+            return
+
+        if self._program is None:
+            ctx = self._ctx
+            self._program = ctx.program(
+                vertex_shader=MINIMAP_VERTEX_SHADER,
+                fragment_shader=MINIMAP_FRAGMENT_SHADER
+            )
+            self._vertex_buffer = ctx.buffer(reserve=4 * 4 * 4)
+            self._geometry = ctx.geometry(
+                [BufferDescription(self._vertex_buffer, '2f 2f', ['in_vert', 'in_uv'])],
+                mode=ctx.TRIANGLE_STRIP
+            )
+
+        w, h = self._texture.size
+        right = left + w * cell_size
+        top = bottom + h * cell_size
+        self._vertex_buffer.write(np.array([
+            left, bottom, 0.0, 0.0,
+            right, bottom, 1.0, 0.0,
+            left, top, 0.0, 1.0,
+            right, top, 1.0, 1.0,
+        ], dtype=np.float32).tobytes())
+
+        self._texture.use(0)
+        self._program['cells'] = 0
+        self._program['grid_size'] = (w, h)
+        self._program['cell_size'] = float(cell_size)
+        with self._ctx.enabled(self._ctx.BLEND):
+            self._geometry.render(self._program)
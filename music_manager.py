@@ -1,33 +1,56 @@
-import arcade
 import os
 import random
 
+from pyglet import media
+
+from audio_registry import AudioRegistry, audio_registry
+
+
+# Длительность кроссфейда между треками и сколько секунд новое настроение
+# должно держаться, прежде чем музыка сменится
+CROSSFADE_TIME = 3.0
+MOOD_HOLD = 2.0
+
 
 class MusicManager:
-    """Менеджер фоновой музыки для хоррора"""
+    """Менеджер фоновой музыки для хоррора
+
+    Трек по стрессу выбирает update(): 'calm', 'ambient', 'tension' или
+    'action'. Каждый трек открывается потоком один раз и живет на своем
+    плеере; смена трека - кроссфейд громкостей в update() каждый кадр,
+    а затихший трек ставится на паузу, так что возврат к нему не требует
+    повторного открытия файла.
+    """
 
-    def __init__(self):
+    def __init__(self, registry: AudioRegistry = audio_registry, crossfade_time: float = CROSSFADE_TIME):
+        self.registry = registry
         self.current_music = None
         self.music_volume = 0.3
         self.playlist = []
         self.current_track_index = -1
         self.music_enabled = True
+        self.crossfade_time = crossfade_time
+        self.fade_time = crossfade_time
+        self.pending_mood = None
+        self.mood_timer = 0.0
 
         self.load_music()
 
     def load_music(self):
-        """Загрузить музыку из папки custom_sounds/music"""
+        """Собрать плейлист из папки custom_sounds/music (файлы открываются при воспроизведении)"""
         music_folder = "custom_sounds/music"
 
-        if os.path.exists(music_folder):
-            for file in os.listdir(music_folder):
-                if file.lower().endswith(('.wav', '.ogg', '.mp3')):
-                    path = os.path.join(music_folder, file)
-                    self.playlist.append({
-                        'path': path,
-                        'name': file,
-                        'type': self.detect_music_type(file)
-                    })
+        for path in self.registry.files(music_folder, recursive=False):
+            file = os.path.basename(path)
+            self.playlist.append({
+                'handle': self.registry.acquire(path, streaming=True),
+                'path': path,
+                'name': file,
+                'type': self.detect_music_type(file),
+                'player': None,
+                'gain': 0.0,
+                'target': 0.0
+            })
 
     def detect_music_type(self, filename: str) -> str:
         """Определить тип музыки по названию файла"""
@@ -44,8 +67,8 @@ class MusicManager:
         else:
             return 'ambient'
 
-    def play_music(self, music_type: str = None, loop: bool = True):
-        """Воспроизвести музыку"""
+    def play_music(self, music_type: str = None, loop: bool = True, fade: float = None):
+        """Плавно перейти на случайный трек типа music_type"""
         if not self.music_enabled or not self.playlist:
             return
 
@@ -57,44 +80,123 @@ class MusicManager:
         if not available_tracks:
             available_tracks = self.playlist
 
+        # Текущий трек подходит - не переключаем
+        if self.current_track_index >= 0 and self.playlist[self.current_track_index] in available_tracks:
+            self.playlist[self.current_track_index]['target'] = 1.0
+            return
+
         # Выбираем случайный трек
         track = random.choice(available_tracks)
+        self._crossfade_to(self.playlist.index(track), loop, self.crossfade_time if fade is None else fade)
 
-        # Останавливаем текущую музыку
-        if self.current_music:
-            self.current_music.stop()
-
-        # Загружаем и воспроизводим новую
-        self.current_music = arcade.load_sound(track['path'], streaming=True)
-        self.current_music.play(volume=self.music_volume, loop=loop)
-
-
-def play_tension_music(self, stress_level: float):
-    """Воспроизвести напряженную музыку в зависимости от стресса"""
-    if stress_level > 80:
-        self.play_music('action')
-    elif stress_level > 60:
-        self.play_music('tension')
-    elif stress_level > 40:
-        self.play_music('ambient')
+    def play_tension_music(self, stress_level: float):
+        """Воспроизвести напряженную музыку в зависимости от стресса"""
+        self.play_music(self.mood_for_stress(stress_level))
 
-
-def stop_music(self):
-    """Остановить музыку"""
-    if self.current_music:
-        self.current_music.stop()
+    @staticmethod
+    def mood_for_stress(stress_level: float) -> str:
+        """Тип музыки для уровня стресса"""
+        if stress_level > 80:
+            return 'action'
+        elif stress_level > 60:
+            return 'tension'
+        elif stress_level > 40:
+            return 'ambient'
+        return 'calm'
+
+    @property
+    def audible(self) -> bool:
+        """Какой-то трек еще звучит (в том числе затихает после stop_music с fade)"""
+        return any(track['player'] is not None and track['gain'] > 0.0 for track in self.playlist)
+
+    def update(self, delta_time: float, stress_level: float = None):
+        """Каждый кадр: выбор трека по стрессу и шаг кроссфейда"""
+        if stress_level is not None and self.current_track_index >= 0:
+            mood = self.mood_for_stress(stress_level)
+            current = self.playlist[self.current_track_index]
+            # Настроение должно продержаться MOOD_HOLD секунд, чтобы трек не дергался
+            if mood != self.pending_mood:
+                self.pending_mood = mood
+                self.mood_timer = 0.0
+            self.mood_timer += delta_time
+            if mood != current['type'] and self.mood_timer >= MOOD_HOLD:
+                self.play_music(mood)
+
+        step = delta_time / self.fade_time if self.fade_time > 0 else 1.0
+        for track in self.playlist:
+            player = track['player']
+            if player is None:
+                continue
+            track['gain'] += max(-step, min(step, track['target'] - track['gain']))
+            if track['gain'] <= 0.0 and track['target'] <= 0.0:
+                track['gain'] = 0.0
+                # Трек остается открытым на паузе: возврат к нему без повторного открытия
+                if player.playing:
+                    player.pause()
+                continue
+            player.volume = track['gain'] * self.music_volume
+            if not player.playing:
+                player.play()
+
+    def stop_music(self, fade: float = 0.0):
+        """Остановить музыку (сразу или с затуханием fade секунд)"""
+        self.fade_time = fade
+        for track in self.playlist:
+            track['target'] = 0.0
+            if fade <= 0:
+                track['gain'] = 0.0
+                if track['player'] is not None:
+                    track['player'].pause()
+        self.current_track_index = -1
         self.current_music = None
 
+    def set_volume(self, volume: float):
+        """Установить громкость музыки (сразу и для играющих треков)"""
+        self.music_volume = max(0.0, min(1.0, volume))
+        for track in self.playlist:
+            if track['player'] is not None and track['gain'] > 0:
+                track['player'].volume = track['gain'] * self.music_volume
+
+    def fade_out(self, duration: float = 2.0):
+        """Плавное затухание музыки"""
+        self.stop_music(fade=duration)
+
+    def close(self):
+        """Закрыть открытые потоки (сцена с музыкой ушла с экрана)"""
+        for track in self.playlist:
+            if track['player'] is not None:
+                track['player'].pause()
+                track['player'].delete()
+                track['player'] = None
+            track['gain'] = 0.0
+            track['target'] = 0.0
+        self.current_track_index = -1
+        self.current_music = None
 
-def set_volume(self, volume: float):
-    """Установить громкость музыки"""
-    self.music_volume = max(0.0, min(1.0, volume))
-    if self.current_music:
-        # В Arcade нельзя изменить громкость на лету, нужно перезапустить
-        pass
-
-
-def fade_out(self, duration: float = 2.0):
-    """Плавное затухание музыки"""
-    # В Arcade нет встроенного фейда, но можно эмулировать
-    self.stop_music()
+    def _open(self, track: dict, loop: bool) -> bool:
+        """Открыть поток трека один раз и держать его на своем плеере"""
+        if track['player'] is None:
+            sound = track['handle'].sound
+            if sound is None:
+                return False
+            player = media.Player()
+            player.queue(sound.source)
+            track['player'] = player
+        track['player'].loop = loop
+        return True
+
+    def _crossfade_to(self, index: int, loop: bool, fade: float):
+        """Начать кроссфейд с текущего трека на трек index"""
+        track = self.playlist[index]
+        if not self._open(track, loop):
+            return
+        self.fade_time = fade
+        for other in self.playlist:
+            other['target'] = 0.0
+        track['target'] = 1.0
+        if fade <= 0:
+            for other in self.playlist:
+                other['gain'] = other['target']
+        self.current_track_index = index
+        self.current_music = track['player']
+        self.update(0.0)
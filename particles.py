@@ -0,0 +1,323 @@
+import math
+from typing import Callable, Iterator, List, Optional
+
+import arcade
+import numpy as np
+from arcade.gl import BufferDescription
+
+
+PARTICLE_VERTEX_SHADER = """
+#version 330
+
+uniform WindowBlock {
+    mat4 projection;
+    mat4 view;
+} window;
+
+uniform vec2 u_offset;
+
+in vec2 in_pos;
+in float in_size;
+in vec4 in_color;
+
+out float v_size;
+out vec4 v_color;
+
+void main() {
+    gl_Position = vec4(in_pos + u_offset, 0.0, 1.0);
+    v_size = in_size;
+    v_color = in_color;
+}
+"""
+
+PARTICLE_GEOMETRY_SHADER = """
+#version 330
+
+layout (points) in;
+layout (triangle_strip, max_vertices = 4) out;
+
+uniform WindowBlock {
+    mat4 projection;
+    mat4 view;
+} window;
+
+in float v_size[];
+in vec4 v_color[];
+
+out vec2 g_uv;
+out vec4 g_color;
+
+void main() {
+    vec2 center = gl_in[0].gl_Position.xy;
+    float radius = v_size[0];
+    mat4 mvp = window.projection * window.view;
+
+    for (int i = 0; i < 4; i++) {
+        vec2 corner = vec2(i % 2 == 0 ? -1.0 : 1.0, i < 2 ? -1.0 : 1.0);
+        g_uv = corner;
+        g_color = v_color[0];
+        gl_Position = mvp * vec4(center + corner * radius, 0.0, 1.0);
+        EmitVertex();
+    }
+    EndPrimitive();
+}
+"""
+
+PARTICLE_FRAGMENT_SHADER = """
+#version 330
+
+in vec2 g_uv;
+in vec4 g_color;
+
+out vec4 f_color;
+
+void main() {
+    float dist = length(g_uv);
+    if (dist > 1.0) {
+        discard;
+    }
+    f_color = vec4(g_color.rgb, g_color.a * (1.0 - smoothstep(0.85, 1.0, dist)));
+}
+"""
+
+# Программа общая для всех эмиттеров одного контекста
+_programs = {}
+
+
+def _get_program(ctx):
+    program = _programs.get(id(ctx))
+    if program is None:
+        program = ctx.program(
+            vertex_shader=PARTICLE_VERTEX_SHADER,
+            geometry_shader=PARTICLE_GEOMETRY_SHADER,
+            fragment_shader=PARTICLE_FRAGMENT_SHADER
+        )
+        _programs[id(ctx)] = program
+    return program
+
+
+def _sample(rng, value, count):
+    """Случайные значения из диапазона (min, max) или константа"""
+    if isinstance(value, (tuple, list)):
+        return rng.uniform(value[0], value[1], count).astype(np.float32)
+    return np.full(count, value, dtype=np.float32)
+
+
+class ParticleEmitter:
+    """Эмиттер частиц на массивах NumPy
+
+    Все частицы хранятся в заранее выделенных массивах фиксированной
+    вместимости: позиции, скорости, время жизни, цвет и размер. Мертвые
+    частицы удаляются перестановкой с хвоста (swap-and-pop), а отрисовка -
+    один вызов на весь эмиттер. Скорости задаются в пикселях за кадр при 60 FPS.
+
+    spawn_budget ограничивает число новых частиц за кадр, а после заполнения
+    на degrade_start запросы плавно урезаются: при переполнении эффект
+    становится беднее, но кадр не проседает.
+    """
+
+    def __init__(self, capacity: int = 16384, fade: bool = True,
+                 spawn_budget: Optional[int] = None, degrade_start: float = 0.75):
+        self.capacity = capacity
+        self.fade = fade
+        self.count = 0
+        self.spawn_budget = spawn_budget
+        self.degrade_start = degrade_start
+        self.spawned_this_frame = 0
+        self.dropped = 0
+
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.max_life = np.ones(capacity, dtype=np.float32)
+        self.gravity = np.zeros(capacity, dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros((capacity, 4), dtype=np.uint8)
+
+        self._arrays = (self.pos, self.vel, self.life, self.max_life, self.gravity, self.size, self.color)
+        self._draw_color = np.zeros((capacity, 4), dtype=np.uint8)
+        self._rng = np.random.default_rng()
+
+        self._ctx = None
+        self._geometry = None
+        self._pos_buffer = None
+        self._size_buffer = None
+        self._color_buffer = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def emit(self, x, y, count, speed=None, vx=(0.0, 0.0), vy=(0.0, 0.0), life=1.0, size=3.0,
+             color=(255, 255, 255), alpha=255, gravity=0.0, jitter=0.0, color_jitter=None) -> int:
+        """Выпустить частицы из точки (x, y) или из массивов координат
+
+        speed - диапазон скорости во все стороны; иначе vx/vy - диапазоны
+        по осям. jitter - разброс стартовой позиции, color_jitter - добавка
+        к каждому каналу цвета (0..значение). Возвращает число выпущенных частиц.
+        """
+        requested = int(count)
+        count = self._allowance(requested)
+        self.dropped += requested - count
+        if count <= 0:
+            return 0
+
+        rng = self._rng
+        start = self.count
+        end = start + count
+
+        self.pos[start:end, 0] = x
+        self.pos[start:end, 1] = y
+        if jitter:
+            self.pos[start:end] += rng.uniform(-jitter, jitter, (count, 2)).astype(np.float32)
+
+        if speed is not None:
+            angles = rng.uniform(0, math.pi * 2, count)
+            magnitudes = _sample(rng, speed, count)
+            self.vel[start:end, 0] = np.cos(angles) * magnitudes
+            self.vel[start:end, 1] = np.sin(angles) * magnitudes
+        else:
+            self.vel[start:end, 0] = _sample(rng, vx, count)
+            self.vel[start:end, 1] = _sample(rng, vy, count)
+
+        lives = _sample(rng, life, count)
+        self.life[start:end] = lives
+        self.max_life[start:end] = np.maximum(lives, 1e-6)
+        self.gravity[start:end] = gravity
+        self.size[start:end] = _sample(rng, size, count)
+
+        self.color[start:end, :3] = color[:3]
+        self.color[start:end, 3] = alpha
+        if color_jitter:
+            jitter_values = rng.integers(0, np.asarray(color_jitter) + 1, (count, 3))
+            self.color[start:end, :3] = np.minimum(255, self.color[start:end, :3] + jitter_values)
+
+        self.count = end
+        self.spawned_this_frame += count
+        return count
+
+    def _allowance(self, count: int) -> int:
+        """Сколько частиц из запроса можно выпустить в этом кадре"""
+        allowed = self.capacity - self.count
+        if self.spawn_budget is not None:
+            allowed = min(allowed, self.spawn_budget - self.spawned_this_frame)
+
+        fill = self.count / self.capacity
+        if fill > self.degrade_start:
+            count = int(count * (1.0 - fill) / (1.0 - self.degrade_start))
+
+        return max(0, min(count, allowed))
+
+    def set_alpha(self, alpha):
+        """Задать базовую прозрачность живых частиц (число или массив)"""
+        self.color[:self.count, 3] = np.clip(alpha, 0, 255)
+
+    def update(self, delta_time: float):
+        """Сдвинуть частицы, уменьшить время жизни и убрать мертвые"""
+        self.spawned_this_frame = 0
+        n = self.count
+        if n == 0:
+            return
+
+        step = delta_time * 60
+        self.pos[:n] += self.vel[:n] * step
+        self.vel[:n, 1] -= self.gravity[:n] * step
+        self.life[:n] -= delta_time
+
+        dead = np.flatnonzero(self.life[:n] <= 0)
+        if dead.size:
+            self._remove(dead)
+
+    def _remove(self, dead: np.ndarray):
+        """Swap-and-pop: дыры внутри живого диапазона заполняются живыми с хвоста"""
+        n = self.count
+        new_count = n - dead.size
+        holes = dead[dead < new_count]
+        if holes.size:
+            tail = np.arange(new_count, n)
+            movers = tail[self.life[new_count:n] > 0]
+            for array in self._arrays:
+                array[holes] = array[movers]
+        self.count = new_count
+
+    def draw(self, offset_x: float = 0, offset_y: float = 0):
+        """Отрисовать все частицы одним вызовом"""
+        n = self.count
+        if n == 0:
+            return
+
+        self._ensure_gpu()
+
+        colors = self._draw_color[:n]
+        colors[:] = self.color[:n]
+        if self.fade:
+            fade = np.clip(self.life[:n] / self.max_life[:n], 0.0, 1.0)
+            colors[:, 3] = (self.color[:n, 3] * fade).astype(np.uint8)
+
+        self._pos_buffer.write(self.pos[:n].tobytes())
+        self._size_buffer.write(self.size[:n].tobytes())
+        self._color_buffer.write(colors.tobytes())
+
+        program = _get_program(self._ctx)
+        program['u_offset'] = (offset_x, offset_y)
+        with self._ctx.enabled(self._ctx.BLEND):
+            self._geometry.render(program, mode=self._ctx.POINTS, vertices=n)
+
+    def _ensure_gpu(self):
+        """Создать буферы на видеокарте при первой отрисовке"""
+        if self._geometry is not None:
+            return
+
+        ctx = arcade.get_window().ctx
+        self._ctx = ctx
+        self._pos_buffer = ctx.buffer(reserve=self.capacity * 8)
+        self._size_buffer = ctx.buffer(reserve=self.capacity * 4)
+        self._color_buffer = ctx.buffer(reserve=self.capacity * 4)
+        self._geometry = ctx.geometry([
+            BufferDescription(self._pos_buffer, '2f', ['in_pos']),
+            BufferDescription(self._size_buffer, '1f', ['in_size']),
+            BufferDescription(self._color_buffer, '4f1', ['in_color']),
+        ], mode=ctx.POINTS)
+
+
+class EffectPool:
+    """Пул переходных эффектов фиксированного размера
+
+    Эффекты - словари с полем 'life'; слот свободен, пока life <= 0.
+    Все словари создаются заранее, а spawn выдает не больше spawn_budget
+    эффектов за кадр и возвращает None, если свободных слотов нет.
+    """
+
+    def __init__(self, size: int, factory: Callable[[], dict], spawn_budget: int = 1):
+        self.items: List[dict] = [factory() for _ in range(size)]
+        self.spawn_budget = spawn_budget
+        self.spawned_this_frame = 0
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def begin_frame(self):
+        """Сбросить бюджет появления на новый кадр"""
+        self.spawned_this_frame = 0
+
+    def spawn(self, **fields) -> Optional[dict]:
+        """Занять свободный слот и обновить его поля"""
+        if self.spawned_this_frame >= self.spawn_budget:
+            return None
+
+        for item in self.items:
+            if item['life'] <= 0:
+                item.update(fields)
+                item['life'] = fields.get('life', item.get('max_life', 1.0))
+                self.spawned_this_frame += 1
+                return item
+        return None
+
+    def active(self) -> Iterator[dict]:
+        """Живые эффекты"""
+        return (item for item in self.items if item['life'] > 0)
@@ -0,0 +1,195 @@
+from contextlib import contextmanager
+from typing import Dict, Tuple
+
+import arcade
+from arcade.gl import geometry
+
+from hud_layer import COMPOSITE_VERTEX_SHADER
+
+
+POSTPROCESS_FRAGMENT_SHADER = """
+#version 330
+
+// Включенные эффекты: значения подставляются при компиляции варианта
+#define DISTORTION 0
+#define BLOOD 0
+#define VIGNETTE 0
+#define SHADOW 0
+#define FLASH 0
+
+uniform sampler2D scene;
+uniform vec2 resolution;
+uniform float time;
+
+// Волновое искажение, амплитуда в пикселях
+uniform float distortion;
+
+// Виньетка сверху и снизу; darkness усиливает ее без фонарика
+uniform float vignette;
+uniform float darkness;
+
+// Кровавая заливка экрана
+uniform vec4 blood;
+
+// Тень паранойи: прямоугольник x0, y0, x1, y1
+uniform vec4 shadow_rect;
+
+// Вспышка поверх всего
+uniform vec4 flash;
+
+in vec2 v_uv;
+
+out vec4 f_color;
+
+vec3 over(vec3 base, vec3 color, float alpha) {
+    return mix(base, color, clamp(alpha, 0.0, 1.0));
+}
+
+void main() {
+    vec2 pixel = v_uv * resolution;
+    vec2 uv = v_uv;
+#if DISTORTION
+    uv += vec2(sin(pixel.y * 0.05 + time * 20.0), cos(pixel.x * 0.05 + time * 18.0))
+          * distortion / resolution;
+#endif
+    vec3 color = texture(scene, uv).rgb;
+
+#if BLOOD
+    color = over(color, blood.rgb, blood.a);
+#endif
+
+#if VIGNETTE
+    {
+        float band = resolution.y * 0.4;
+        float edge = min(pixel.y, resolution.y - pixel.y) / band;
+        color = over(color, vec3(0.0), min(1.0, vignette * darkness) * (1.0 - clamp(edge, 0.0, 1.0)));
+    }
+#endif
+
+#if SHADOW
+    if (all(greaterThanEqual(pixel, shadow_rect.xy)) && all(lessThan(pixel, shadow_rect.zw))) {
+        color = over(color, vec3(0.0), 100.0 / 255.0);
+    }
+#endif
+
+#if FLASH
+    color = over(color, flash.rgb, flash.a);
+#endif
+
+    f_color = vec4(color, 1.0);
+}
+"""
+
+DEFAULT_UNIFORMS: Dict[str, object] = {
+    'time': 0.0,
+    'distortion': 0.0,
+    'vignette': 0.0,
+    'darkness': 1.0,
+    'blood': (0.0, 0.0, 0.0, 0.0),
+    'shadow_rect': (0.0, 0.0, 0.0, 0.0),
+    'flash': (0.0, 0.0, 0.0, 0.0),
+}
+
+
+def rgba(color, alpha: float = 255) -> tuple:
+    """Цвет 0-255 и альфа 0-255 в нормализованный vec4 для шейдера"""
+    return (color[0] / 255, color[1] / 255, color[2] / 255, min(255, max(0, alpha)) / 255)
+
+
+def active_effects(uniforms: Dict[str, object]) -> Tuple[str, ...]:
+    """Включенные эффекты - по ним выбирается вариант шейдера"""
+    effects = []
+    if uniforms['distortion'] > 0:
+        effects.append('DISTORTION')
+    if uniforms['blood'][3] > 0:
+        effects.append('BLOOD')
+    if uniforms['vignette'] > 0:
+        effects.append('VIGNETTE')
+    x0, y0, x1, y1 = uniforms['shadow_rect']
+    if x1 > x0 and y1 > y0:
+        effects.append('SHADOW')
+    if uniforms['flash'][3] > 0:
+        effects.append('FLASH')
+    return tuple(effects)
+
+
+class PostProcess:
+    """Экранные эффекты одним проходом фрагментного шейдера
+
+    Значения эффектов задаются через set() до отрисовки кадра (reset()
+    сбрасывает их). Сцена рисуется внутри capture() в offscreen-текстуру,
+    затем draw() выводит ее на экран, применяя все эффекты сразу. Для
+    каждого набора включенных эффектов компилируется свой вариант шейдера
+    (выключенные эффекты не считаются даже в программном GL), а если
+    эффектов нет, capture() рисует прямо на экран и проход не нужен.
+
+    Мелкая геометрия (капли крови, прожилки) остается в сцене: попиксельный
+    расчет по всему экрану для нее дороже нескольких примитивов.
+    """
+
+    def __init__(self):
+        self.uniforms: Dict[str, object] = dict(DEFAULT_UNIFORMS)
+
+        self._ctx = None
+        self._size = None
+        self._fbo = None
+        self._quad = None
+        self._programs = {}
+        self._effects: Tuple[str, ...] = ()
+
+    def reset(self):
+        self.uniforms = dict(DEFAULT_UNIFORMS)
+
+    def set(self, **uniforms):
+        self.uniforms.update(uniforms)
+
+    @contextmanager
+    def capture(self):
+        """Перенаправить отрисовку сцены в offscreen-текстуру (если есть эффекты)"""
+        self._effects = active_effects(self.uniforms)
+        if not self._effects:
+            yield
+            return
+
+        window = arcade.get_window()
+        size = (window.width, window.height)
+        if size != self._size:
+            self._create_target(window, size)
+
+        with self._fbo.activate():
+            self._fbo.clear(color=window.background_color)
+            yield
+
+    def draw(self):
+        """Вывести сцену на экран с эффектами"""
+        if not self._effects:
+            return
+
+        program = self._program(self._effects)
+        program.set_uniform_safe('resolution', self._size)
+        for name, value in self.uniforms.items():
+            program.set_uniform_safe(name, value)
+
+        self._fbo.color_attachments[0].use(0)
+        self._quad.render(program)
+
+    def _program(self, effects: Tuple[str, ...]):
+        """Вариант шейдера для набора эффектов"""
+        program = self._programs.get(effects)
+        if program is None:
+            program = self._ctx.program(
+                vertex_shader=COMPOSITE_VERTEX_SHADER,
+                fragment_shader=POSTPROCESS_FRAGMENT_SHADER,
+                defines={effect: '1' for effect in effects}
+            )
+            program['scene'] = 0
+            self._programs[effects] = program
+        return program
+
+    def _create_target(self, window, size):
+        """Создать текстуру под размер окна"""
+        self._ctx = window.ctx
+        self._size = size
+        self._fbo = self._ctx.framebuffer(color_attachments=[self._ctx.texture(size, components=4)])
+        if self._quad is None:
+            self._quad = geometry.quad_2d_fs()
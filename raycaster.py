@@ -0,0 +1,187 @@
+from typing import Tuple
+
+import arcade
+import numpy as np
+from arcade.gl import BufferDescription
+
+from maze_helper import wall_window
+
+
+RAY_STEP = 0.05
+MAX_RAY_DISTANCE = 25.0
+
+# Типы стен по направлению, откуда пришел луч
+WALL_FRONT = 0
+WALL_SIDE = 1
+WALL_CORNER = 2
+
+# Фонарик: полуугол луча (рад), дальность и вклад в освещение
+FLASHLIGHT_CONE = 0.35
+FLASHLIGHT_RANGE = 7.0
+FLASHLIGHT_GAIN = 1.2
+FLASHLIGHT_WARM = np.array([45.0, 40.0, 30.0])
+
+
+def cast_rays(grid, x: float, y: float, angles: np.ndarray,
+              step: float = RAY_STEP, max_dist: float = MAX_RAY_DISTANCE
+              ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Пустить все лучи разом шагами step, как прежний покадровый цикл
+
+    Возвращает расстояния до стены, типы стен (WALL_FRONT/SIDE/CORNER) и
+    клетки [N, 2] (x, y), из которых луч пришел к стене, - с этой стороны
+    стена и освещена. Луч, не встретивший стену, получает max_dist и WALL_FRONT.
+    """
+    reach = int(max_dist) + 2
+    row_start = int(y) - reach
+    walls = wall_window(grid, row_start, int(y) + reach + 1)
+    height, width = walls.shape
+
+    steps = np.arange(1, int(round(max_dist / step)) + 1) * step
+    xs = x + np.cos(angles)[:, None] * steps
+    ys = y + np.sin(angles)[:, None] * steps
+
+    # int() отбрасывает дробную часть, как в check_collision
+    cell_x = xs.astype(np.int64)
+    cell_y = ys.astype(np.int64) - row_start
+    inside = (cell_x >= 0) & (cell_x < width) & (cell_y >= 0) & (cell_y < height)
+    hits = np.ones(xs.shape, dtype=bool)
+    hits[inside] = walls[cell_y[inside], cell_x[inside]]
+
+    hit_any = hits.any(axis=1)
+    first = hits.argmax(axis=1)
+    rays = np.arange(len(angles))
+
+    distances = np.where(hit_any, steps[first], max_dist)
+
+    hit_x, hit_y = cell_x[rays, first], cell_y[rays, first]
+    prev = np.maximum(first - 1, 0)
+    last_x = np.where(first > 0, cell_x[rays, prev], int(x))
+    last_y = np.where(first > 0, cell_y[rays, prev], int(y) - row_start)
+
+    changed_x = hit_x != last_x
+    changed_y = hit_y != last_y
+    wall_types = np.where(changed_x & changed_y, WALL_CORNER, np.where(changed_x, WALL_SIDE, WALL_FRONT))
+    wall_types[~hit_any] = WALL_FRONT
+    cells = np.stack([last_x, last_y + row_start], axis=1)
+    return distances, wall_types, cells
+
+
+def flashlight_beam(column_angles: np.ndarray, row_angles: np.ndarray, distances: np.ndarray,
+                    beam_angle: float, power: float) -> np.ndarray:
+    """Освещенность фонариком в точках колонок
+
+    column_angles - углы лучей колонок, row_angles и distances - вертикальные
+    углы и расстояния точек (массивы [колонка, точка]). power - мощность
+    фонарика (заряд, мерцание), 0 - выключен.
+    """
+    if power <= 0:
+        return np.zeros(row_angles.shape)
+
+    horizontal = (column_angles - beam_angle + np.pi) % (2 * np.pi) - np.pi
+    offset = np.hypot(horizontal[:, None], row_angles) / FLASHLIGHT_CONE
+    cone = np.clip(1.0 - offset * offset, 0.0, 1.0)
+
+    reach = FLASHLIGHT_RANGE * (0.5 + 0.5 * power)
+    falloff = 1.0 / (1.0 + (distances / reach) ** 2)
+    return power * cone * falloff
+
+
+def light_colors(base: np.ndarray, beam: np.ndarray) -> np.ndarray:
+    """Цвет с учетом фонарика: base [.., 3] в 0-255, beam [..] -> [.., 3] в 0-1"""
+    lit = base * (1.0 + FLASHLIGHT_GAIN * beam[..., None]) + FLASHLIGHT_WARM * beam[..., None]
+    return np.clip(lit, 0, 255) / 255.0
+
+
+WALL_VERTEX_SHADER = """
+#version 330
+
+uniform WindowBlock {
+    mat4 projection;
+    mat4 view;
+} window;
+
+in vec2 in_vert;
+in vec3 in_color;
+
+out vec3 v_color;
+
+void main() {
+    gl_Position = window.projection * window.view * vec4(in_vert, 0.0, 1.0);
+    v_color = in_color;
+}
+"""
+
+WALL_FRAGMENT_SHADER = """
+#version 330
+
+in vec3 v_color;
+
+out vec4 f_color;
+
+void main() {
+    f_color = vec4(v_color, 1.0);
+}
+"""
+
+
+class WallBatch:
+    """Колонки стен, пола и потолка одной геометрией
+
+    Каждая колонка - три полосы (пол, стена, потолок); цвет задается
+    в вершинах на границах полос и интерполируется по высоте.
+    """
+
+    FLOATS_PER_VERTEX = 5
+
+    def __init__(self):
+        self._ctx = None
+        self._program = None
+        self._buffer = None
+        self._geometry = None
+        self._capacity = 0
+        self._count = 0
+
+    def update(self, left: np.ndarray, right: np.ndarray, edges: np.ndarray, colors: np.ndarray):
+        """Задать колонки
+
+        left, right - края колонок [N]; edges - высоты границ полос [N, 4]
+        (низ пола, низ стены, верх стены, верх потолка); colors - цвета
+        полос снизу и сверху [N, 3, 2, 3] в 0-1.
+        """
+        columns = len(left)
+        bottom = edges[:, :3]
+        top = edges[:, 1:]
+
+        # Два треугольника на полосу: (л, н) (п, н) (л, в) (п, н) (п, в) (л, в)
+        xs = np.stack([left, right, left, right, right, left], axis=1)[:, None, :]
+        xs = np.broadcast_to(xs, (columns, 3, 6))
+        is_top = np.array([False, False, True, False, True, True])
+        ys = np.where(is_top, top[..., None], bottom[..., None])
+        vertex_colors = np.where(is_top[:, None], colors[:, :, 1, None, :], colors[:, :, 0, None, :])
+
+        data = np.empty((columns, 3, 6, self.FLOATS_PER_VERTEX), dtype=np.float32)
+        data[..., 0] = xs
+        data[..., 1] = ys
+        data[..., 2:] = vertex_colors
+        self._write(data.reshape(-1, self.FLOATS_PER_VERTEX))
+
+    def _write(self, vertices: np.ndarray):
+        if self._ctx is None:
+            ctx = arcade.get_window().ctx
+            self._ctx = ctx
+            self._program = ctx.program(vertex_shader=WALL_VERTEX_SHADER, fragment_shader=WALL_FRAGMENT_SHADER)
+
+        count = len(vertices)
+        if count > self._capacity:
+            self._capacity = count
+            self._buffer = self._ctx.buffer(reserve=count * self.FLOATS_PER_VERTEX * 4)
+            self._geometry = self._ctx.geometry(
+                [BufferDescription(self._buffer, '2f 3f', ['in_vert', 'in_color'])],
+                mode=self._ctx.TRIANGLES
+            )
+        self._buffer.write(vertices.tobytes())
+        self._count = count
+
+    def draw(self):
+        if self._count:
+            self._geometry.render(self._program, vertices=self._count)
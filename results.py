@@ -1,7 +1,8 @@
 import arcade
-import random
 from arcade.gui import UIManager, UILabel, UIAnchorLayout, UIBoxLayout, UIFlatButton
 
+from backgrounds import PatternBackground, maze_pattern
+
 
 class ResultsView(arcade.View):
     """Экран результатов после прохождения 3D лабиринта"""
@@ -12,6 +13,9 @@ class ResultsView(arcade.View):
         self.game_stats = game_stats or {}
         self.ui_manager = UIManager()
 
+        # Мерцающая схема лабиринта: несколько заранее сгенерированных кадров
+        self.background = PatternBackground(maze_pattern(cell_size=30, density=0.2), frames=6, fps=12)
+
     def on_show_view(self):
         """Вызывается при показе результатов"""
         self.ui_manager.enable()
@@ -161,24 +165,7 @@ class ResultsView(arcade.View):
 
     def draw_maze_background(self):
         """Нарисовать схему лабиринта на фоне"""
-        cell_size = 30
-        for x in range(0, self.window.width, cell_size):
-            for y in range(0, self.window.height, cell_size):
-                if random.random() < 0.2:
-                    color = (
-                        random.randint(30, 60),
-                        random.randint(20, 40),
-                        random.randint(40, 70)
-                    )
-                    left = x
-                    right = x + cell_size
-                    bottom = y
-                    top = y + cell_size
-
-                    arcade.draw_lrbt_rectangle_filled(
-                        left, right, bottom, top,
-                        color
-                    )
+        self.background.draw()
 
     def on_hide_view(self):
         """Вызывается при скрытии"""
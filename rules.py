@@ -1,4 +1,5 @@
 import arcade
+from text_cache import draw_text
 
 
 class RulesManager:
@@ -55,7 +56,7 @@ class RulesView(arcade.View):
         )
 
         # Заголовок
-        arcade.draw_text(
+        draw_text(
             "ПРАВИЛА ИГРЫ",
             self.parent_window.width // 2,
             self.parent_window.height - 100,
@@ -79,7 +80,7 @@ class RulesView(arcade.View):
             if i == 0 and "ПЕРЕД НАЧАЛОМ" in rule:
                 color = (255, 215, 0)  # Золотой цвет для важного сообщения
 
-            arcade.draw_text(
+            draw_text(
                 f"• {rule}",
                 self.parent_window.width // 2, y,
                 color, size,
@@ -87,7 +88,7 @@ class RulesView(arcade.View):
             )
 
         # Кнопка закрытия
-        arcade.draw_text(
+        draw_text(
             "Нажмите ESC для возврата",
             self.parent_window.width // 2, 100,
             (150, 255, 150), 22,
@@ -0,0 +1,151 @@
+import math
+from typing import Callable, Dict, List, Tuple
+
+import arcade
+
+from billboards import SpriteCanvas, size_bucket
+
+
+# Цвет метки скримера на карте по типу
+SCARE_COLORS: Dict[str, Tuple[int, int, int]] = {
+    'face1': (255, 50, 50),  # Красный
+    'face2': (255, 100, 0),  # Оранжевый
+    'face3': (200, 0, 100),  # Пурпурный
+    'face4': (100, 100, 255),  # Синий
+    'face5': (150, 0, 0),  # Темно-красный
+    'face6': (50, 50, 50),  # Темный
+    'face7': (200, 200, 255),  # Светло-синий
+    'face8': (100, 100, 100),  # Серый
+    'face9': (255, 200, 0),  # Желтый
+    'face10': (100, 255, 100),  # Зеленый
+}
+
+# Лица запекаются кадрами анимации: петля FACE_LOOP секунд с частотой FACE_FPS.
+# Все движения в рисунках - целое число периодов за петлю (частоты кратны
+# LOOP_RATE), поэтому последний кадр плавно переходит в первый.
+FACE_LOOP = 2.0
+FACE_FPS = 24
+FACE_FRAMES = int(FACE_LOOP * FACE_FPS)
+FACE_BUCKETS = (128, 256)
+LOOP_RATE = 2 * math.pi / FACE_LOOP
+
+
+def _face_normal(canvas: SpriteCanvas, t: float):
+    """Обычное лицо"""
+    color_pulse = (math.sin(t * LOOP_RATE * 2) + 1) / 2
+    canvas.circle(0, 0, 1, (int(200 + 55 * color_pulse), 50, 50, 255))
+
+    eye_size, eye_x, eye_y = 0.25, 0.3, 0.2
+    eye_alpha = int(255 * (0.7 + 0.3 * math.sin(t * LOOP_RATE * 3)))
+    for side in (-1, 1):
+        canvas.circle(side * eye_x, eye_y, eye_size, (255, 255, 255, eye_alpha))
+
+    pupil_move = math.sin(t * LOOP_RATE) * 0.1
+    for side in (-1, 1):
+        canvas.circle(side * eye_x, eye_y + pupil_move * eye_size, eye_size * 0.4, (0, 0, 0, 255))
+
+    mouth_open = (math.cos(t * LOOP_RATE) + 1) / 2
+    canvas.ellipse(0, -0.3, 0.6, 0.15 * mouth_open, (200, 0, 0, 255))
+
+
+def _face_crooked(canvas: SpriteCanvas, t: float):
+    """Кривое лицо"""
+    canvas.circle(0, 0, 1, (255, 100, 0, 255))
+
+    eye_move_x = math.sin(t * LOOP_RATE) * 0.1
+    eye_move_y = math.cos(t * LOOP_RATE) * 0.1
+    eyes = [(-0.25 + eye_move_x, 0.3 + eye_move_y), (0.35 - eye_move_x, 0.25 - eye_move_y)]
+    for x, y in eyes:
+        canvas.circle(x, y, 0.2, (255, 255, 255, 255))
+
+    if int(t * 3) % 2 == 0:
+        for x, y in eyes:
+            canvas.circle(x, y, 0.08, (0, 0, 0, 255))
+
+    mouth_pulse = (math.sin(t * LOOP_RATE * 2) + 1) / 2
+    canvas.arc(0, -0.2, 0.7, 0.4 * mouth_pulse, (200, 50, 0, 255), 0, 180)
+
+
+def _face_angry(canvas: SpriteCanvas, t: float):
+    """Злое лицо"""
+    pulse = (math.sin(t * LOOP_RATE * 2) + 1) / 2
+    canvas.circle(0, 0, 1, (int(150 + 50 * pulse), 0, 100, 255))
+
+    eye_alpha = int(255 * (0.5 + 0.5 * math.sin(t * LOOP_RATE)))
+    for side in (-1, 1):
+        canvas.triangle(
+            [(side * 0.4, 0.3), (side * 0.2, 0.1), (side * 0.6, 0.1)],
+            (255, 255, 255, eye_alpha)
+        )
+
+    # Толщина рта была 3 пикселя при размере лица около 100
+    mouth_pulse = (math.sin(t * LOOP_RATE * 3) + 1) / 2
+    if mouth_pulse > 0.05:
+        canvas.line(-0.3, -0.25, 0.3, -0.25, (100, 0, 50, 255), 0.03 * mouth_pulse)
+
+
+def _face_simple(canvas: SpriteCanvas, t: float):
+    """Упрощенное лицо для остальных типов"""
+    canvas.circle(0, 0, 1, (200, 100, 100, 255))
+    for side in (-1, 1):
+        canvas.circle(side * 0.3, 0.2, 0.15, (255, 255, 255, 255))
+
+    if int(t * 2) % 2 == 0:
+        for side in (-1, 1):
+            canvas.circle(side * 0.3, 0.2, 0.07, (0, 0, 0, 255))
+
+
+# Рисунок лица по типу скримера; типы без своего рисунка - упрощенное лицо
+FACE_PAINTERS: Dict[str, Callable[[SpriteCanvas, float], None]] = {
+    'face1': _face_normal,
+    'face2': _face_crooked,
+    'face3': _face_angry,
+}
+
+
+class ScareFaceCache:
+    """Кэш запеченных кадров лиц скримеров
+
+    Одинаковые рисунки разных типов делят текстуры. Кэш живет на уровне
+    модуля, поэтому при перезапуске уровня лица не перерисовываются.
+    """
+
+    def __init__(self):
+        self._frames: Dict[Tuple[Callable, int], List[arcade.Texture]] = {}
+
+    def frames(self, scare_type: str, diameter: float) -> List[arcade.Texture]:
+        """Кадры анимации лица для спрайта диаметром diameter пикселей"""
+        painter = FACE_PAINTERS.get(scare_type, _face_simple)
+        bucket = size_bucket(diameter, FACE_BUCKETS)
+        key = (painter, bucket)
+
+        frames = self._frames.get(key)
+        if frames is None:
+            frames = []
+            textures: Dict[bytes, arcade.Texture] = {}
+            for index in range(FACE_FRAMES):
+                canvas = SpriteCanvas(bucket, 1.0)
+                painter(canvas, index / FACE_FPS)
+                # Одинаковые кадры (моргание простого лица) делят одну текстуру
+                image = canvas.reduced()
+                pixels = image.tobytes()
+                texture = textures.get(pixels)
+                if texture is None:
+                    texture = canvas.texture(f"scare_{painter.__name__}_{index}", image)
+                    textures[pixels] = texture
+                frames.append(texture)
+            self._frames[key] = frames
+        return frames
+
+    def preload(self, scare_types, diameter: float):
+        """Запечь лица заранее, при загрузке уровня"""
+        for scare_type in set(scare_types):
+            self.frames(scare_type, diameter)
+
+    def texture(self, scare_type: str, diameter: float, time_value: float) -> arcade.Texture:
+        """Кадр анимации на момент time_value"""
+        frames = self.frames(scare_type, diameter)
+        return frames[int(time_value * FACE_FPS) % len(frames)]
+
+
+scare_face_cache = ScareFaceCache()
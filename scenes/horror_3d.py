@@ -7,18 +7,16 @@ from collections import deque
 from dataclasses import dataclass, field
 import numpy as np
 
-
-@dataclass
-class Particle:
-    """Частица для эффектов"""
-    x: float
-    y: float
-    vx: float
-    vy: float
-    life: float
-    color: tuple
-    size: float
-    alpha: int = 255
+from config import MAZE_SEED_POOL
+from maze_helper import ChunkedMazeGrid, ExplorationBitset, LightMap, maze_cache
+from particles import EffectPool, ParticleEmitter
+from text_cache import draw_text
+from hud_layer import HudLayer
+from minimap import MinimapLayer
+from billboards import BillboardBatch
+from postprocess import PostProcess, rgba
+from raycaster import WALL_SIDE, WallBatch, cast_rays, flashlight_beam, light_colors
+from spatial_audio import MIN_AUDIBLE, SpatialAudio
 
 
 @dataclass
@@ -115,292 +113,6 @@ class BehaviorData:
         return min(1.0, avg_inactivity / 5.0)
 
 
-class MazeGenerator:
-    """Генератор сложных лабиринтов с улучшенным алгоритмом"""
-
-    @staticmethod
-    def generate_perfect_maze(width: int, height: int) -> List[List[int]]:
-        """Генерация совершенного лабиринта (1-стены, 0-проходы)"""
-        # Убедимся, что размеры нечетные для правильного лабиринта
-        if width % 2 == 0:
-            width += 1
-        if height % 2 == 0:
-            height += 1
-
-        # Инициализируем полностью заполненный лабиринт
-        maze = [[1 for _ in range(width)] for _ in range(height)]
-
-        # Начальная точка - центр лабиринта
-        start_x, start_y = width // 2, height // 2
-        if start_x % 2 == 0:
-            start_x -= 1
-        if start_y % 2 == 0:
-            start_y -= 1
-
-        maze[start_y][start_x] = 0
-
-        # Стек для алгоритма
-        stack = [(start_x, start_y)]
-        visited = set()
-        visited.add((start_x, start_y))
-
-        # Все возможные направления (шаг 2 клетки)
-        directions = [(0, -2), (2, 0), (0, 2), (-2, 0)]
-
-        while stack:
-            x, y = stack[-1]
-
-            # Получаем непосещенных соседей
-            neighbors = []
-            for dx, dy in directions:
-                nx, ny = x + dx, y + dy
-
-                # Проверяем границы
-                if 0 <= nx < width and 0 <= ny < height:
-                    # Проверяем, что это потенциальная проходимая клетка
-                    if maze[ny][nx] == 1 and (nx, ny) not in visited:
-                        # Проверяем, что вокруг есть стены
-                        wall_count = 0
-                        for wx, wy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                            cx, cy = nx + wx, ny + wy
-                            if 0 <= cx < width and 0 <= cy < height and maze[cy][cx] == 1:
-                                wall_count += 1
-                        if wall_count >= 3:  # Должно быть окружено стенами
-                            neighbors.append((nx, ny, dx, dy))
-
-            if neighbors:
-                # Выбираем случайного соседа
-                nx, ny, dx, dy = random.choice(neighbors)
-
-                # Убираем стену между текущей клеткой и соседом
-                maze[y + dy // 2][x + dx // 2] = 0
-                maze[ny][nx] = 0
-
-                # Добавляем в посещенные и стек
-                visited.add((nx, ny))
-                stack.append((nx, ny))
-            else:
-                # Возвращаемся назад
-                stack.pop()
-
-        MazeGenerator._ensure_perfect_connectivity(maze, width, height)
-
-        # Создаем несколько дополнительных проходов для лучшей проходимости
-        MazeGenerator._add_extra_passages(maze, width, height)
-
-        # Гарантируем, что все мертвые зоны соединены
-        MazeGenerator._connect_dead_ends(maze, width, height)
-
-        return maze
-
-    @staticmethod
-    def _ensure_perfect_connectivity(maze: List[List[int]], width: int, height: int):
-        """Гарантировать, что лабиринт полностью проходим"""
-        # Находим все проходимые клетки
-        passages = []
-        for y in range(height):
-            for x in range(width):
-                if maze[y][x] == 0:
-                    passages.append((x, y))
-
-        if not passages:
-            return
-
-        # Проверяем связность через поиск в ширину
-        start = passages[0]
-        visited = set()
-        queue = deque([start])
-
-        while queue:
-            x, y = queue.popleft()
-            if (x, y) in visited:
-                continue
-
-            visited.add((x, y))
-
-            # Проверяем всех соседей
-            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                nx, ny = x + dx, y + dy
-                if (0 <= nx < width and 0 <= ny < height and
-                        maze[ny][nx] == 0 and (nx, ny) not in visited):
-                    queue.append((nx, ny))
-
-        # Если есть непосещенные проходы, соединяем их
-        unvisited = [p for p in passages if p not in visited]
-        if unvisited:
-            for ux, uy in unvisited:
-                # Ищем ближайший посещенный проход
-                min_dist = float('inf')
-                nearest = None
-                for vx, vy in visited:
-                    dist = abs(ux - vx) + abs(uy - vy)
-                    if dist < min_dist:
-                        min_dist = dist
-                        nearest = (vx, vy)
-
-                if nearest:
-                    vx, vy = nearest
-                    # Прокладываем путь
-                    cx, cy = ux, uy
-                    while (cx, cy) != (vx, vy):
-                        if random.random() < 0.5 and cx != vx:
-                            cx += 1 if cx < vx else -1
-                        else:
-                            cy += 1 if cy < vy else -1
-
-                        if 0 <= cx < width and 0 <= cy < height:
-                            maze[cy][cx] = 0
-                            visited.add((cx, cy))
-
-        # Убедимся, что нет изолированных областей
-        MazeGenerator._check_and_fix_islands(maze, width, height)
-
-    @staticmethod
-    def _check_and_fix_islands(maze: List[List[int]], width: int, height: int):
-        """Проверить и исправить изолированные области"""
-        visited_all = set()
-        islands = []
-
-        for y in range(height):
-            for x in range(width):
-                if maze[y][x] == 0 and (x, y) not in visited_all:
-                    # Новая область
-                    island = []
-                    queue = deque([(x, y)])
-                    visited_island = set()
-
-                    while queue:
-                        cx, cy = queue.popleft()
-                        if (cx, cy) in visited_island:
-                            continue
-
-                        visited_island.add((cx, cy))
-                        island.append((cx, cy))
-
-                        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                            nx, ny = cx + dx, cy + dy
-                            if (0 <= nx < width and 0 <= ny < height and
-                                    maze[ny][nx] == 0 and (nx, ny) not in visited_island):
-                                queue.append((nx, ny))
-
-                    islands.append(island)
-                    visited_all.update(visited_island)
-
-        # Если больше одного острова, соединяем их
-        if len(islands) > 1:
-            for i in range(1, len(islands)):
-                # Соединяем текущий остров с предыдущим
-                island1 = islands[i - 1]
-                island2 = islands[i]
-
-                # Находим ближайшие точки
-                min_dist = float('inf')
-                point1 = None
-                point2 = None
-
-                for x1, y1 in island1:
-                    for x2, y2 in island2:
-                        dist = abs(x1 - x2) + abs(y1 - y2)
-                        if dist < min_dist:
-                            min_dist = dist
-                            point1 = (x1, y1)
-                            point2 = (x2, y2)
-
-                if point1 and point2:
-                    x1, y1 = point1
-                    x2, y2 = point2
-
-                    # Прокладываем путь
-                    cx, cy = x1, y1
-                    while (cx, cy) != (x2, y2):
-                        if random.random() < 0.5 and cx != x2:
-                            cx += 1 if cx < x2 else -1
-                        else:
-                            cy += 1 if cy < y2 else -1
-
-                        if 0 <= cx < width and 0 <= cy < height:
-                            maze[cy][cx] = 0
-
-                            # Также убираем стены вокруг для плавности
-                            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                                nx, ny = cx + dx, cy + dy
-                                if 0 <= nx < width and 0 <= ny < height and random.random() < 0.3:
-                                    maze[ny][nx] = 0
-
-    @staticmethod
-    def _add_extra_passages(maze: List[List[int]], width: int, height: int):
-        """Добавить дополнительные проходы для лучшей проходимости"""
-        # Добавляем случайные проходы
-        extra_passages = (width * height) // 30  # Примерно 3% клеток
-
-        for _ in range(extra_passages):
-            x = random.randint(1, width - 2)
-            y = random.randint(1, height - 2)
-
-            # Проверяем, что это стена
-            if maze[y][x] == 1:
-                # Считаем соседние стены
-                wall_count = 0
-                passable_count = 0
-
-                for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                    nx, ny = x + dx, y + dy
-                    if 0 <= nx < width and 0 <= ny < height:
-                        if maze[ny][nx] == 1:
-                            wall_count += 1
-                        else:
-                            passable_count += 1
-
-                # Если стена окружена проходами, делаем проход
-                if passable_count >= 2 and wall_count <= 2:
-                    maze[y][x] = 0
-
-                    # С небольшим шансом делаем дополнительные проходы вокруг
-                    if random.random() < 0.2:
-                        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                            nx, ny = x + dx, y + dy
-                            if (0 <= nx < width and 0 <= ny < height and
-                                    maze[ny][nx] == 1 and random.random() < 0.5):
-                                maze[ny][nx] = 0
-
-    @staticmethod
-    def _connect_dead_ends(maze: List[List[int]], width: int, height: int):
-        """Соединить тупики для лучшей проходимости"""
-        dead_ends = []
-
-        for y in range(1, height - 1):
-            for x in range(1, width - 1):
-                if maze[y][x] == 0:
-                    # Считаем соседние проходы
-                    passable_neighbors = 0
-                    for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                        nx, ny = x + dx, y + dy
-                        if 0 <= nx < width and 0 <= ny < height and maze[ny][nx] == 0:
-                            passable_neighbors += 1
-
-                    # Если это тупик (только 1 проход)
-                    if passable_neighbors == 1:
-                        dead_ends.append((x, y))
-
-        # Соединяем некоторые тупики
-        for x, y in dead_ends:
-            if random.random() < 0.3:  # 30% шанс соединения
-                # Ищем направление для нового прохода
-                directions = []
-                for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                    nx, ny = x + dx, y + dy
-                    if 0 <= nx < width and 0 <= ny < height and maze[ny][nx] == 1:
-                        # Проверяем, что за стеной есть проход
-                        nx2, ny2 = x + dx * 2, y + dy * 2
-                        if (0 <= nx2 < width and 0 <= ny2 < height and
-                                maze[ny2][nx2] == 0):
-                            directions.append((dx, dy))
-
-                if directions:
-                    dx, dy = random.choice(directions)
-                    maze[y + dy][x + dx] = 0
-
-
 class FearAnalyzer:
     """Анализатор страхов игрока"""
 
@@ -467,8 +179,9 @@ class FearAnalyzer:
 class Horror3DGame(arcade.View):
     """3D хоррор-лабиринт"""
 
-    def __init__(self, fear_profile=None):
+    def __init__(self, fear_profile=None, endless=False):
         super().__init__()
+        self.endless = endless
 
         # Переменные для звуков
         self.sound_manager = None
@@ -477,7 +190,6 @@ class Horror3DGame(arcade.View):
         self.step_interval = 0.5
         self.last_ambient_sound = 0
         self.ambient_interval = random.randint(5, 10)
-        self.heartbeat_timer = 0
         self.heartbeat_active = False
         self.monster_sound_timer = 0
         self.step_counter = 0
@@ -485,6 +197,9 @@ class Horror3DGame(arcade.View):
         self.is_moving = False
         self.music_playing = False
         self.current_music = None
+        self.music_player = None
+        self.music_manager = None
+        self.spatial_audio = SpatialAudio()
         self.music_volume = 0.4  # Общая громкость музыки
         self.sfx_volume = 1.0  # Громкость звуковых эффектов
         self.jumpscare_volume = 1.5  # Увеличенная громкость для скримеров
@@ -509,9 +224,24 @@ class Horror3DGame(arcade.View):
         self.map_height = 31
         self.tile_size = 64
 
-        # Генерация лабиринта
-        self.map = MazeGenerator.generate_perfect_maze(self.map_width, self.map_height)
+        # Генерация лабиринта: идеальный лабиринт + петли для проходимости.
+        # В бесконечном режиме лабиринт строится кусками по мере движения игрока.
+        # Освещение (окклюзия и лампы) запекается один раз и хранится вместе с лабиринтом.
+        self.maze_algorithm = 'eller' if self.endless else 'backtracker'
+        if self.endless:
+            self.maze_seed = maze_cache.random_seed()
+            self.map = ChunkedMazeGrid(self.map_width, seed=self.maze_seed)
+            self.light_map = LightMap(self.map.width, seed=self.maze_seed)
+            self.light_map.bake(self.map, 0, self.map.height)
+        else:
+            self.maze_seed = maze_cache.random_seed(MAZE_SEED_POOL)
+            self.map = maze_cache.get(self.map_width, self.map_height, self.maze_algorithm,
+                                      seed=self.maze_seed, braid=True)
+            self.light_map = maze_cache.light_map(self.map_width, self.map_height, self.maze_algorithm,
+                                                  seed=self.maze_seed, braid=True)
+        self.map_height = len(self.map)
         self.maze = self.map
+        self.endless_depth = 0
 
         # Находим открытую центральную зону для старта
         self.player_x, self.player_y = self._find_start_position()
@@ -531,16 +261,19 @@ class Horror3DGame(arcade.View):
         self.time_since_last_analysis = 0.0
         self.start_time = time.time()
 
-        # Коллизии
-        self.collision_map = self._create_collision_map()
-        self.walls = self._create_walls_list()
-        self.exit_location = self._find_far_position(self.player_x, self.player_y)
+        # Выход (в бесконечном режиме выхода нет)
+        self.exit_location = None if self.endless else self._find_far_position(self.player_x, self.player_y)
 
         # ИНТЕРФЕЙС
         self.show_minimap = False
         self.last_minimap_toggle = 0
         self.minimap_cooldown = 0.3
         self.minimap_scale = 0.8
+        self.exploration = ExplorationBitset(self.map_width, self.map_height)
+        self.minimap_layer = MinimapLayer(self.exploration, fog=False)
+        self.billboards = BillboardBatch()
+        self.postprocess = PostProcess()
+        self.wall_batch = WallBatch()
         self.show_instructions = False
         self.show_i_hint = True  # Флаг для показа подсказки про клавишу I
         self.i_hint_timer = 5.0  # 5 секунд показываем подсказку
@@ -557,6 +290,7 @@ class Horror3DGame(arcade.View):
         self.flashlight_on = True
         self.flashlight_battery = 200.0
         self.flashlight_flicker = 0.0
+        self.flashlight_angle = 0.0  # Луч фонарика догоняет взгляд с небольшой задержкой
         self.ambient_light = 1.0
         self.light_level = 1.0
 
@@ -596,8 +330,8 @@ class Horror3DGame(arcade.View):
         self.whisper_effects = []  # Эффекты шепотов
 
         # ЧАСТИЦЫ
-        self.particles: List[Particle] = []
-        self.blood_particles: List[Particle] = []
+        self.particles = ParticleEmitter(spawn_budget=2048)
+        self.blood_particles = ParticleEmitter(fade=False, spawn_budget=2048)
 
         # МОНСТРЫ
         self.monsters: List[Monster] = []
@@ -646,61 +380,81 @@ class Horror3DGame(arcade.View):
 
         # Инициализируем визуальные эффекты
         self._init_visual_effects()
+        self._init_hud_layer()
 
     def _init_visual_effects(self):
         """Инициализировать визуальные эффекты"""
-        # Создаем теневы фигуры для галлюцинаций
-        self.shadow_figures = []
-        for _ in range(3):
-            self.shadow_figures.append({
-                'x': random.uniform(0, self.window.width),
-                'y': random.uniform(0, self.window.height),
-                'life': 0,
-                'max_life': random.uniform(1.0, 3.0),
-                'size': random.uniform(30, 60),
-                'speed': random.uniform(10, 30)
-            })
-
-        # Создаем кровавые прожилки
-        self.blood_veins = []
-        for _ in range(10):
-            self.blood_veins.append({
-                'x1': random.uniform(0, self.window.width),
-                'y1': random.uniform(0, self.window.height),
-                'x2': random.uniform(0, self.window.width),
-                'y2': random.uniform(0, self.window.height),
-                'thickness': random.uniform(1, 3),
-                'alpha': 0,
-                'pulse': random.random() * math.pi * 2
-            })
+        # Создаем теневы фигуры для галлюцинаций (пул, не больше одной новой за кадр)
+        self.shadow_figures = EffectPool(3, lambda: {
+            'x': random.uniform(0, self.window.width),
+            'y': random.uniform(0, self.window.height),
+            'life': 0,
+            'max_life': random.uniform(1.0, 3.0),
+            'size': random.uniform(30, 60),
+            'speed': random.uniform(10, 30)
+        })
+
+        # Создаем кровавые прожилки (пул: при сильном стрессе появляются по одной и гаснут)
+        self.blood_veins = EffectPool(10, lambda: {
+            'x1': 0, 'y1': 0, 'x2': 0, 'y2': 0,
+            'thickness': random.uniform(1, 3),
+            'alpha': 0,
+            'pulse': 0,
+            'life': 0,
+            'max_life': random.uniform(3.0, 6.0)
+        })
 
         # Создаем эффекты шепотов
-        self.whisper_effects = []
-        for _ in range(5):
-            self.whisper_effects.append({
-                'x': random.uniform(0, self.window.width),
-                'y': random.uniform(0, self.window.height),
-                'text': random.choice(["...", "смотри...", "иди...", "нельзя...", "там..."]),
-                'alpha': 0,
-                'life': 0,
-                'max_life': random.uniform(2.0, 4.0)
-            })
+        self.whisper_effects = EffectPool(5, lambda: {
+            'x': random.uniform(0, self.window.width),
+            'y': random.uniform(0, self.window.height),
+            'text': random.choice(["...", "смотри...", "иди...", "нельзя...", "там..."]),
+            'alpha': 0,
+            'life': 0,
+            'max_life': random.uniform(2.0, 4.0)
+        })
 
     # ЗВУКОВАЯ СИСТЕМА
 
     def init_sound_manager(self):
         """Инициализировать звуки"""
         try:
+            from music_manager import MusicManager
             from sound_manager import SoundManager
             self.sound_manager = SoundManager(sound_mode="level2")
             self.sound_manager.set_volume(1.0)
-            self.start_background_music()
+            self.sound_manager.preload_async()
+            self.music_manager = MusicManager()
+            self.music_manager.set_volume(self.music_volume)
         except Exception:
             self.sound_manager = None
+            self.music_manager = None
+
+    def on_show_view(self):
+        """Сцена на экране - держим ссылки на звуки и запускаем музыку"""
+        if self.sound_manager:
+            self.sound_manager.acquire()
+            self.start_background_music()
+
+    def on_hide_view(self):
+        """Сцена ушла с экрана - звуки остаются в общем реестре, потоки музыки закрываются"""
+        if self.sound_manager:
+            self.sound_manager.release()
+        if self.music_manager:
+            self.music_manager.close()
+            self.music_playing = False
 
     def start_background_music(self):
         """Запустить фоновую музыку"""
-        if not self.sound_manager:
+        # Отложенный запуск (после скримера) не должен открывать потоки ушедшей сцены
+        if not self.sound_manager or self.window.current_view is not self:
+            return
+
+        # Музыка из custom_sounds/music - адаптивная, с кроссфейдами по стрессу
+        if self.music_manager and self.music_manager.playlist:
+            if not self.music_playing:
+                self.music_manager.play_tension_music(self.player_stress)
+                self.music_playing = True
             return
 
         if not self.music_playing and self.sound_manager.sounds.get('music'):
@@ -708,48 +462,45 @@ class Horror3DGame(arcade.View):
             music_list = self.sound_manager.sounds.get('music', [])
             if music_list:
                 music_data = random.choice(music_list)
-                self.current_music = music_data['sound']
+                if music_data['handle'].pending:
+                    # Музыка еще декодируется в фоне - попробуем позже
+                    arcade.schedule_once(lambda dt: self.start_background_music(), 0.5)
+                    return
+                self.current_music = music_data['handle'].sound
+                if not self.current_music:
+                    return
                 # Запускаем музыку с циклом
-                self.current_music.play(volume=self.music_volume, loop=True)
+                self.music_player = self.current_music.play(volume=self.music_volume, loop=True)
                 self.music_playing = True
 
-    def stop_background_music(self):
+    def stop_background_music(self, fade: float = 0.0):
         """Остановить фоновую музыку"""
-        if self.music_playing and self.current_music:
-            self.current_music.stop()
+        if self.music_manager and self.music_manager.playlist:
+            self.music_manager.stop_music(fade=fade)
+            self.music_playing = False
+        elif self.music_playing and self.current_music:
+            self.current_music.stop(self.music_player)
             self.music_playing = False
 
     def play_jumpscare_3d(self):
         """Скример"""
         if self.sound_manager:
             # Останавливаем музыку на время скримера
-            if self.music_playing and self.current_music:
-                self.current_music.stop()
-                self.music_playing = False
-
-            # Ищем звук в папке jumpscare
-            jumpscare_sounds = []
-            for category, sounds in self.sound_manager.sounds.items():
-                for sound_data in sounds:
-                    if 'jumpscare' in sound_data.get('name', '').lower() or 'scare' in sound_data.get('name',
-                                                                                                      '').lower():
-                        jumpscare_sounds.append(sound_data)
-
-            # Если нет специальных звуков скримеров, используем обычные scream
-            if not jumpscare_sounds:
-                jumpscare_sounds = self.sound_manager.sounds.get('scream', [])
-
-            if jumpscare_sounds:
-                sound_data = random.choice(jumpscare_sounds)
+            if self.music_playing:
+                self.stop_background_music()
+
+            # Звук из папки jumpscare, если ее нет - обычный scream
+            sound_data = self.sound_manager.choose('jumpscare')
+            if sound_data:
                 # ОЧЕНЬ ГРОМКИЙ звук
-                sound_data['sound'].play(volume=self.jumpscare_volume * 1.5)
+                self.sound_manager.play_sound_data(sound_data, volume=self.jumpscare_volume * 1.5)
 
                 # Добавляем резкие звуки с задержкой
-                arcade.schedule(lambda dt: self.play_sudden_sound(volume=0.7), 0.2)
-                arcade.schedule(lambda dt: self.play_sudden_sound(volume=0.5), 0.5)
+                arcade.schedule_once(lambda dt: self.play_sudden_sound(volume=0.7), 0.2)
+                arcade.schedule_once(lambda dt: self.play_sudden_sound(volume=0.5), 0.5)
 
                 # Перезапускаем музыку через 2 секунды
-                arcade.schedule(lambda dt: self.start_background_music(), 2.0)
+                arcade.schedule_once(lambda dt: self.start_background_music(), 2.0)
 
                 self.camera_shake = 1.0
                 self.flash_effect = 1.0
@@ -760,21 +511,18 @@ class Horror3DGame(arcade.View):
     def play_sudden_sound(self, volume=0.5):
         """Воспроизвести резкий звук"""
         if self.sound_manager:
-            try:
-                # Выбираем случайный резкий звук
-                sound_types = ['sudden', 'impact', 'glass', 'metal', 'break', 'clang']
-                for sound_type in sound_types:
-                    if self.sound_manager.sounds.get(sound_type):
-                        self.sound_manager.play_sound(sound_type, volume=volume * self.sfx_volume)
-                        break
-            except:
-                pass
+            # Случайный резкий звук (цепочка поиска - в SOUND_FALLBACKS)
+            self.sound_manager.play_sound('sudden', volume=volume * self.sfx_volume)
 
     def update_sounds(self, delta_time):
         """Обновление звуков с новой логикой"""
         if not self.sound_manager:
             return
 
+        # После остановки с затуханием музыку ведем, пока все треки не затихнут
+        if self.music_manager and (self.music_playing or self.music_manager.audible):
+            self.music_manager.update(delta_time, self.player_stress)
+
         current_time = time.time()
         self.sound_timer += delta_time
         self.sudden_sound_timer += delta_time
@@ -787,9 +535,13 @@ class Horror3DGame(arcade.View):
                 self.last_step_sound = current_time
                 self.step_counter += 1
 
-        # Тихие звуки
+        # Фон - непрерывная подложка, при приближении монстра приглушается
+        ambience_volume = 0.12 * (1.0 - min(1.0, self.near_monster_effect) * 0.5)
+        self.sound_manager.update_bed('ambience', ambience_volume * self.sfx_volume, 1.0, delta_time)
+
+        # Редкие капли поверх фона
         if current_time - self.last_ambient_sound > self.ambient_interval:
-            sound_type = random.choice(['ambient', 'drip', 'wind'])
+            sound_type = 'drip'
             volume = 0.1 + random.random() * 0.1  # Очень тихо
             self.sound_manager.play_sound(sound_type, volume=volume * self.sfx_volume)
             self.last_ambient_sound = current_time
@@ -801,43 +553,43 @@ class Horror3DGame(arcade.View):
             self.sound_manager.play_sound('whisper', volume=volume * self.sfx_volume)
 
             # Активируем эффект шепота
-            for effect in self.whisper_effects:
-                if effect['life'] <= 0:
-                    effect['x'] = random.uniform(0, self.window.width)
-                    effect['y'] = random.uniform(0, self.window.height)
-                    effect['text'] = random.choice(["...", "смотри...", "иди...", "нельзя...", "там...", "за тобой..."])
-                    effect['alpha'] = 255
-                    effect['life'] = effect['max_life']
-                    break
+            self.whisper_effects.spawn(
+                x=random.uniform(0, self.window.width),
+                y=random.uniform(0, self.window.height),
+                text=random.choice(["...", "смотри...", "иди...", "нельзя...", "там...", "за тобой..."]),
+                alpha=255
+            )
 
-        # СЕРДЦЕБИЕНИЕ
+        # СЕРДЦЕБИЕНИЕ - зацикленная подложка, темп и громкость растут со стрессом
         if self.player_stress > 60 or self.near_monster_effect > 0.5:
-            self.heartbeat_timer += delta_time
             heartbeat_interval = max(0.1, 1.0 - max(self.player_stress - 60, self.near_monster_effect * 50) / 100)
-
-            if self.heartbeat_timer > heartbeat_interval:
-                volume = 0.3 + max((self.player_stress - 60) / 200, self.near_monster_effect * 0.5)
-                self.sound_manager.play_sound('heartbeat', volume=volume * self.sfx_volume)
-                self.heartbeat_timer = 0
-                self.heartbeat_active = True
+            volume = 0.3 + max((self.player_stress - 60) / 200, self.near_monster_effect * 0.5)
+            rate = min(2.0, 1.0 / max(0.5, heartbeat_interval))
+            self.sound_manager.update_bed('heartbeat', volume * self.sfx_volume, rate, delta_time)
+            self.heartbeat_active = True
         else:
+            self.sound_manager.update_bed('heartbeat', 0.0, 1.0, delta_time)
             self.heartbeat_active = False
 
-        # ЗВУКИ МОНСТРОВ - ТОЛЬКО КОГДА БЛИЗКО
+        # Дыхание монстра - слышно, пока он рядом
+        breathing_volume = 0.5 * min(1.0, self.near_monster_effect)
+        self.sound_manager.update_bed('breathing', breathing_volume * self.sfx_volume,
+                                      1.0 + 0.3 * min(1.0, self.near_monster_effect), delta_time)
+
+        # ЗВУКИ МОНСТРОВ - громкость по пути через лабиринт, панорама по направлению
+        active_monsters = [monster for monster in self.monsters if monster.active]
+        self.spatial_audio.update(delta_time, self.map, self.player_x, self.player_y,
+                                  self.player_angle, active_monsters)
         self.monster_sound_timer += delta_time
         if self.monster_sound_timer > 3.0:  # Реже
-            for monster in self.monsters:
-                if monster.active:
-                    dx = monster.x - self.player_x
-                    dy = monster.y - self.player_y
-                    distance = math.sqrt(dx * dx + dy * dy)
-
-                    # Только если очень близко
-                    if distance < 100:
-                        if random.random() < 0.4:
-                            volume = 0.6 * (1.0 - distance / 200)
-                            self.sound_manager.play_sound('monster', volume=volume * self.sfx_volume)
-                            self.monster_near_counter += 1
+            for monster in active_monsters:
+                # Только если монстра слышно
+                if self.spatial_audio.gain(monster) > MIN_AUDIBLE and random.random() < 0.4:
+                    volume = 0.6 * self.sfx_volume
+                    player = self.sound_manager.play_voice('monster', volume=volume)
+                    if player:
+                        self.spatial_audio.attach(monster, player, volume * self.sound_manager.sound_volume)
+                    self.monster_near_counter += 1
 
             self.monster_sound_timer = 0
 
@@ -878,34 +630,42 @@ class Horror3DGame(arcade.View):
 
         if self.hallucination_active:
             # Активируем теневые фигуры
-            for figure in self.shadow_figures:
-                if figure['life'] <= 0 and random.random() < 0.1:
-                    figure['life'] = figure['max_life']
-                    figure['x'] = random.uniform(0, self.window.width)
-                    figure['y'] = random.uniform(0, self.window.height)
+            if random.random() < 0.1:
+                self.shadow_figures.spawn(
+                    x=random.uniform(0, self.window.width),
+                    y=random.uniform(0, self.window.height)
+                )
 
             # Обновляем жизнь фигур
-            for figure in self.shadow_figures:
-                if figure['life'] > 0:
-                    figure['life'] -= delta_time
-                    # Двигаем фигуры
-                    figure['x'] += random.uniform(-1, 1) * figure['speed'] * delta_time
-                    figure['y'] += random.uniform(-1, 1) * figure['speed'] * delta_time
+            for figure in self.shadow_figures.active():
+                figure['life'] -= delta_time
+                # Двигаем фигуры
+                figure['x'] += random.uniform(-1, 1) * figure['speed'] * delta_time
+                figure['y'] += random.uniform(-1, 1) * figure['speed'] * delta_time
 
         # Кровавые прожилки при стрессе
-        if self.player_stress > 70:
-            for vein in self.blood_veins:
-                vein['pulse'] += delta_time * 2
-                vein['alpha'] = int((math.sin(vein['pulse']) + 1) / 2 * 100 * (self.player_stress - 70) / 30)
+        stress_factor = max(0, self.player_stress - 70) / 30
+        if stress_factor > 0:
+            self.blood_veins.spawn(
+                x1=random.uniform(0, self.window.width),
+                y1=random.uniform(0, self.window.height),
+                x2=random.uniform(0, self.window.width),
+                y2=random.uniform(0, self.window.height),
+                pulse=random.random() * math.pi * 2
+            )
+        for vein in self.blood_veins.active():
+            vein['life'] -= delta_time
+            vein['pulse'] += delta_time * 2
+            fade = min(1.0, max(0.0, vein['life']))
+            vein['alpha'] = int((math.sin(vein['pulse']) + 1) / 2 * 100 * stress_factor * fade)
 
         # Эффекты шепотов
-        for effect in self.whisper_effects:
-            if effect['life'] > 0:
-                effect['life'] -= delta_time
-                effect['alpha'] = int((effect['life'] / effect['max_life']) * 255)
-                # Двигаем текст
-                effect['x'] += random.uniform(-10, 10) * delta_time
-                effect['y'] += random.uniform(-10, 10) * delta_time
+        for effect in self.whisper_effects.active():
+            effect['life'] -= delta_time
+            effect['alpha'] = max(0, int((effect['life'] / effect['max_life']) * 255))
+            # Двигаем текст
+            effect['x'] += random.uniform(-10, 10) * delta_time
+            effect['y'] += random.uniform(-10, 10) * delta_time
 
     def update_darkness(self, delta_time):
         """Постепенное увеличение темноты"""
@@ -1105,6 +865,10 @@ class Horror3DGame(arcade.View):
         # Обновление игрока
         self._update_player(delta_time)
 
+        # Достраиваем бесконечный лабиринт вокруг игрока
+        if self.endless:
+            self._update_endless_maze()
+
         # Обновление фонарика
         self._update_flashlight(delta_time)
 
@@ -1300,6 +1064,10 @@ class Horror3DGame(arcade.View):
             if self.flashlight_battery < 200:  # Соответственно увеличенному максимуму
                 self.flashlight_battery = min(200, self.flashlight_battery + delta_time * 0.15)  # БЫСТРЕЕ ЗАРЯДКА
 
+        # Луч фонарика плавно догоняет направление взгляда
+        turn = (self.player_angle - self.flashlight_angle + math.pi) % (2 * math.pi) - math.pi
+        self.flashlight_angle += turn * min(1.0, delta_time * 12)
+
         # Учет мерцания
         if self.flashlight_on and self.flashlight_battery > 20:
             base_level = self.flashlight_flicker
@@ -1452,16 +1220,11 @@ class Horror3DGame(arcade.View):
         self.blood_overlay = 0.9
         self.visual_distortion = 0.5
 
-        for _ in range(15):
-            self.blood_particles.append(Particle(
-                x=self.window.width // 2 + random.randint(-50, 50),
-                y=self.window.height // 2 + random.randint(-50, 50),
-                vx=random.uniform(-10, 10),
-                vy=random.uniform(-10, 10),
-                life=random.uniform(0.8, 1.5),
-                color=(200, 20, 20),
-                size=random.uniform(4, 8)
-            ))
+        self.blood_particles.emit(
+            self.window.width // 2, self.window.height // 2, 15,
+            vx=(-10, 10), vy=(-10, 10), life=(0.8, 1.5), size=(4, 8),
+            color=(200, 20, 20), alpha=180, jitter=50
+        )
 
         self.play_jumpscare_3d()  # ГРОМКИЙ скример при атаке
 
@@ -1475,24 +1238,15 @@ class Horror3DGame(arcade.View):
 
     def _update_particles(self, delta_time: float):
         """Обновить частицы"""
-        for particle in self.particles[:]:
-            particle.x += particle.vx * delta_time * 60
-            particle.y += particle.vy * delta_time * 60
-            particle.life -= delta_time
-            new_alpha = int(particle.alpha * (particle.life / 1.0))
-            particle.alpha = max(0, new_alpha)
-            if particle.life <= 0:
-                self.particles.remove(particle)
-
-        for particle in self.blood_particles[:]:
-            particle.x += particle.vx * delta_time * 60
-            particle.y += particle.vy * delta_time * 60
-            particle.life -= delta_time
-            if particle.life <= 0:
-                self.blood_particles.remove(particle)
+        self.particles.update(delta_time)
+        self.blood_particles.update(delta_time)
 
     def _update_effects(self, delta_time: float):
         """Обновить эффекты"""
+        self.shadow_figures.begin_frame()
+        self.whisper_effects.begin_frame()
+        self.blood_veins.begin_frame()
+
         if self.screen_shake > 0:
             self.screen_shake = max(0, self.screen_shake - delta_time * 2)
 
@@ -1562,17 +1316,11 @@ class Horror3DGame(arcade.View):
                 if obj.type == 'key':
                     self.keys_collected += 1
 
-                    for _ in range(20):
-                        self.particles.append(Particle(
-                            x=self.window.width // 2,
-                            y=self.window.height // 2,
-                            vx=random.uniform(-4, 4),
-                            vy=random.uniform(-4, 4),
-                            life=random.uniform(1.5, 2.5),
-                            color=(255, 215, 0),
-                            size=random.uniform(4, 7),
-                            alpha=220
-                        ))
+                    self.particles.emit(
+                        self.window.width // 2, self.window.height // 2, 20,
+                        vx=(-4, 4), vy=(-4, 4), life=(1.5, 2.5), size=(4, 7),
+                        color=(255, 215, 0), alpha=220
+                    )
 
                     if self.sound_manager:
                         volume = 0.7 * self.fear_amplifiers['sounds']
@@ -1583,17 +1331,11 @@ class Horror3DGame(arcade.View):
                 elif obj.type == 'exit':
                     self.exit_found = True
 
-                    for _ in range(25):
-                        self.particles.append(Particle(
-                            x=self.window.width // 2,
-                            y=self.window.height // 2,
-                            vx=random.uniform(-5, 5),
-                            vy=random.uniform(-5, 5),
-                            life=random.uniform(2, 3),
-                            color=(255, 50, 50),
-                            size=random.uniform(5, 9),
-                            alpha=240
-                        ))
+                    self.particles.emit(
+                        self.window.width // 2, self.window.height // 2, 25,
+                        vx=(-5, 5), vy=(-5, 5), life=(2, 3), size=(5, 9),
+                        color=(255, 50, 50), alpha=240
+                    )
 
                     if self.sound_manager:
                         volume = 0.8 * self.fear_amplifiers['sounds']
@@ -1617,26 +1359,24 @@ class Horror3DGame(arcade.View):
             shake_x += math.sin(self.game_time * 20) * self.earthquake_intensity * 15
             shake_y += math.cos(self.game_time * 18) * self.earthquake_intensity * 15
 
-        # Искажение
-        distortion_x = 0
-        distortion_y = 0
-        if self.visual_distortion > 0:
-            distortion_x = math.sin(self.game_time * 20) * self.visual_distortion * 5
-            distortion_y = math.cos(self.game_time * 18) * self.visual_distortion * 5
-
-        total_offset_x = shake_x + distortion_x + self.camera_shake * random.uniform(-10, 10)
-        total_offset_y = shake_y + distortion_y + self.camera_shake * random.uniform(-10, 10)
+        total_offset_x = shake_x + self.camera_shake * random.uniform(-10, 10)
+        total_offset_y = shake_y + self.camera_shake * random.uniform(-10, 10)
 
-        # 3D вид с учетом всех эффектов
-        self._draw_3d_view(total_offset_x, total_offset_y)
+        # Сцена рисуется в offscreen-текстуру, экранные эффекты (заливка кровью,
+        # виньетка, искажение, вспышка) накладываются одним проходом шейдера
+        self._update_postprocess(total_offset_x, total_offset_y)
+        with self.postprocess.capture():
+            # 3D вид с учетом всех эффектов
+            self._draw_3d_view(total_offset_x, total_offset_y)
 
-        # Эффекты
-        self._draw_effects(total_offset_x, total_offset_y)
+            # Эффекты
+            self._draw_effects(total_offset_x, total_offset_y)
 
-        # Новые жуткие визуальные эффекты
-        self._draw_hallucinations(total_offset_x, total_offset_y)
-        self._draw_blood_veins(total_offset_x, total_offset_y)
-        self._draw_whisper_effects(total_offset_x, total_offset_y)
+            # Новые жуткие визуальные эффекты
+            self._draw_hallucinations(total_offset_x, total_offset_y)
+            self._draw_blood_veins(total_offset_x, total_offset_y)
+            self._draw_whisper_effects(total_offset_x, total_offset_y)
+        self.postprocess.draw()
 
         # Интерфейс
         self._draw_hud()
@@ -1657,10 +1397,6 @@ class Horror3DGame(arcade.View):
         if self.show_instructions:
             self._draw_instructions()
 
-        # Эффект паранойи
-        if self.paranoia_effect > 0 and random.random() < self.paranoia_effect * 0.1:
-            self._draw_paranoia_effect()
-
         # Предупреждение о времени
         if self.show_time_warning:
             self._draw_time_warning()
@@ -1688,17 +1424,19 @@ class Horror3DGame(arcade.View):
         )
 
         self._draw_walls_raycasting(offset_x, offset_y)
+
+        # Ключи, выход и монстры - спрайты одного списка, один вызов отрисовки
+        self.billboards.begin()
         self._draw_objects_in_3d(offset_x, offset_y)
         self._draw_monsters_3d(offset_x, offset_y)
-
-        if self.flashlight_on and self.flashlight_battery > 0:
-            self._draw_flashlight_effect(offset_x, offset_y)
+        self.billboards.draw()
 
     def _draw_walls_raycasting(self, offset_x=0, offset_y=0):
-        """Отрисовка стен с эффектами"""
+        """Отрисовка стен с эффектами: все лучи и колонки одним пакетом"""
         num_rays = 120
         ray_step = self.player_fov / num_rays
         column_width = self.window.width / num_rays
+        height = self.window.height
 
         # Эффект мерцания для всех стен
         flicker_multiplier = 1.0
@@ -1707,102 +1445,55 @@ class Horror3DGame(arcade.View):
             flicker = flicker * self.light_flicker_intensity + (1 - self.light_flicker_intensity)
             flicker_multiplier = flicker
 
-        for i in range(num_rays):
-            ray_angle = (self.player_angle - self.player_fov / 2) + i * ray_step
-            distance, wall_type = self._cast_ray(ray_angle)
+        ray_angles = (self.player_angle - self.player_fov / 2) + np.arange(num_rays) * ray_step
+        ray_distances, wall_types, lit_cells = cast_rays(self.map, self.player_x, self.player_y, ray_angles)
 
-            if distance > 0:
-                darkness = 1.0 + self.fear_induced_darkness + self.near_monster_effect * 0.3
-                if not self.flashlight_on or self.flashlight_battery < 20:
-                    darkness *= 1.5
+        darkness = 1.0 + self.fear_induced_darkness + self.near_monster_effect * 0.3
+        if not self.flashlight_on or self.flashlight_battery < 20:
+            darkness *= 1.5
 
-                wall_height = min(600, self.window.height / max(distance * darkness, 0.1))
+        wall_height = np.minimum(600, height / np.maximum(ray_distances * darkness, 0.1))
+        left = np.arange(num_rays) * column_width + offset_x
+        y_bottom = (height - wall_height) / 2 + offset_y
+        y_top = y_bottom + wall_height
 
-                x = i * column_width + offset_x
-                y_bottom = (self.window.height - wall_height) / 2 + offset_y
-                y_top = y_bottom + wall_height
+        # Запеченный свет клетки перед стеной: темные углы и тупики, пятна ламп
+        baked = self.light_map.sample(lit_cells[:, 0], lit_cells[:, 1])
+        darken = np.minimum(1.0, 8.0 / (ray_distances * darkness)) * flicker_multiplier * baked
 
-                darken = min(1.0, 8.0 / (distance * darkness)) * flicker_multiplier
+        # Границы полос: низ пола, низ стены, верх стены, верх потолка
+        edges = np.stack([
+            np.full(num_rays, 0 + offset_y), y_bottom, y_top, np.full(num_rays, height + offset_y)
+        ], axis=1)
 
-                if wall_type == 'side':
-                    wall_color = (
-                        int(70 * darken),
-                        int(60 * darken),
-                        int(50 * darken)
-                    )
-                else:
-                    wall_color = (
-                        int(80 * darken),
-                        int(70 * darken),
-                        int(60 * darken)
-                    )
-
-                arcade.draw_lrbt_rectangle_filled(
-                    x, x + column_width,
-                    y_bottom, y_top,
-                    wall_color
-                )
-
-                floor_darken = darken * 0.6
-                floor_color = (
-                    int(40 * floor_darken),
-                    int(30 * floor_darken),
-                    int(20 * floor_darken)
-                )
-                arcade.draw_lrbt_rectangle_filled(
-                    x, x + column_width,
-                       0 + offset_y, y_bottom,
-                    floor_color
-                )
-
-                ceiling_darken = darken * 0.5
-                ceiling_color = (
-                    int(20 * ceiling_darken),
-                    int(15 * ceiling_darken),
-                    int(30 * ceiling_darken)
-                )
-                arcade.draw_lrbt_rectangle_filled(
-                    x, x + column_width,
-                    y_top, self.window.height + offset_y,
-                    ceiling_color
-                )
-
-    def _cast_ray(self, angle: float) -> Tuple[float, str]:
-        """Кастовать луч"""
-        step = 0.05
-        max_dist = 25.0
-
-        x = self.player_x
-        y = self.player_y
-        dir_x = math.cos(angle)
-        dir_y = math.sin(angle)
-
-        distance = 0
-        last_x, last_y = x, y
-
-        while distance < max_dist:
-            distance += step
-            test_x = x + dir_x * distance
-            test_y = y + dir_y * distance
-
-            if self.check_collision(test_x, test_y):
-                grid_x = int(test_x)
-                grid_y = int(test_y)
-                last_grid_x = int(last_x)
-                last_grid_y = int(last_y)
-
-                if grid_x != last_grid_x and grid_y != last_grid_y:
-                    wall_type = 'corner'
-                elif grid_x != last_grid_x:
-                    wall_type = 'side'
-                else:
-                    wall_type = 'front'
-
-                return distance, wall_type
-
-            last_x, last_y = test_x, test_y
-
-        return max_dist, 'front'
+        # Фонарик: вертикальный угол точки от центра экрана и расстояние до нее
+        # (края экрана - пол и потолок у самых ног)
+        power = 0.0
+        if self.flashlight_on and self.flashlight_battery > 0:
+            power = min(1.0, self.flashlight_battery / 200.0) * self.flashlight_flicker * flicker_multiplier
+        vertical_fov = self.player_fov * height / self.window.width
+        row_angles = (edges - (height / 2 + offset_y)) / height * vertical_fov
+        point_distances = np.stack([
+            np.minimum(ray_distances, 1.0), ray_distances, ray_distances, np.minimum(ray_distances, 1.0)
+        ], axis=1)
+        beam = flashlight_beam(ray_angles, row_angles, point_distances, self.flashlight_angle, power)
+
+        wall_base = np.where(
+            (wall_types == WALL_SIDE)[:, None],
+            np.array([70.0, 60.0, 50.0]), np.array([80.0, 70.0, 60.0])
+        ) * darken[:, None]
+        floor_base = np.array([40.0, 30.0, 20.0]) * (darken * 0.6)[:, None]
+        ceiling_base = np.array([20.0, 15.0, 30.0]) * (darken * 0.5)[:, None]
+
+        colors = np.empty((num_rays, 3, 2, 3))
+        for band, base in enumerate((floor_base, wall_base, ceiling_base)):
+            colors[:, band, 0] = light_colors(base, beam[:, band])
+            colors[:, band, 1] = light_colors(base, beam[:, band + 1])
+
+        self.wall_batch.update(left, left + column_width, edges, colors)
+        self.wall_batch.draw()
+
+        self._record_visible_cells(ray_angles, ray_distances)
 
     def _draw_objects_in_3d(self, offset_x=0, offset_y=0):
         """Отрисовка объектов"""
@@ -1876,23 +1567,13 @@ class Horror3DGame(arcade.View):
                     int(215 * brightness),
                     int(50 * brightness)
                 )
-                arcade.draw_circle_filled(screen_x, screen_y, size, core_color)
+                self.billboards.add('disk', screen_x, screen_y, size, core_color)
 
-                glow_size = size * 1.5
                 glow_alpha = min(255, max(0, int(100 * pulse * darken)))
                 if glow_alpha > 0:
-                    arcade.draw_circle_filled(
-                        screen_x, screen_y, glow_size,
-                        (core_color[0], core_color[1], core_color[2], glow_alpha)
-                    )
+                    self.billboards.add('disk', screen_x, screen_y, size * 1.5, core_color, glow_alpha)
 
-                arcade.draw_circle_outline(screen_x, screen_y, size, (255, 255, 200, 200), 3)
-
-                arcade.draw_text(
-                    "K", screen_x, screen_y - 4,
-                    (100, 80, 0, 200), int(size * 0.9),
-                    anchor_x="center", anchor_y="center", bold=True
-                )
+                self.billboards.add('key_mark', screen_x, screen_y, size)
 
             elif obj_data['type'] == 'exit':
                 blink = int(time.time() * 2) % 2 == 0
@@ -1903,24 +1584,14 @@ class Horror3DGame(arcade.View):
                         int(50 * brightness),
                         int(50 * brightness)
                     )
-
-                    arcade.draw_circle_filled(screen_x, screen_y, size, core_color)
+                    self.billboards.add('disk', screen_x, screen_y, size, core_color)
 
                     pulse_size = size * (1.2 + 0.3 * math.sin(obj_data['pulse'] * 3))
                     pulse_alpha = min(255, max(0, int(150 * (0.5 + 0.5 * math.sin(obj_data['pulse'] * 3)) * darken)))
                     if pulse_alpha > 0:
-                        arcade.draw_circle_filled(
-                            screen_x, screen_y, pulse_size,
-                            (core_color[0], core_color[1], core_color[2], pulse_alpha)
-                        )
+                        self.billboards.add('disk', screen_x, screen_y, pulse_size, core_color, pulse_alpha)
 
-                    arcade.draw_circle_outline(screen_x, screen_y, size, (255, 200, 200, 200), 3)
-
-                    arcade.draw_text(
-                        "E", screen_x, screen_y - 4,
-                        (150, 0, 0, 200), int(size * 0.9),
-                        anchor_x="center", anchor_y="center", bold=True
-                    )
+                    self.billboards.add('exit_mark', screen_x, screen_y, size)
 
     def _draw_monsters_3d(self, offset_x=0, offset_y=0):
         """Отрисовка монстров с эффектами"""
@@ -1967,104 +1638,49 @@ class Horror3DGame(arcade.View):
                     int(60 * darken),
                     int(60 * darken)
                 )
-                arcade.draw_circle_filled(screen_x, screen_y, size, body_color)
-
-                shadow_alpha = min(255, max(0, 150))
-                shadow_color = (100, 30, 30, shadow_alpha)
-                arcade.draw_circle_filled(screen_x - size * 0.2, screen_y - size * 0.2, size * 0.9, shadow_color)
+                self.billboards.add('disk', screen_x, screen_y, size, body_color)
+                self.billboards.add('monster_features', screen_x, screen_y, size)
 
-                eye_size = size * 0.18
-                eye_offset = size * 0.35
-                eye_y_offset = size * 0.1
-
-                eye_alpha = min(255, max(0, 220))
-                arcade.draw_circle_filled(
-                    screen_x - eye_offset, screen_y + eye_y_offset,
-                    eye_size, (255, 255, 255, eye_alpha)
-                )
-                arcade.draw_circle_filled(
-                    screen_x + eye_offset, screen_y + eye_y_offset,
-                    eye_size, (255, 255, 255, eye_alpha)
-                )
+    def _update_postprocess(self, offset_x=0, offset_y=0):
+        """Параметры экранных эффектов для прохода постобработки"""
+        post = self.postprocess
+        post.reset()
+        post.set(time=self.game_time)
 
-                pupil_offset = eye_size * 0.3
-                arcade.draw_circle_filled(
-                    screen_x - eye_offset, screen_y + eye_y_offset + pupil_offset,
-                    eye_size * 0.6, (255, 0, 0)
-                )
-                arcade.draw_circle_filled(
-                    screen_x + eye_offset, screen_y + eye_y_offset + pupil_offset,
-                    eye_size * 0.6, (255, 0, 0)
-                )
-
-                highlight_alpha = min(255, max(0, 200))
-                highlight_size = eye_size * 0.2
-                arcade.draw_circle_filled(
-                    screen_x - eye_offset - eye_size * 0.2, screen_y + eye_y_offset + eye_size * 0.3,
-                    highlight_size, (255, 255, 255, highlight_alpha)
-                )
-                arcade.draw_circle_filled(
-                    screen_x + eye_offset - eye_size * 0.2, screen_y + eye_y_offset + eye_size * 0.3,
-                    highlight_size, (255, 255, 255, highlight_alpha)
-                )
-
-    def _draw_flashlight_effect(self, offset_x=0, offset_y=0):
-        """Эффект фонарика с мерцанием"""
-        if self.flashlight_battery <= 0:
-            return
-
-        center_x = self.window.width // 2 + offset_x
-        center_y = self.window.height // 2 + offset_y
+        # Искажение
+        if self.visual_distortion > 0:
+            post.set(distortion=self.visual_distortion * 5)
 
-        # Базовая интенсивность
-        intensity = min(1.0, self.flashlight_battery / 200.0) * self.flashlight_flicker
+        # Кровь на экране
+        if self.blood_overlay > 0:
+            alpha = min(255, max(0, int(200 * self.blood_overlay)))
+            post.set(blood=rgba((180, 30, 30), alpha // 3))
 
-        # Эффект мерцания
-        if self.light_flicker_active:
-            flicker = (math.sin(self.game_time * 30) + 1) / 2
-            intensity *= (0.5 + flicker * 0.5)
+        # Усиленная виньетка при темноте
+        vignette_strength = self.vignette + self.fear_induced_darkness * 0.5 + self.near_monster_effect * 0.2
+        if vignette_strength > 0:
+            post.set(
+                vignette=min(1.0, 200 * vignette_strength / 255),
+                darkness=1.0 if self.flashlight_on else 2.0
+            )
 
-        layers = [
-            (220 * intensity, min(255, max(0, int(50 * intensity)))),
-            (160 * intensity, min(255, max(0, int(30 * intensity)))),
-            (100 * intensity, min(255, max(0, int(15 * intensity))))
-        ]
+        # Эффект паранойи
+        if self.paranoia_effect > 0 and random.random() < self.paranoia_effect * 0.1:
+            rect = self._paranoia_shadow_rect()
+            if rect:
+                post.set(shadow_rect=rect)
 
-        for radius, alpha in layers:
-            arcade.draw_circle_filled(
-                center_x, center_y, radius,
-                (255, 245, 220, alpha)
-            )
+        if self.flash_effect > 0:
+            post.set(flash=rgba((255, 200, 200), int(self.flash_effect * 150)))
 
     def _draw_effects(self, offset_x=0, offset_y=0):
         """Эффекты"""
-        for particle in self.particles:
-            particle_alpha = min(255, max(0, particle.alpha))
-            arcade.draw_circle_filled(
-                particle.x + offset_x,
-                particle.y + offset_y,
-                particle.size,
-                (particle.color[0], particle.color[1], particle.color[2], particle_alpha)
-            )
-
-        for particle in self.blood_particles:
-            blood_alpha = min(255, max(0, 180))
-            arcade.draw_circle_filled(
-                particle.x + offset_x,
-                particle.y + offset_y,
-                particle.size,
-                (particle.color[0], particle.color[1], particle.color[2], blood_alpha)
-            )
+        self.particles.draw(offset_x, offset_y)
+        self.blood_particles.draw(offset_x, offset_y)
 
+        # Заливка кровью - в постобработке, капли остаются примитивами
         if self.blood_overlay > 0:
             alpha = min(255, max(0, int(200 * self.blood_overlay)))
-
-            arcade.draw_lrbt_rectangle_filled(
-                0 + offset_x, self.window.width + offset_x,
-                0 + offset_y, self.window.height + offset_y,
-                (180, 30, 30, alpha // 3)
-            )
-
             for _ in range(int(self.blood_overlay * 10)):
                 drop_x = random.randint(0, self.window.width)
                 drop_y = random.randint(0, self.window.height)
@@ -2075,69 +1691,35 @@ class Horror3DGame(arcade.View):
                     drop_size, (150, 20, 20, drop_alpha)
                 )
 
-        # Усиленная виньетка при темноте
-        vignette_strength = self.vignette + self.fear_induced_darkness * 0.5 + self.near_monster_effect * 0.2
-        if vignette_strength > 0:
-            alpha = min(255, max(0, int(200 * vignette_strength)))
-            if not self.flashlight_on:
-                alpha = min(255, max(0, alpha * 2))
-
-            gradient_height = self.window.height * 0.4
-            for i in range(20):
-                step_alpha = min(255, max(0, int(alpha * (i / 20))))
-                y_top = self.window.height - i * (gradient_height / 20)
-                y_bottom = i * (gradient_height / 20)
-
-                arcade.draw_lrbt_rectangle_filled(
-                    0 + offset_x, self.window.width + offset_x,
-                    y_top - (gradient_height / 20), y_top + offset_y,
-                    (0, 0, 0, step_alpha)
-                )
-                arcade.draw_lrbt_rectangle_filled(
-                    0 + offset_x, self.window.width + offset_x,
-                    y_bottom - (gradient_height / 20) + offset_y, y_bottom + offset_y,
-                    (0, 0, 0, step_alpha)
-                )
-
-        if self.flash_effect > 0:
-            alpha = int(self.flash_effect * 150)
-            arcade.draw_lrbt_rectangle_filled(
-                0 + offset_x, self.window.width + offset_x,
-                0 + offset_y, self.window.height + offset_y,
-                (255, 200, 200, alpha)
-            )
-
     def _draw_hallucinations(self, offset_x=0, offset_y=0):
         """Отрисовка галлюцинаций"""
         if self.hallucination_active:
-            for figure in self.shadow_figures:
-                if figure['life'] > 0:
-                    alpha = int((figure['life'] / figure['max_life']) * 100)
-                    if alpha > 0:
-                        arcade.draw_circle_filled(
-                            figure['x'] + offset_x,
-                            figure['y'] + offset_y,
-                            figure['size'],
-                            (0, 0, 0, alpha)
-                        )
+            for figure in self.shadow_figures.active():
+                alpha = int((figure['life'] / figure['max_life']) * 100)
+                if alpha > 0:
+                    arcade.draw_circle_filled(
+                        figure['x'] + offset_x,
+                        figure['y'] + offset_y,
+                        figure['size'],
+                        (0, 0, 0, alpha)
+                    )
 
     def _draw_blood_veins(self, offset_x=0, offset_y=0):
         """Отрисовка кровавых прожилок"""
-        if self.player_stress > 70:
-            for vein in self.blood_veins:
-                if vein['alpha'] > 0:
-                    arcade.draw_line(
-                        vein['x1'] + offset_x, vein['y1'] + offset_y,
-                        vein['x2'] + offset_x, vein['y2'] + offset_y,
-                        (150, 20, 20, vein['alpha']),
-                        vein['thickness']
-                    )
+        for vein in self.blood_veins.active():
+            if vein['alpha'] > 0:
+                arcade.draw_line(
+                    vein['x1'] + offset_x, vein['y1'] + offset_y,
+                    vein['x2'] + offset_x, vein['y2'] + offset_y,
+                    (150, 20, 20, vein['alpha']),
+                    vein['thickness']
+                )
 
     def _draw_whisper_effects(self, offset_x=0, offset_y=0):
         """Отрисовка эффектов шепотов"""
-        for effect in self.whisper_effects:
+        for effect in self.whisper_effects.active():
             if effect['alpha'] > 0:
-                arcade.draw_text(
+                draw_text(
                     effect['text'],
                     effect['x'] + offset_x, effect['y'] + offset_y,
                     (255, 255, 255, effect['alpha']), 16,
@@ -2154,7 +1736,7 @@ class Horror3DGame(arcade.View):
             (0, 0, 0, alpha // 2)
         )
 
-        arcade.draw_text(
+        draw_text(
             "Нажмите I для инструкции по управлению",
             self.window.width // 2, self.window.height - 60,
             (255, 255, 200, alpha), 18,
@@ -2175,7 +1757,7 @@ class Horror3DGame(arcade.View):
                 (0, 0, 0, 180)
             )
 
-            arcade.draw_text(
+            draw_text(
                 f"ВНИМАНИЕ! ОСТАЛОСЬ {minutes:02d}:{seconds:02d}",
                 self.window.width // 2, self.window.height - 150,
                 (255, 100, 100), 28,
@@ -2183,99 +1765,138 @@ class Horror3DGame(arcade.View):
                 bold=True
             )
 
-    def _draw_paranoia_effect(self):
-        """Эффект паранойи"""
-        if random.random() < 0.5:
-            side = random.choice(['left', 'right', 'top', 'bottom'])
-            if side == 'left':
-                x = random.randint(0, 50)
-                y = random.randint(0, self.window.height)
-                arcade.draw_lrbt_rectangle_filled(
-                    x - 15, x + 15,
-                    y - 75, y + 75,
-                    (0, 0, 0, 100)
-                )
-            elif side == 'right':
-                x = random.randint(self.window.width - 50, self.window.width)
-                y = random.randint(0, self.window.height)
-                arcade.draw_lrbt_rectangle_filled(
-                    x - 15, x + 15,
-                    y - 75, y + 75,
-                    (0, 0, 0, 100)
-                )
-            elif side == 'top':
-                x = random.randint(0, self.window.width)
-                y = random.randint(self.window.height - 50, self.window.height)
-                arcade.draw_lrbt_rectangle_filled(
-                    x - 75, x + 75,
-                    y - 15, y + 15,
-                    (0, 0, 0, 100)
-                )
-            else:
-                x = random.randint(0, self.window.width)
-                y = random.randint(0, 50)
-                arcade.draw_lrbt_rectangle_filled(
-                    x - 75, x + 75,
-                    y - 15, y + 15,
-                    (0, 0, 0, 100)
-                )
+    def _paranoia_shadow_rect(self) -> Optional[Tuple[float, float, float, float]]:
+        """Тень паранойи у случайного края экрана: (x0, y0, x1, y1) или None"""
+        if random.random() >= 0.5:
+            return None
+
+        side = random.choice(['left', 'right', 'top', 'bottom'])
+        if side == 'left':
+            x = random.randint(0, 50)
+            y = random.randint(0, self.window.height)
+            return x - 15, y - 75, x + 15, y + 75
+        elif side == 'right':
+            x = random.randint(self.window.width - 50, self.window.width)
+            y = random.randint(0, self.window.height)
+            return x - 15, y - 75, x + 15, y + 75
+        elif side == 'top':
+            x = random.randint(0, self.window.width)
+            y = random.randint(self.window.height - 50, self.window.height)
+            return x - 75, y - 15, x + 75, y + 15
+        else:
+            x = random.randint(0, self.window.width)
+            y = random.randint(0, 50)
+            return x - 75, y - 15, x + 75, y + 15
+
+    def _init_hud_layer(self):
+        """Интерфейс в offscreen-текстуре, элементы перерисовываются при изменении"""
+        self.hud_layer = HudLayer()
+        self.hud_layer.set_background(self._draw_hud_panel)
+        self.hud_layer.add('health', self._draw_hud_health, lambda w, h: (18, 18, 256, 25))
+        self.hud_layer.add('sanity', self._draw_hud_sanity, lambda w, h: (18, 43, 256, 25))
+        self.hud_layer.add('stress', self._draw_hud_stress, lambda w, h: (18, 68, 256, 25))
+        self.hud_layer.add('keys', self._draw_hud_keys, lambda w, h: (w - 280, 68, 280, 42))
+        self.hud_layer.add('time', self._draw_hud_time, lambda w, h: (w - 412, 13, 282, 55))
+        self.hud_layer.add('battery', self._draw_hud_battery, lambda w, h: (w // 2 - 100, 18, 200, 26))
+        self.hud_layer.add('darkness', self._draw_hud_darkness, lambda w, h: (w // 2 - 120, 86, 240, 24))
+        self.hud_layer.add('map', self._draw_hud_map_status, lambda w, h: (w - 100, 10, 100, 22))
+        self.hud_layer.add('message', self._draw_hud_message, lambda w, h: (0, h - 70, w, 45))
+
+    def _hud_values(self) -> Dict[str, object]:
+        """Значения интерфейса в том виде, в каком они видны на экране"""
+        blink = int(time.time() * 2) % 2 == 0
+        slow_blink = int(time.time()) % 2 == 0
+
+        health = int(self.player_health)
+        all_keys = self.keys_collected >= self.keys_needed
+        time_percent = (self.max_game_time - self.game_time) / self.max_game_time
+        battery = int(self.flashlight_battery)
+
+        if self.exit_found:
+            message = ('exit', int(time.time() * 3) % 2 == 0)
+        elif all_keys and not self.endless:
+            message = ('keys', True)
+        else:
+            message = None
+
+        return {
+            'health': (health, health <= 30 and blink),
+            'sanity': int(self.player_sanity),
+            'stress': int(self.player_stress),
+            'keys': (self.keys_collected, self.endless_depth if self.endless else None, all_keys and blink),
+            'time': (int(self.game_time), int(250 * time_percent), time_percent <= 0.25 and slow_blink),
+            'battery': (battery, battery <= 20 and slow_blink) if self.flashlight_on else None,
+            'darkness': (self.darkness_stage, blink) if self.darkness_stage > 0 else None,
+            'map': self.show_minimap,
+            'message': message
+        }
 
     def _draw_hud(self):
         """Интерфейс"""
+        self.hud_layer.draw(self._hud_values())
+
+    def _draw_hud_panel(self):
+        """Подложка интерфейса"""
         arcade.draw_lrbt_rectangle_filled(
             0, self.window.width, 0, 110,
             (0, 0, 0, 180)
         )
 
-        # Здоровье
-        health_width = 250 * (self.player_health / 100.0)
-        if self.player_health > 60:
+    def _draw_hud_health(self, value):
+        """Здоровье"""
+        health, blink = value
+        health_width = 250 * (health / 100.0)
+        if health > 60:
             health_color = (50, 200, 50)
-        elif self.player_health > 30:
+        elif health > 30:
             health_color = (255, 150, 50)
         else:
-            health_color = (255, 50, 50)
-            if int(time.time() * 2) % 2 == 0:
-                health_color = (255, 100, 100)
+            health_color = (255, 100, 100) if blink else (255, 50, 50)
 
         arcade.draw_lrbt_rectangle_filled(20, 20 + health_width, 20, 40, health_color)
         arcade.draw_lrbt_rectangle_outline(20, 270, 20, 40, (255, 255, 255, 150), 2)
-        arcade.draw_text(f"ЗДОРОВЬЕ: {int(self.player_health)}%", 25, 25, arcade.color.WHITE, 16)
+        draw_text(f"ЗДОРОВЬЕ: {health}%", 25, 25, arcade.color.WHITE, 16)
 
-        # Рассудок
-        sanity_width = 250 * (self.player_sanity / 100.0)
+    def _draw_hud_sanity(self, sanity):
+        """Рассудок"""
+        sanity_width = 250 * (sanity / 100.0)
         sanity_color = (100, 100, 200)
         arcade.draw_lrbt_rectangle_filled(20, 20 + sanity_width, 45, 65, sanity_color)
         arcade.draw_lrbt_rectangle_outline(20, 270, 45, 65, (255, 255, 255, 150), 2)
-        arcade.draw_text(f"РАССУДОК: {int(self.player_sanity)}%", 25, 50, arcade.color.LIGHT_GRAY, 14)
+        draw_text(f"РАССУДОК: {sanity}%", 25, 50, arcade.color.LIGHT_GRAY, 14)
 
-        # Стресс
-        stress_width = 250 * (self.player_stress / 100.0)
-        if self.player_stress > 70:
+    def _draw_hud_stress(self, stress):
+        """Стресс"""
+        stress_width = 250 * (stress / 100.0)
+        if stress > 70:
             stress_color = (255, 50, 50)
-        elif self.player_stress > 40:
+        elif stress > 40:
             stress_color = (255, 150, 50)
         else:
             stress_color = (255, 200, 100)
 
         arcade.draw_lrbt_rectangle_filled(20, 20 + stress_width, 70, 90, stress_color)
         arcade.draw_lrbt_rectangle_outline(20, 270, 70, 90, (255, 255, 255, 150), 2)
-        arcade.draw_text(f"СТРЕСС: {int(self.player_stress)}%", 25, 75, arcade.color.WHITE, 14)
+        draw_text(f"СТРЕСС: {stress}%", 25, 75, arcade.color.WHITE, 14)
 
-        # Ключи
+    def _draw_hud_keys(self, value):
+        """Ключи"""
+        keys_collected, depth, blink = value
         progress_x = self.window.width - 280
-        key_text = f"КЛЮЧИ: {self.keys_collected}/{self.keys_needed}"
-        key_color = (255, 215, 0) if self.keys_collected >= self.keys_needed else arcade.color.WHITE
-        if self.keys_collected >= self.keys_needed:
-            if int(time.time() * 2) % 2 == 0:
-                key_color = (255, 255, 150)
-
-        arcade.draw_text(key_text, progress_x, 75, key_color, 22, bold=True)
-
-        # Время с индикацией прогресса
-        time_text = f"ВРЕМЯ: {int(self.game_time)}с"
-        remaining_time = self.max_game_time - self.game_time
-        time_percent = remaining_time / self.max_game_time
+        key_text = f"КЛЮЧИ: {keys_collected}/{self.keys_needed}"
+        if depth is not None:
+            key_text = f"КЛЮЧИ: {keys_collected}  ГЛУБИНА: {depth}"
+        key_color = (255, 215, 0) if keys_collected >= self.keys_needed else arcade.color.WHITE
+        if blink:
+            key_color = (255, 255, 150)
+
+        draw_text(key_text, progress_x, 75, key_color, 22, bold=True)
+
+    def _draw_hud_time(self, value):
+        """Время с индикацией прогресса"""
+        game_time, time_bar_width, blink = value
+        progress_x = self.window.width - 280
+        time_percent = time_bar_width / 250
 
         # Цвет времени в зависимости от оставшегося времени
         if time_percent > 0.5:
@@ -2283,87 +1904,105 @@ class Horror3DGame(arcade.View):
         elif time_percent > 0.25:
             time_color = (255, 200, 100)
         else:
-            time_color = (255, 100, 100)
-            if int(time.time()) % 2 == 0:  # Мигание при малом времени
-                time_color = (255, 150, 150)
+            # Мигание при малом времени
+            time_color = (255, 150, 150) if blink else (255, 100, 100)
 
-        arcade.draw_text(time_text, progress_x, 50, time_color, 18)
+        draw_text(f"ВРЕМЯ: {game_time}с", progress_x, 50, time_color, 18)
 
         # Прогресс-бар времени
-        time_bar_width = 250 * time_percent
-        time_bar_color = time_color
-        arcade.draw_lrbt_rectangle_filled(progress_x - 130, progress_x - 130 + time_bar_width, 15, 25, time_bar_color)
+        arcade.draw_lrbt_rectangle_filled(progress_x - 130, progress_x - 130 + time_bar_width, 15, 25, time_color)
         arcade.draw_lrbt_rectangle_outline(progress_x - 130, progress_x - 130 + 250, 15, 25, (255, 255, 255, 150), 2)
 
-        # Фонарик
-        if self.flashlight_on:
-            if self.flashlight_battery > 50:
-                battery_color = (100, 255, 100)
-            elif self.flashlight_battery > 20:
-                battery_color = (255, 200, 100)
-            else:
-                battery_color = (255, 100, 100)
-                if int(time.time()) % 2 == 0:
-                    battery_color = (255, 150, 150)
-
-            battery_text = f"ФОНАРИК: {int(self.flashlight_battery)}%"
-            arcade.draw_text(
-                battery_text, self.window.width // 2 - 100, 25,
-                battery_color, 16
-            )
+    def _draw_hud_battery(self, value):
+        """Фонарик"""
+        if value is None:
+            return
 
-        # Индикатор темноты
-        if self.darkness_stage > 0:
-            darkness_texts = ["СРЕДНЯЯ ТЕМНОТА", "СИЛЬНАЯ ТЕМНОТА"]
-            darkness_colors = [(255, 200, 100), (255, 150, 50)]
-
-            blink = int(time.time() * 2) % 2 == 0
-            if blink:
-                arcade.draw_text(
-                    darkness_texts[self.darkness_stage - 1],
-                    self.window.width // 2, 90,
-                    darkness_colors[self.darkness_stage - 1], 14,
-                    anchor_x="center"
-                )
+        battery, blink = value
+        if battery > 50:
+            battery_color = (100, 255, 100)
+        elif battery > 20:
+            battery_color = (255, 200, 100)
+        else:
+            battery_color = (255, 150, 150) if blink else (255, 100, 100)
 
-        # Статус карты
-        if self.show_minimap:
+        draw_text(
+            f"ФОНАРИК: {battery}%", self.window.width // 2 - 100, 25,
+            battery_color, 16
+        )
+
+    def _draw_hud_darkness(self, value):
+        """Индикатор темноты"""
+        if value is None:
+            return
+
+        darkness_stage, blink = value
+        darkness_texts = ["СРЕДНЯЯ ТЕМНОТА", "СИЛЬНАЯ ТЕМНОТА"]
+        darkness_colors = [(255, 200, 100), (255, 150, 50)]
+
+        if blink:
+            draw_text(
+                darkness_texts[darkness_stage - 1],
+                self.window.width // 2, 90,
+                darkness_colors[darkness_stage - 1], 14,
+                anchor_x="center"
+            )
+
+    def _draw_hud_map_status(self, show_minimap):
+        """Статус карты"""
+        if show_minimap:
             map_status = "КАРТА: ВКЛ"
             map_color = (100, 255, 100)
         else:
             map_status = "КАРТА: ВЫКЛ"
             map_color = (200, 200, 200)
 
-        arcade.draw_text(
+        draw_text(
             map_status,
             self.window.width - 50, 15,
             map_color, 12,
             anchor_x="center"
         )
 
-        # Сообщения
-        if self.exit_found:
-            blink = int(time.time() * 3) % 2 == 0
-            if blink:
-                arcade.draw_text(
-                    "✓ ВЫХОД НАЙДЕН!",
-                    self.window.width // 2, self.window.height - 60,
-                    (255, 50, 50), 26,
-                    anchor_x="center", bold=True
-                )
-        elif self.keys_collected >= self.keys_needed:
-            arcade.draw_text(
+    def _draw_hud_message(self, value):
+        """Сообщения"""
+        if value is None:
+            return
+
+        message, blink = value
+        if message == 'exit' and blink:
+            draw_text(
+                "✓ ВЫХОД НАЙДЕН!",
+                self.window.width // 2, self.window.height - 60,
+                (255, 50, 50), 26,
+                anchor_x="center", bold=True
+            )
+        elif message == 'keys':
+            draw_text(
                 "ВСЕ КЛЮЧИ НАЙДЕНЫ! ИЩИТЕ ВЫХОД!",
                 self.window.width // 2, self.window.height - 60,
                 (255, 215, 0), 24,
                 anchor_x="center", bold=True
             )
 
+    def _record_visible_cells(self, angles: np.ndarray, distances: np.ndarray):
+        """Отметить исследованными клетки, через которые прошли лучи кадра, и клетки попаданий"""
+        # Шаг выборки меньше клетки, поэтому вдоль луча не пропускается ни одна клетка
+        steps = np.arange(0.0, distances.max() + 0.5, 0.5)
+        along = np.minimum(steps[None, :], distances[:, None])
+        xs = (self.player_x + np.cos(angles)[:, None] * along).astype(np.int64).ravel()
+        ys = (self.player_y + np.sin(angles)[:, None] * along).astype(np.int64).ravel()
+
+        self.exploration.ensure_height(self.map.height)
+        new_xs, new_ys = self.exploration.mark(xs, ys)
+        self.minimap_layer.reveal(new_xs, new_ys)
+
     def _draw_minimap(self):
         """Миникарта"""
         map_size = min(350, int(min(self.window.width, self.window.height) * self.minimap_scale))
         margin = 20
-        cell_size = min(map_size // self.map_width, map_size // self.map_height)
+        row_start, row_end = self.map.resident_range()
+        cell_size = min(map_size // self.map_width, map_size // (row_end - row_start))
 
         left = self.window.width - margin - map_size
         bottom = self.window.height - margin - map_size
@@ -2382,33 +2021,13 @@ class Horror3DGame(arcade.View):
             (180, 180, 180), 3
         )
 
-        # Карта
-        for y in range(self.map_height):
-            for x in range(self.map_width):
-                draw_x = left + (y * cell_size) + cell_size // 2
-                draw_y = bottom + (x * cell_size) + cell_size // 2
-
-                if self.map[y][x] == 1:
-                    color = (80, 80, 80)
-                    arcade.draw_lrbt_rectangle_filled(
-                        draw_x - cell_size // 2 + 1,
-                        draw_x + cell_size // 2 - 1,
-                        draw_y - cell_size // 2 + 1,
-                        draw_y + cell_size // 2 - 1,
-                        color
-                    )
-                else:
-                    color = (40, 40, 50)
-                    arcade.draw_lrbt_rectangle_filled(
-                        draw_x - cell_size // 2 + 1,
-                        draw_x + cell_size // 2 - 1,
-                        draw_y - cell_size // 2 + 1,
-                        draw_y + cell_size // 2 - 1,
-                        color
-                    )
+        # Карта: статичный слой в текстуре, пересобирается при смене загруженных строк
+        if self.minimap_layer.rows != (row_start, row_end):
+            self.minimap_layer.build(self.map, row_start, row_end)
+        self.minimap_layer.draw(left, bottom, cell_size)
 
         # Игрок
-        player_map_x = left + (self.player_y * cell_size)
+        player_map_x = left + ((self.player_y - row_start) * cell_size)
         player_map_y = bottom + (self.player_x * cell_size)
         player_size = max(cell_size // 1.2, 8)
 
@@ -2431,7 +2050,7 @@ class Horror3DGame(arcade.View):
         # Объекты
         for obj in self.objectives:
             if not obj.collected:
-                obj_x = left + (obj.y * cell_size)
+                obj_x = left + ((obj.y - row_start) * cell_size)
                 obj_y = bottom + (obj.x * cell_size)
                 obj_size = max(5, cell_size // 1.5)
 
@@ -2444,7 +2063,7 @@ class Horror3DGame(arcade.View):
         # Монстры
         for monster in self.monsters:
             if monster.active:
-                monster_x = left + (monster.y * cell_size)
+                monster_x = left + ((monster.y - row_start) * cell_size)
                 monster_y = bottom + (monster.x * cell_size)
                 monster_size = max(5, cell_size // 1.3)
 
@@ -2464,7 +2083,7 @@ class Horror3DGame(arcade.View):
             "Найдите 3 ключа и выход",
             "",
             f"ВРЕМЯ: {int(self.max_game_time / 60)} минут",
-            f"ЛАБИРИНТ: {self.map_width}x{self.map_height}",
+            f"ЛАБИРИНТ: {self.map_width}x{'∞' if self.endless else self.map_height}",
             "",
             "ГЛАВНОЕ: Нажмите I для инструкции!",
             "",
@@ -2508,7 +2127,7 @@ class Horror3DGame(arcade.View):
                 size = 18
                 color = (200, 200, 200)
 
-            arcade.draw_text(
+            draw_text(
                 text, self.window.width // 2, center_y - y_offset,
                 (*color, alpha), size,
                 anchor_x="center", anchor_y="center",
@@ -2522,7 +2141,7 @@ class Horror3DGame(arcade.View):
             (0, 0, 0, 220)
         )
 
-        arcade.draw_text(
+        draw_text(
             "ИНСТРУКЦИЯ - 3D ХОРРОР ЛАБИРИНТ",
             self.window.width // 2, self.window.height - 80,
             (255, 50, 50), 32,
@@ -2536,14 +2155,14 @@ class Horror3DGame(arcade.View):
                 "A/D - влево/вправо",
                 "Мышь - поворот камеры",
                 "F - фонарик (вкл/выкл)",
-                "M - карта (вкл/выкл)",
+                "M - карта, N - туман на карте",
                 "ПРОБЕЛ - крик (отпугивает)",
                 "I - эта инструкция",
                 "ESC - выход в меню"
             ]),
             ("НОВЫЕ ОПАСНОСТИ", [
                 f"• Время: {int(self.max_game_time / 60)} минут на прохождение",
-                f"• Лабиринт: {self.map_width}x{self.map_height} клеток",
+                f"• Лабиринт: {self.map_width}x{'∞' if self.endless else self.map_height} клеток",
                 "• Монстры активно перемещаются",
                 "• Темнота усиливается со временем",
                 "• Свет может начать мерцать"
@@ -2563,7 +2182,7 @@ class Horror3DGame(arcade.View):
         for section_index, (section_title, items) in enumerate(sections):
             y = start_y - section_index * section_spacing
 
-            arcade.draw_text(
+            draw_text(
                 section_title,
                 self.window.width // 2, y,
                 (255, 215, 0), 24,
@@ -2574,7 +2193,7 @@ class Horror3DGame(arcade.View):
             for item_index, item in enumerate(items):
                 item_y = y - 30 - item_index * 25
                 color = (200, 200, 255) if "•" in item else (255, 255, 255)
-                arcade.draw_text(
+                draw_text(
                     item,
                     self.window.width // 2, item_y,
                     color, 18,
@@ -2583,7 +2202,7 @@ class Horror3DGame(arcade.View):
 
             start_y -= len(items) * 25 + 60
 
-        arcade.draw_text(
+        draw_text(
             "Нажмите I или ESCAPE чтобы закрыть",
             self.window.width // 2, 60,
             (150, 255, 150), 20,
@@ -2605,6 +2224,7 @@ class Horror3DGame(arcade.View):
             arcade.key.E: 'E',
             arcade.key.F: 'F',
             arcade.key.M: 'M',
+            arcade.key.N: 'N',
             arcade.key.SPACE: 'SPACE',
             arcade.key.I: 'I',
             arcade.key.ESCAPE: 'ESCAPE',
@@ -2649,6 +2269,9 @@ class Horror3DGame(arcade.View):
                 self.show_minimap = not self.show_minimap
                 self.last_minimap_toggle = current_time
 
+        elif symbol == arcade.key.N:
+            self.minimap_layer.set_fog(not self.minimap_layer.fog)
+
         elif symbol == arcade.key.SPACE:
             self.behavior_data.scream_events.append(time.time())
 
@@ -2713,6 +2336,7 @@ class Horror3DGame(arcade.View):
 
         # Останавливаем музыку
         self.stop_background_music()
+        coverage = self._save_exploration()
 
         game_stats = {
             'time': self.game_time,
@@ -2722,7 +2346,9 @@ class Horror3DGame(arcade.View):
             'sanity_level': self.player_sanity,
             'jump_scares': self.jump_scares_triggered,
             'monsters_killed': self.monsters_killed,
-            'time_out': self.time_out
+            'time_out': self.time_out,
+            'depth': self.endless_depth if self.endless else None,
+            'coverage': coverage
         }
 
         try:
@@ -2734,6 +2360,17 @@ class Horror3DGame(arcade.View):
             menu_view = MainMenuView()
             self.window.show_view(menu_view)
 
+    def _save_exploration(self) -> Optional[float]:
+        """Сохранить маску исследованных клеток в сессию; вернуть долю исследованных проходов"""
+        # В бесконечном режиме выгруженные строки неизвестны, поэтому покрытие не считаем
+        coverage = None if self.endless else self.exploration.coverage(self.map)
+        try:
+            from game_state import GameState
+            GameState().save_level2_exploration(self.exploration, coverage, self.endless)
+        except Exception as e:
+            print(f"Не удалось сохранить карту исследования: {e}")
+        return coverage
+
     def end_game(self):
         """Завершение игры"""
         if self.victory:
@@ -2747,6 +2384,7 @@ class Horror3DGame(arcade.View):
                     'stress_level': self.player_stress,
                     'sanity_level': self.player_sanity,
                     'jump_scares': self.jump_scares_triggered,
+                    'coverage': self._save_exploration(),
                 }
 
                 results_view = ResultsView(self.fear_profile, game_stats)
@@ -2777,7 +2415,15 @@ class Horror3DGame(arcade.View):
             open_areas.sort(key=lambda a: a[2], reverse=True)
             return open_areas[0][0] + 0.5, open_areas[0][1] + 0.5
 
-        return self.map_width // 2 + 0.5, self.map_height // 2 + 0.5
+        # Без просторных зон (идеальный лабиринт) берем проход, ближайший к центру
+        center_x, center_y = self.map_width // 2, self.map_height // 2
+        passages = [(x, y) for y in range(self.map_height) for x in range(self.map_width)
+                    if self.map[y][x] == 0]
+        if passages:
+            x, y = min(passages, key=lambda p: (p[0] - center_x) ** 2 + (p[1] - center_y) ** 2)
+            return x + 0.5, y + 0.5
+
+        return center_x + 0.5, center_y + 0.5
 
     def _find_far_position(self, from_x: float, from_y: float) -> Tuple[int, int]:
         """Найти позицию далеко от заданной"""
@@ -2794,32 +2440,9 @@ class Horror3DGame(arcade.View):
 
         return far_pos
 
-    def _create_collision_map(self):
-        """Создать карту коллизий"""
-        return [[cell == 1 for cell in row] for row in self.map]
-
-    def _create_walls_list(self):
-        """Создать список стен"""
-        walls = []
-        for y in range(self.map_height):
-            for x in range(self.map_width):
-                if self.map[y][x] == 1:
-                    walls.append({
-                        'x': x * self.tile_size,
-                        'y': y * self.tile_size,
-                        'width': self.tile_size,
-                        'height': self.tile_size
-                    })
-        return walls
-
     def check_collision(self, x, y):
         """Проверить коллизию"""
-        ix, iy = int(x), int(y)
-
-        if 0 <= ix < self.map_width and 0 <= iy < self.map_height:
-            return self.collision_map[iy][ix]
-
-        return True
+        return self.map.is_wall(int(x), int(y))
 
     def _place_objects(self):
         """Разместить объекты на карте"""
@@ -2851,6 +2474,9 @@ class Horror3DGame(arcade.View):
                 pulse=random.random() * math.pi * 2
             ))
 
+        if self.exit_location is None:
+            return
+
         exit_x, exit_y = self.exit_location
         self.objectives.append(Objective(
             x=exit_x + 0.5,
@@ -2898,3 +2524,61 @@ class Horror3DGame(arcade.View):
                 wander_range=random.uniform(10.0, 15.0)  # БОЛЬШЕ РАДИУС
             )
             self.monsters.append(monster)
+
+    # БЕСКОНЕЧНЫЙ РЕЖИМ
+
+    def _update_endless_maze(self):
+        """Достроить лабиринт впереди и убрать всё из закрывшейся части"""
+        new_ranges = self.map.ensure_around(self.player_y)
+        self.map_height = len(self.map)
+        self.endless_depth = max(self.endless_depth, int(self.player_y))
+
+        first_row, _ = self.map.resident_range()
+        self.objectives = [obj for obj in self.objectives if obj.y >= first_row]
+        self.exploration.drop_before(first_row)
+        self.light_map.drop_before(first_row)
+
+        for row_start, row_end in new_ranges:
+            self.light_map.bake(self.map, row_start, row_end)
+            self._place_endless_key(row_start, row_end)
+
+        for monster in self.monsters:
+            if monster.y < first_row + 1 or self.check_collision(monster.x, monster.y):
+                self._respawn_monster_ahead(monster)
+
+    def _place_endless_key(self, row_start: int, row_end: int):
+        """Положить ключ в новый кусок лабиринта"""
+        free_cells = [(x, y) for y in range(row_start, row_end)
+                      for x in range(self.map_width) if self.map[y][x] == 0]
+        if not free_cells:
+            return
+
+        x, y = random.choice(free_cells)
+        self.objectives.append(Objective(
+            x=x + 0.5,
+            y=y + 0.5,
+            type='key',
+            collected=False,
+            pulse=random.random() * math.pi * 2
+        ))
+
+    def _respawn_monster_ahead(self, monster: Monster):
+        """Перенести монстра в самый дальний сгенерированный кусок"""
+        row_start = max(1, self.map_height - self.map.chunk_rows)
+        candidates = []
+        for y in range(row_start, self.map_height - 1):
+            for x in range(1, self.map_width - 1):
+                if self.map[y][x] == 0:
+                    candidates.append((x, y))
+
+        if not candidates:
+            return
+
+        x, y = random.choice(candidates)
+        monster.x = monster.spawn_x = x + 0.5
+        monster.y = monster.spawn_y = y + 0.5
+        monster.patrol_path = [(x + 0.5, y + 0.5)]
+        monster.patrol_index = 0
+        monster.next_wander_target = None
+        monster.is_hunting = False
+        monster.is_idle = False
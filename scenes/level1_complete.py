@@ -71,6 +71,15 @@ class Level1CompleteView(arcade.View):
             anchor_x="center"
         ))
 
+        self.texts.append(arcade.Text(
+            "E - Бесконечный лабиринт",
+            self.window.width // 2,
+            122,
+            (180, 60, 60),
+            18,
+            anchor_x="center"
+        ))
+
         self.texts.append(arcade.Text(
             "ESC - В главное меню",
             self.window.width // 2,
@@ -135,16 +144,18 @@ class Level1CompleteView(arcade.View):
         """Обработка нажатия клавиш"""
         if symbol == arcade.key.SPACE:
             self.start_level2()
+        elif symbol == arcade.key.E:
+            self.start_level2(endless=True)
         elif symbol == arcade.key.ESCAPE:
             from scenes.main_menu import MainMenuView
             menu_view = MainMenuView()
             self.window.show_view(menu_view)
 
-    def start_level2(self):
-        """Запустить второй уровень"""
+    def start_level2(self, endless=False):
+        """Запустить второй уровень (endless - бесконечный лабиринт)"""
         game_state = GameState()
         fear_profile = game_state.get_fear_profile()
 
         from scenes.horror_3d import Horror3DGame
-        game_view = Horror3DGame(fear_profile)
+        game_view = Horror3DGame(fear_profile, endless=endless)
         self.window.show_view(game_view)
\ No newline at end of file
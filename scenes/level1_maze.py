@@ -6,6 +6,13 @@ import os
 import csv
 from datetime import datetime
 from data_models import CalibrationData
+from config import LEVEL1_MAZE_SIZE, LEVEL1_MAZE_ALGORITHM, LEVEL1_MAZE_SEED, MAZE_SEED_POOL
+from maze_helper import maze_cache, distance_field
+from particles import ParticleEmitter
+from text_cache import draw_text
+from hud_layer import HudLayer
+from scare_faces import SCARE_COLORS, scare_face_cache
+from postprocess import PostProcess, rgba
 
 
 try:
@@ -17,76 +24,37 @@ except ImportError:
     print("Pymunk не установлен. Физика будет отключена.")
 
 
+# Шаг появления искр за игроком: в среднем как прежние 30% кадров при 60 FPS
+SPARKLE_INTERVAL = 1 / 18
+
+# Наибольший диаметр лица активного скримера (радиус до 80 + 40)
+SCARE_FACE_DIAMETER = 240
+
+
 class ParticleSystem:
     """Система частиц для эффектов"""
 
     def __init__(self):
-        self.particles = []
+        self.emitter = ParticleEmitter(capacity=8192, spawn_budget=512)
 
     def create_explosion(self, x, y, color=(255, 100, 100), count=20):
         """Взрыв частиц"""
-        for _ in range(count):
-            angle = random.uniform(0, math.pi * 2)
-            speed = random.uniform(1, 5)
-            life = random.uniform(0.5, 1.5)
-            size = random.uniform(2, 6)
-
-            self.particles.append({
-                'x': x,
-                'y': y,
-                'vx': math.cos(angle) * speed,
-                'vy': math.sin(angle) * speed,
-                'life': life,
-                'max_life': life,
-                'color': color,
-                'size': size,
-                'gravity': 0.2
-            })
+        self.emitter.emit(x, y, count, speed=(1, 5), life=(0.5, 1.5), size=(2, 6),
+                          color=color, gravity=0.2)
 
     def create_sparkle(self, x, y, color=(255, 215, 0), count=10):
         """Мерцающие частицы"""
-        for _ in range(count):
-            angle = random.uniform(0, math.pi * 2)
-            speed = random.uniform(0.5, 2)
-            life = random.uniform(0.3, 0.8)
-            size = random.uniform(1, 3)
-
-            self.particles.append({
-                'x': x,
-                'y': y,
-                'vx': math.cos(angle) * speed,
-                'vy': math.sin(angle) * speed,
-                'life': life,
-                'max_life': life,
-                'color': color,
-                'size': size,
-                'gravity': 0
-            })
+        self.emitter.emit(x, y, count, speed=(0.5, 2), life=(0.3, 0.8), size=(1, 3),
+                          color=color)
 
     def update(self, delta_time):
         """Обновить частицы"""
-        for particle in self.particles[:]:
-            particle['x'] += particle['vx']
-            particle['y'] += particle['vy']
-            particle['vy'] -= particle.get('gravity', 0)
-            particle['life'] -= delta_time
-
-            if particle['life'] <= 0:
-                self.particles.remove(particle)
+        self.emitter.update(delta_time)
 
     def draw(self, camera_x=0, camera_y=0, shake_x=0, shake_y=0):
         """Отрисовать частицы с учетом камеры"""
-        for particle in self.particles:
-            # Учитываем сдвиг камеры и тряску
-            x = particle['x'] - camera_x + shake_x
-            y = particle['y'] - camera_y + shake_y
-
-            alpha = int(255 * (particle['life'] / particle['max_life']))
-            color = (*particle['color'], alpha)
-            arcade.draw_circle_filled(
-                x, y,
-                particle['size'], color
-            )
+        # Учитываем сдвиг камеры и тряску
+        self.emitter.draw(shake_x - camera_x, shake_y - camera_y)
 
 
 class AnimatedSprite:
@@ -138,7 +106,7 @@ class PhysicsObject:
         self.vy = 0
         self.active = True
 
-    def update(self, delta_time, walls):
+    def update(self, delta_time, maze):
         """Обновить физику"""
         if not self.active:
             return
@@ -150,36 +118,16 @@ class PhysicsObject:
         new_x = self.x + self.vx * delta_time * 60
         new_y = self.y + self.vy * delta_time * 60
 
-        # Проверка коллизий со стенами
-        collision = False
-        for wall in walls:
-            wx = wall.center_x
-            wy = wall.center_y
-            w_size = wall.width / 2
+        # Проверка коллизий со стенами по сетке лабиринта
+        if self._hits_wall(maze, new_x, self.y):
+            self.vx *= -0.5
+            new_x = self.x
+        if self._hits_wall(maze, new_x, new_y):
+            self.vy *= -0.5
+            new_y = self.y
 
-            dx = abs(new_x * 50 - wx)
-            dy = abs(new_y * 50 - wy)
-
-            if dx < w_size + self.radius * 50 and dy < w_size + self.radius * 50:
-                collision = True
-
-                # Отскок
-                if dx > dy:
-                    self.vx *= -0.5
-                else:
-                    self.vy *= -0.5
-
-                if dx < dy:
-                    new_x = self.x
-                else:
-                    new_y = self.y
-
-                self.vx *= 0.9
-                self.vy *= 0.9
-
-        if not collision:
-            self.x = new_x
-            self.y = new_y
+        self.x = new_x
+        self.y = new_y
 
         self.vx *= 0.99
         self.vy *= 0.99
@@ -188,6 +136,14 @@ class PhysicsObject:
         if abs(self.vx) < 0.01 and abs(self.vy) < 0.01:
             self.active = False
 
+    def _hits_wall(self, maze, x, y):
+        """Касается ли объект стены в позиции (x, y)"""
+        for cx in (x - self.radius, x + self.radius):
+            for cy in (y - self.radius, y + self.radius):
+                if maze.is_wall(int(cx), int(cy)):
+                    return True
+        return False
+
     def draw(self, camera_x=0, camera_y=0, shake_x=0, shake_y=0):
         """Отрисовать физический объект с учетом камеры"""
         if self.active:
@@ -303,7 +259,7 @@ class Level1InstructionView(arcade.View):
 
         # Заголовок
         title_color = (255, 50, 50, self.fade_alpha)
-        arcade.draw_text(
+        draw_text(
             "LEVEL 1: ТИШИНА",
             self.window.width // 2, self.window.height - 150,
             title_color, 48,
@@ -313,7 +269,7 @@ class Level1InstructionView(arcade.View):
 
         # Подзаголовок
         subtitle_color = (200, 200, 255, self.fade_alpha)
-        arcade.draw_text(
+        draw_text(
             "Только скримеры...",
             self.window.width // 2, self.window.height - 220,
             subtitle_color, 24,
@@ -332,7 +288,7 @@ class Level1InstructionView(arcade.View):
             )
 
             # Заголовок управления
-            arcade.draw_text(
+            draw_text(
                 "УПРАВЛЕНИЕ",
                 self.window.width // 2, self.window.height // 2 + 100,
                 (255, 200, 100, controls_alpha), 32,
@@ -350,14 +306,14 @@ class Level1InstructionView(arcade.View):
                 self.window.height // 2 + 20, self.window.height // 2 + 60,
                 key_bg
             )
-            arcade.draw_text(
+            draw_text(
                 "W",
                 self.window.width // 2, self.window.height // 2 + 40,
                 key_color, 28,
                 anchor_x="center", anchor_y="center",
                 bold=True
             )
-            arcade.draw_text(
+            draw_text(
                 "ВПЕРЕД",
                 self.window.width // 2 + 80, self.window.height // 2 + 40,
                 (200, 200, 200, controls_alpha), 20,
@@ -365,14 +321,14 @@ class Level1InstructionView(arcade.View):
             )
 
             # A и D
-            arcade.draw_text(
+            draw_text(
                 "A",
                 self.window.width // 2 - 100, self.window.height // 2 - 20,
                 key_color, 28,
                 anchor_x="center", anchor_y="center",
                 bold=True
             )
-            arcade.draw_text(
+            draw_text(
                 "D",
                 self.window.width // 2 + 100, self.window.height // 2 - 20,
                 key_color, 28,
@@ -385,7 +341,7 @@ class Level1InstructionView(arcade.View):
                 self.window.height // 2 - 40, self.window.height // 2,
                 key_bg
             )
-            arcade.draw_text(
+            draw_text(
                 "← ВЛЕВО",
                 self.window.width // 2 - 140, self.window.height // 2 - 20,
                 (200, 200, 200, controls_alpha), 18,
@@ -397,7 +353,7 @@ class Level1InstructionView(arcade.View):
                 self.window.height // 2 - 40, self.window.height // 2,
                 key_bg
             )
-            arcade.draw_text(
+            draw_text(
                 "ВПРАВО →",
                 self.window.width // 2 + 140, self.window.height // 2 - 20,
                 (200, 200, 200, controls_alpha), 18,
@@ -410,14 +366,14 @@ class Level1InstructionView(arcade.View):
                 self.window.height // 2 - 100, self.window.height // 2 - 60,
                 key_bg
             )
-            arcade.draw_text(
+            draw_text(
                 "S",
                 self.window.width // 2, self.window.height // 2 - 80,
                 key_color, 28,
                 anchor_x="center", anchor_y="center",
                 bold=True
             )
-            arcade.draw_text(
+            draw_text(
                 "НАЗАД",
                 self.window.width // 2 + 80, self.window.height // 2 - 80,
                 (200, 200, 200, controls_alpha), 20,
@@ -426,7 +382,7 @@ class Level1InstructionView(arcade.View):
 
             # Подсказка
             hint_alpha = int((math.sin(time.time() * 3) + 1) / 2 * controls_alpha)
-            arcade.draw_text(
+            draw_text(
                 "ESC - выход в меню",
                 self.window.width // 2, self.window.height // 2 - 150,
                 (150, 150, 150, hint_alpha), 16,
@@ -441,7 +397,7 @@ class Level1InstructionView(arcade.View):
             # Мигающий текст
             blink = int((math.sin(time.time() * 5) + 1) / 2 * warning_alpha)
 
-            arcade.draw_text(
+            draw_text(
                 "ВНИМАНИЕ:",
                 self.window.width // 2, 300,
                 (255, 50, 50, warning_alpha), 36,
@@ -449,21 +405,21 @@ class Level1InstructionView(arcade.View):
                 bold=True
             )
 
-            arcade.draw_text(
+            draw_text(
                 "В лабиринте 10 скримеров",
                 self.window.width // 2, 250,
                 (255, 150, 150, warning_alpha), 24,
                 anchor_x="center"
             )
 
-            arcade.draw_text(
+            draw_text(
                 "4 из них скрыты и появляются при приближении",
                 self.window.width // 2, 220,
                 (255, 200, 200, warning_alpha), 20,
                 anchor_x="center"
             )
 
-            arcade.draw_text(
+            draw_text(
                 "Будьте готовы...",
                 self.window.width // 2, 150,
                 (255, 100, 100, blink), 28,
@@ -474,7 +430,7 @@ class Level1InstructionView(arcade.View):
         # Таймер до начала
         if self.show_warning:
             time_left = max(0, 8.0 - (time.time() - self.start_time))
-            arcade.draw_text(
+            draw_text(
                 f"Начало через: {time_left:.1f}",
                 self.window.width // 2, 50,
                 (200, 200, 255, warning_alpha), 20,
@@ -497,15 +453,27 @@ class Level1InstructionView(arcade.View):
 class Level1MazeView(arcade.View):
     """Level 1"""
 
-    def __init__(self, calibration_data: CalibrationData):
+    def __init__(self, calibration_data: CalibrationData, maze_size=None, seed=None):
         super().__init__()
         self.calibration_data = calibration_data
 
         self.tile_size = 50
-        self.map_width = 15
-        self.map_height = 15
-        self.exit_x = self.map_width - 2
-        self.exit_y = self.map_height - 2
+
+        # ЛАБИРИНТ: берем из общего генератора (с кэшем по сиду)
+        maze_size = maze_size or LEVEL1_MAZE_SIZE
+        if seed is None:
+            seed = LEVEL1_MAZE_SEED if LEVEL1_MAZE_SEED is not None else maze_cache.random_seed(MAZE_SEED_POOL)
+        self.maze_seed = seed
+        self.maze = maze_cache.get(maze_size, maze_size, LEVEL1_MAZE_ALGORITHM, seed=seed, braid=True)
+        self.map_width = self.maze.width
+        self.map_height = self.maze.height
+
+        # Геодезические расстояния от старта; выход - в самой дальней точке
+        self.start_cell = (1, 1)
+        self.distances = distance_field(self.maze, self.start_cell)
+        exit_index = int(self.distances.argmax())
+        self.exit_x = exit_index % self.map_width
+        self.exit_y = exit_index // self.map_width
 
         # Игрок
         self.player_sprite = None
@@ -522,12 +490,16 @@ class Level1MazeView(arcade.View):
         self.wall_list = None
         self.exit_list = None
         self.scare_list = None
+        self.world_camera = arcade.Camera2D()
+        self.postprocess = PostProcess()
+        self.init_hud_layer()
 
         #Анимированные спрайты
         self.animated_scares = []
 
         #Система частиц
         self.particle_system = ParticleSystem()
+        self.sparkle_timer = 0.0
 
         #Физические объекты
         self.physics_objects = []
@@ -536,25 +508,6 @@ class Level1MazeView(arcade.View):
         self.data_saver = GameDataSaver()
         self.best_time, self.best_scares = self.data_saver.get_best_score(level=1)
 
-        #ЛАБИРИНТ
-        self.maze = [
-            [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
-            [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-            [1, 0, 1, 1, 0, 1, 1, 1, 0, 1, 1, 1, 0, 0, 1],
-            [1, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 1, 1],
-            [1, 0, 1, 0, 1, 1, 1, 1, 1, 1, 0, 1, 0, 0, 1],
-            [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0, 1],
-            [1, 1, 1, 1, 1, 0, 1, 1, 1, 1, 1, 1, 0, 0, 1],
-            [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1],
-            [1, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 1],
-            [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0, 1],
-            [1, 1, 1, 1, 0, 1, 1, 1, 1, 1, 0, 1, 0, 0, 1],
-            [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1],
-            [1, 0, 1, 1, 1, 1, 1, 0, 1, 1, 1, 1, 0, 0, 1],
-            [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-            [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1]
-        ]
-
         # Выход
         self.maze[self.exit_y][self.exit_x] = 2
 
@@ -609,17 +562,50 @@ class Level1MazeView(arcade.View):
         self.create_physics_objects()
 
     def find_free_cells(self):
-        """Найти все свободные клетки в лабиринте"""
+        """Найти все свободные клетки в лабиринте (кроме старта)"""
         free_cells = []
         for y in range(self.map_height):
             for x in range(self.map_width):
-                if self.maze[y][x] == 0:  # Свободная клетка
+                if self.maze[y][x] == 0 and (x, y) != self.start_cell:  # Свободная клетка
                     free_cells.append((x, y))
         return free_cells
 
+    def select_scare_cells(self, count=10):
+        """Выбрать клетки для скримеров равномерно по пути от старта к выходу
+
+        Берем равноотстоящие геодезические расстояния от 15% до 95% от
+        максимального и для каждого - случайную клетку с ближайшим расстоянием.
+        """
+        max_distance = int(self.distances.max())
+        if max_distance <= 0:
+            return random.sample(self.free_cells, min(count, len(self.free_cells)))
+
+        by_distance = {}
+        for x, y in self.free_cells:
+            by_distance.setdefault(int(self.distances[y, x]), []).append((x, y))
+
+        selected = []
+        used = set()
+        for i in range(min(count, len(self.free_cells))):
+            target = max_distance * (0.15 + 0.8 * i / max(1, count - 1))
+            candidates = []
+            for d in sorted(by_distance, key=lambda d: abs(d - target)):
+                candidates = [cell for cell in by_distance[d] if cell not in used]
+                if candidates:
+                    break
+            if not candidates:
+                break
+            cell = random.choice(candidates)
+            used.add(cell)
+            selected.append(cell)
+
+        # Скрытые скримеры (первые 4) ставим глубже в лабиринт
+        selected.reverse()
+        return selected
+
     def create_jumpscares(self):
         """Создание 10 скримеров на свободных клетках"""
-        selected_cells = random.sample(self.free_cells, min(10, len(self.free_cells)))
+        selected_cells = self.select_scare_cells(10)
 
         # Создаем скримеры
         for i, (x, y) in enumerate(selected_cells):
@@ -653,9 +639,20 @@ class Level1MazeView(arcade.View):
             from sound_manager import SoundManager
             self.sound_manager = SoundManager(sound_mode="level1")
             self.sound_manager.set_volume(1.0)
+            self.sound_manager.preload_async()
         except Exception:
             self.sound_manager = None
 
+    def on_show_view(self):
+        """Сцена на экране - держим ссылки на звуки"""
+        if self.sound_manager:
+            self.sound_manager.acquire()
+
+    def on_hide_view(self):
+        """Сцена ушла с экрана - звуки остаются в общем реестре для следующих сцен"""
+        if self.sound_manager:
+            self.sound_manager.release()
+
     def create_physics_objects(self):
         """Создать физические объекты на карте"""
         available_cells = [cell for cell in self.free_cells
@@ -685,19 +682,19 @@ class Level1MazeView(arcade.View):
         self.exit_list = arcade.SpriteList()
         self.scare_list = arcade.SpriteList()
 
-        # Стены
+        # Стены (рисуются одним вызовом через SpriteList и камеру)
         for y in range(self.map_height):
             for x in range(self.map_width):
                 if self.maze[y][x] == 1:
                     wall = arcade.SpriteSolidColor(
-                        self.tile_size, self.tile_size, (80, 60, 70)
+                        self.tile_size, self.tile_size, color=(80, 60, 70)
                     )
                     wall.center_x = x * self.tile_size + self.tile_size // 2
                     wall.center_y = y * self.tile_size + self.tile_size // 2
                     self.wall_list.append(wall)
                 elif self.maze[y][x] == 2:
                     exit_sprite = arcade.SpriteSolidColor(
-                        self.tile_size - 20, self.tile_size - 20, (150, 50, 50)
+                        self.tile_size - 20, self.tile_size - 20, color=(150, 50, 50)
                     )
                     exit_sprite.center_x = x * self.tile_size + self.tile_size // 2
                     exit_sprite.center_y = y * self.tile_size + self.tile_size // 2
@@ -705,27 +702,7 @@ class Level1MazeView(arcade.View):
 
         # Скримеры
         for scare in self.jumpscares:
-            # Определяем цвет в зависимости от типа
-            if scare['type'] == 'face1':
-                color = (255, 50, 50)  # Красный
-            elif scare['type'] == 'face2':
-                color = (255, 100, 0)  # Оранжевый
-            elif scare['type'] == 'face3':
-                color = (200, 0, 100)  # Пурпурный
-            elif scare['type'] == 'face4':
-                color = (100, 100, 255)  # Синий
-            elif scare['type'] == 'face5':
-                color = (150, 0, 0)  # Темно-красный
-            elif scare['type'] == 'face6':
-                color = (50, 50, 50)  # Темный
-            elif scare['type'] == 'face7':
-                color = (200, 200, 255)  # Светло-синий
-            elif scare['type'] == 'face8':
-                color = (100, 100, 100)  # Серый
-            elif scare['type'] == 'face9':
-                color = (255, 200, 0)  # Желтый
-            else:  # face10
-                color = (100, 255, 100)  # Зеленый
+            color = SCARE_COLORS[scare['type']]
 
             # Определяем прозрачность
             if scare.get('hidden', False):
@@ -733,40 +710,58 @@ class Level1MazeView(arcade.View):
             else:
                 color_with_alpha = (color[0], color[1], color[2], 150)  # Полу-прозрачный
 
-            scare_sprite = arcade.SpriteSolidColor(20, 20, color_with_alpha)
+            scare_sprite = arcade.SpriteSolidColor(20, 20, color=color_with_alpha)
             scare_sprite.center_x = scare['x'] * self.tile_size
             scare_sprite.center_y = scare['y'] * self.tile_size
             scare['sprite'] = scare_sprite
             self.scare_list.append(scare_sprite)
 
+        # Лица скримеров запекаются в текстуры один раз (кэш общий для перезапусков)
+        scare_face_cache.preload([scare['type'] for scare in self.jumpscares], SCARE_FACE_DIAMETER)
+        self.scare_face_sprite = arcade.Sprite()
+        self.scare_face_list = arcade.SpriteList()
+        self.scare_face_list.append(self.scare_face_sprite)
+
         # Игрок
         player_size = int(self.player_radius * self.tile_size * 2)
         self.player_sprite = arcade.SpriteSolidColor(
-            player_size, player_size, (100, 150, 255)
+            player_size, player_size, color=(100, 150, 255)
         )
         self.player_sprite.center_x = self.player_x * self.tile_size
         self.player_sprite.center_y = self.player_y * self.tile_size
 
+    def collides_with_walls(self, center_x, center_y):
+        """Пересекается ли хитбокс игрока со стенами (проверка по сетке)"""
+        half_w = self.player_sprite.width / 2
+        half_h = self.player_sprite.height / 2
+        left = int((center_x - half_w) // self.tile_size)
+        right = int((center_x + half_w - 1) // self.tile_size)
+        bottom = int((center_y - half_h) // self.tile_size)
+        top = int((center_y + half_h - 1) // self.tile_size)
+
+        for y in range(bottom, top + 1):
+            for x in range(left, right + 1):
+                if self.maze.is_wall(x, y):
+                    return True
+        return False
+
+    def reached_exit(self):
+        """Пересекается ли игрок с плиткой выхода"""
+        exit_half = (self.tile_size - 20) / 2
+        exit_cx = self.exit_x * self.tile_size + self.tile_size // 2
+        exit_cy = self.exit_y * self.tile_size + self.tile_size // 2
+        return (abs(self.player_sprite.center_x - exit_cx) < exit_half + self.player_sprite.width / 2 and
+                abs(self.player_sprite.center_y - exit_cy) < exit_half + self.player_sprite.height / 2)
+
     def check_collisions(self, dx, dy):
         """Проверка коллизий"""
-        old_x = self.player_sprite.center_x
-        old_y = self.player_sprite.center_y
-
-        self.player_sprite.center_x += dx
-        collisions = arcade.check_for_collision_with_list(self.player_sprite, self.wall_list)
-
-        if collisions:
-            self.player_sprite.center_x = old_x
-            self.player_sprite.center_y += dy
-            collisions = arcade.check_for_collision_with_list(self.player_sprite, self.wall_list)
-            if collisions:
-                self.player_sprite.center_y = old_y
-        else:
-            old_x = self.player_sprite.center_x
-            self.player_sprite.center_y += dy
-            collisions = arcade.check_for_collision_with_list(self.player_sprite, self.wall_list)
-            if collisions:
-                self.player_sprite.center_y = old_y
+        new_x = self.player_sprite.center_x + dx
+        if not self.collides_with_walls(new_x, self.player_sprite.center_y):
+            self.player_sprite.center_x = new_x
+
+        new_y = self.player_sprite.center_y + dy
+        if not self.collides_with_walls(self.player_sprite.center_x, new_y):
+            self.player_sprite.center_y = new_y
 
         self.player_x = self.player_sprite.center_x / self.tile_size
         self.player_y = self.player_sprite.center_y / self.tile_size
@@ -789,8 +784,10 @@ class Level1MazeView(arcade.View):
         if move_x != 0 or move_y != 0:
             self.check_collisions(move_x, move_y)
 
-            # Создаем частицы при движении
-            if random.random() < 0.3:
+            # Создаем частицы при движении с постоянной частотой
+            self.sparkle_timer += delta_time
+            if self.sparkle_timer >= SPARKLE_INTERVAL:
+                self.sparkle_timer %= SPARKLE_INTERVAL
                 self.particle_system.create_sparkle(
                     self.player_sprite.center_x + random.randint(-10, 10),
                     self.player_sprite.center_y + random.randint(-10, 10),
@@ -814,7 +811,7 @@ class Level1MazeView(arcade.View):
 
         # Обновление физических объектов
         for phys_obj in self.physics_objects[:]:
-            phys_obj.update(delta_time, self.wall_list)
+            phys_obj.update(delta_time, self.maze)
 
             dx = phys_obj.x - self.player_x
             dy = phys_obj.y - self.player_y
@@ -861,8 +858,7 @@ class Level1MazeView(arcade.View):
             self.sanity = min(100, self.sanity + delta_time * 0.5)
 
         # Выход
-        exit_collisions = arcade.check_for_collision_with_list(self.player_sprite, self.exit_list)
-        if exit_collisions:
+        if self.reached_exit():
             self.win_game()
 
     def collect_shield(self, phys_obj):
@@ -919,151 +915,19 @@ class Level1MazeView(arcade.View):
                     break
 
     def draw_scare_face(self, x, y, scare_type, size, alpha):
-        """Рисуем разные лица скримеров с анимацией"""
+        """Рисуем лицо скримера: запеченный кадр анимации одним спрайтом"""
         # Добавляем пульсацию к размеру
         pulse = (math.sin(time.time() * 10) + 1) / 2 * 0.2 + 0.8
         size = size * pulse
 
-        if scare_type == 'face1':  # Обычное лицо
-            # Анимированный цвет лица
-            color_pulse = (math.sin(time.time() * 5) + 1) / 2
-            red = int(200 + 55 * color_pulse)
-            arcade.draw_circle_filled(x, y, size, (red, 50, 50, alpha))
-
-            # Анимированные глаза
-            eye_size = size * 0.25
-            eye_offset_x = size * 0.3
-            eye_offset_y = size * 0.2
-
-            # Мерцание глаз
-            eye_alpha = alpha * (0.7 + 0.3 * math.sin(time.time() * 8))
-
-            arcade.draw_circle_filled(
-                x - eye_offset_x, y + eye_offset_y,
-                eye_size, (255, 255, 255, int(eye_alpha))
-            )
-            arcade.draw_circle_filled(
-                x + eye_offset_x, y + eye_offset_y,
-                eye_size, (255, 255, 255, int(eye_alpha))
-            )
-
-            # Зрачки с движением
-            pupil_move = math.sin(time.time() * 3) * 0.1
-            arcade.draw_circle_filled(
-                x - eye_offset_x, y + eye_offset_y + pupil_move * eye_size,
-                eye_size * 0.4, (0, 0, 0, alpha)
-            )
-            arcade.draw_circle_filled(
-                x + eye_offset_x, y + eye_offset_y + pupil_move * eye_size,
-                eye_size * 0.4, (0, 0, 0, alpha)
-            )
-
-            # Анимированный рот
-            mouth_open = (math.sin(time.time() * 4) + 1) / 2
-            mouth_height = size * 0.15 * mouth_open
-            arcade.draw_ellipse_filled(
-                x, y - size * 0.3,
-                   size * 0.6, mouth_height,
-                (200, 0, 0, alpha)
-            )
-
-        elif scare_type == 'face2':  # Кривое лицо
-            # Анимированное лицо
-            face_pulse = (math.sin(time.time() * 3) + 1) / 2
-            arcade.draw_circle_filled(x, y, size, (255, 100, 0, alpha))
-
-            # Двигающиеся глаза
-            eye_move_x = math.sin(time.time() * 2) * 0.1
-            eye_move_y = math.cos(time.time() * 1.5) * 0.1
-
-            arcade.draw_circle_filled(
-                x - size * 0.25 + eye_move_x * size,
-                y + size * 0.3 + eye_move_y * size,
-                size * 0.2, (255, 255, 255, alpha)
-            )
-            arcade.draw_circle_filled(
-                x + size * 0.35 - eye_move_x * size,
-                y + size * 0.25 - eye_move_y * size,
-                size * 0.2, (255, 255, 255, alpha)
-            )
-
-            # Мерцающие зрачки
-            if int(time.time() * 3) % 2 == 0:
-                arcade.draw_circle_filled(
-                    x - size * 0.25 + eye_move_x * size,
-                    y + size * 0.3 + eye_move_y * size,
-                    size * 0.08, (0, 0, 0, alpha)
-                )
-                arcade.draw_circle_filled(
-                    x + size * 0.35 - eye_move_x * size,
-                    y + size * 0.25 - eye_move_y * size,
-                    size * 0.08, (0, 0, 0, alpha)
-                )
-
-            # Анимированный рот
-            mouth_pulse = (math.sin(time.time() * 5) + 1) / 2
-            arcade.draw_arc_filled(
-                x, y - size * 0.2,
-                   size * 0.7, size * 0.4 * mouth_pulse,
-                (200, 50, 0, alpha), 0, 180
-            )
-
-        elif scare_type == 'face3':  # Злое лицо
-            # Пульсирующее лицо
-            pulse = (math.sin(time.time() * 6) + 1) / 2
-            red = int(150 + 50 * pulse)
-            arcade.draw_circle_filled(x, y, size, (red, 0, 100, alpha))
-
-            # Мерцающие глаза-треугольники
-            eye_alpha = alpha * (0.5 + 0.5 * math.sin(time.time() * 4))
-            arcade.draw_triangle_filled(
-                x - size * 0.4, y + size * 0.3,
-                x - size * 0.2, y + size * 0.1,
-                x - size * 0.6, y + size * 0.1,
-                (255, 255, 255, int(eye_alpha))
-            )
-            arcade.draw_triangle_filled(
-                x + size * 0.4, y + size * 0.3,
-                x + size * 0.2, y + size * 0.1,
-                x + size * 0.6, y + size * 0.1,
-                (255, 255, 255, int(eye_alpha))
-            )
-
-            # Пульсирующая линия рта
-            mouth_pulse = (math.sin(time.time() * 8) + 1) / 2
-            arcade.draw_line(
-                x - size * 0.3, y - size * 0.25,
-                x + size * 0.3, y - size * 0.25,
-                (100, 0, 50, alpha),
-                3 * mouth_pulse
-            )
-
-        else:  # Упрощенные остальные типы
-            # Базовое лицо для остальных типов
-            color_pulse = (math.sin(time.time() * 3) + 1) / 2
-            base_color = (200, 100, 100, alpha)
-            arcade.draw_circle_filled(x, y, size, base_color)
-
-            # Простые глаза
-            arcade.draw_circle_filled(
-                x - size * 0.3, y + size * 0.2,
-                size * 0.15, (255, 255, 255, alpha)
-            )
-            arcade.draw_circle_filled(
-                x + size * 0.3, y + size * 0.2,
-                size * 0.15, (255, 255, 255, alpha)
-            )
-
-            # Мигающие зрачки
-            if int(time.time() * 2) % 2 == 0:
-                arcade.draw_circle_filled(
-                    x - size * 0.3, y + size * 0.2,
-                    size * 0.07, (0, 0, 0, alpha)
-                )
-                arcade.draw_circle_filled(
-                    x + size * 0.3, y + size * 0.2,
-                    size * 0.07, (0, 0, 0, alpha)
-                )
+        texture = scare_face_cache.texture(scare_type, SCARE_FACE_DIAMETER, time.time())
+        sprite = self.scare_face_sprite
+        if sprite.texture is not texture:
+            sprite.texture = texture
+        sprite.position = (x, y)
+        sprite.scale = size * 2 / texture.width
+        sprite.alpha = min(255, max(0, alpha))
+        self.scare_face_list.draw()
 
     def trigger_scare(self, scare):
         """Активировать скример"""
@@ -1122,147 +986,110 @@ class Level1MazeView(arcade.View):
         shake_x = random.uniform(-self.screen_shake, self.screen_shake) * 20 if self.screen_shake > 0 else 0
         shake_y = random.uniform(-self.screen_shake, self.screen_shake) * 20 if self.screen_shake > 0 else 0
 
-        # Стены
-        for wall in self.wall_list:
-            x = wall.center_x - self.camera_x + shake_x
-            y = wall.center_y - self.camera_y + shake_y
-
-            arcade.draw_lrbt_rectangle_filled(
-                x - self.tile_size // 2, x + self.tile_size // 2,
-                y - self.tile_size // 2, y + self.tile_size // 2,
-                (80, 60, 70)
-            )
-
-        # Выход
-        for exit_sprite in self.exit_list:
+        # Сцена рисуется в offscreen-текстуру, вспышка и кровь - одним проходом шейдера
+        self.postprocess.reset()
+        if self.flash > 0:
+            self.postprocess.set(flash=rgba((255, 200, 200), int(self.flash * 100)))
+        if self.blood_overlay > 0:
+            self.postprocess.set(blood=rgba((150, 20, 20), int(self.blood_overlay * 100) // 3))
+        with self.postprocess.capture():
+            # Стены и выход: один батч-вызов на список через камеру мира
             pulse = (math.sin(time.time() * 5) + 1) / 2
-            red = 150 + int(100 * pulse)
+            for exit_sprite in self.exit_list:
+                exit_sprite.color = (150 + int(100 * pulse), 50, 50)
 
-            x = exit_sprite.center_x - self.camera_x + shake_x
-            y = exit_sprite.center_y - self.camera_y + shake_y
-
-            arcade.draw_lrbt_rectangle_filled(
-                x - (self.tile_size - 20) // 2, x + (self.tile_size - 20) // 2,
-                y - (self.tile_size - 20) // 2, y + (self.tile_size - 20) // 2,
-                (red, 50, 50)
+            self.world_camera.position = (
+                self.camera_x - shake_x + self.window.width / 2,
+                self.camera_y - shake_y + self.window.height / 2
             )
+            with self.world_camera.activate():
+                self.wall_list.draw()
+                self.exit_list.draw()
+
+            for exit_sprite in self.exit_list:
+                x = exit_sprite.center_x - self.camera_x + shake_x
+                y = exit_sprite.center_y - self.camera_y + shake_y
+
+                draw_text(
+                    "ВЫХОД",
+                    x, y,
+                    arcade.color.WHITE, 14,
+                    anchor_x="center", anchor_y="center"
+                )
 
-            arcade.draw_text(
-                "ВЫХОД",
-                x, y,
-                arcade.color.WHITE, 14,
-                anchor_x="center", anchor_y="center"
-            )
+            # НОВОЕ: Физические объекты
+            for phys_obj in self.physics_objects:
+                phys_obj.draw(self.camera_x, self.camera_y, shake_x, shake_y)
 
-        # НОВОЕ: Физические объекты
-        for phys_obj in self.physics_objects:
-            phys_obj.draw(self.camera_x, self.camera_y, shake_x, shake_y)
+            # Скримеры
+            for scare in self.jumpscares:
+                if not scare['triggered'] and scare.get('sprite') and scare.get('visible', True):
+                    x = scare['sprite'].center_x - self.camera_x + shake_x
+                    y = scare['sprite'].center_y - self.camera_y + shake_y
 
-        # Скримеры
-        for scare in self.jumpscares:
-            if not scare['triggered'] and scare.get('sprite') and scare.get('visible', True):
-                x = scare['sprite'].center_x - self.camera_x + shake_x
-                y = scare['sprite'].center_y - self.camera_y + shake_y
+                    # Анимированные скримеры
+                    pulse = (math.sin(scare['animation_time'] * 3) + 1) / 2 * 0.3 + 0.7
+                    size = 10 * pulse
 
-                # Анимированные скримеры
-                pulse = (math.sin(scare['animation_time'] * 3) + 1) / 2 * 0.3 + 0.7
-                size = 10 * pulse
-
-                # Цвет в зависимости от типа
-                if scare['type'] == 'face1':
-                    color = (255, 50, 50, 150)
-                elif scare['type'] == 'face2':
-                    color = (255, 100, 0, 150)
-                elif scare['type'] == 'face3':
-                    color = (200, 0, 100, 150)
-                elif scare['type'] == 'face4':
-                    color = (100, 100, 255, 150)
-                elif scare['type'] == 'face5':
-                    color = (150, 0, 0, 150)
-                elif scare['type'] == 'face6':
-                    color = (50, 50, 50, 150)
-                elif scare['type'] == 'face7':
-                    color = (200, 200, 255, 150)
-                elif scare['type'] == 'face8':
-                    color = (100, 100, 100, 150)
-                elif scare['type'] == 'face9':
-                    color = (255, 200, 0, 150)
-                else:  # face10
-                    color = (100, 255, 100, 150)
-
-                arcade.draw_circle_filled(x, y, size, color)
-
-                # Мерцающий контур
-                if int(scare['animation_time'] * 5) % 2 == 0:
-                    arcade.draw_circle_outline(
-                        x, y, size,
-                        (255, 255, 255, 200), 2
-                    )
+                    color = (*SCARE_COLORS[scare['type']], 150)
 
-        # Система частиц
-        self.particle_system.draw(self.camera_x, self.camera_y, shake_x, shake_y)
+                    arcade.draw_circle_filled(x, y, size, color)
 
-        # Активный скример
-        if self.active_scare and self.scare_timer > 0:
-            scare = self.active_scare
-            x = scare['sprite'].center_x - self.camera_x + shake_x
-            y = scare['sprite'].center_y - self.camera_y + shake_y
+                    # Мерцающий контур
+                    if int(scare['animation_time'] * 5) % 2 == 0:
+                        arcade.draw_circle_outline(
+                            x, y, size,
+                            (255, 255, 255, 200), 2
+                        )
 
-            size = 80 + (1.0 - self.scare_timer / 0.8) * 40
-            alpha = int(255 * (self.scare_timer / 0.8))
+            # Система частиц
+            self.particle_system.draw(self.camera_x, self.camera_y, shake_x, shake_y)
 
-            self.draw_scare_face(x, y, scare['type'], size, alpha)
+            # Активный скример
+            if self.active_scare and self.scare_timer > 0:
+                scare = self.active_scare
+                x = scare['sprite'].center_x - self.camera_x + shake_x
+                y = scare['sprite'].center_y - self.camera_y + shake_y
 
-        # Игрок
-        player_x = self.player_sprite.center_x - self.camera_x + shake_x
-        player_y = self.player_sprite.center_y - self.camera_y + shake_y
-        player_size = self.player_radius * self.tile_size
+                size = 80 + (1.0 - self.scare_timer / 0.8) * 40
+                alpha = int(255 * (self.scare_timer / 0.8))
 
-        arcade.draw_circle_filled(player_x, player_y, player_size, (100, 150, 255))
-        arcade.draw_circle_outline(player_x, player_y, player_size, (200, 200, 255), 2)
+                self.draw_scare_face(x, y, scare['type'], size, alpha)
 
-        # Щит игрока
-        if self.shield_active:
-            shield_size = player_size * 1.5
-            shield_alpha = int(150 * (0.7 + 0.3 * math.sin(time.time() * 8)))
+            # Игрок
+            player_x = self.player_sprite.center_x - self.camera_x + shake_x
+            player_y = self.player_sprite.center_y - self.camera_y + shake_y
+            player_size = self.player_radius * self.tile_size
 
-            arcade.draw_circle_outline(
-                player_x, player_y,
-                shield_size,
-                (100, 200, 255, shield_alpha),
-                3
-            )
+            arcade.draw_circle_filled(player_x, player_y, player_size, (100, 150, 255))
+            arcade.draw_circle_outline(player_x, player_y, player_size, (200, 200, 255), 2)
+
+            # Щит игрока
+            if self.shield_active:
+                shield_size = player_size * 1.5
+                shield_alpha = int(150 * (0.7 + 0.3 * math.sin(time.time() * 8)))
 
-            # Частицы щита
-            if random.random() < 0.3:
-                angle = random.uniform(0, math.pi * 2)
-                dist = shield_size + random.uniform(-5, 5)
-                part_x = player_x + math.cos(angle) * dist
-                part_y = player_y + math.sin(angle) * dist
-
-                arcade.draw_circle_filled(
-                    part_x, part_y,
-                    3,
-                    (100, 200, 255, 150)
+                arcade.draw_circle_outline(
+                    player_x, player_y,
+                    shield_size,
+                    (100, 200, 255, shield_alpha),
+                    3
                 )
 
-        # Вспышка
-        if self.flash > 0:
-            flash_color = (255, 200, 200, int(self.flash * 100))
-            arcade.draw_lrbt_rectangle_filled(
-                0, self.window.width,
-                0, self.window.height,
-                flash_color
-            )
+                # Частицы щита
+                if random.random() < 0.3:
+                    angle = random.uniform(0, math.pi * 2)
+                    dist = shield_size + random.uniform(-5, 5)
+                    part_x = player_x + math.cos(angle) * dist
+                    part_y = player_y + math.sin(angle) * dist
+
+                    arcade.draw_circle_filled(
+                        part_x, part_y,
+                        3,
+                        (100, 200, 255, 150)
+                    )
 
-        # Кровь
-        if self.blood_overlay > 0:
-            blood_alpha = int(self.blood_overlay * 100)
-            arcade.draw_lrbt_rectangle_filled(
-                0, self.window.width,
-                0, self.window.height,
-                (150, 20, 20, blood_alpha // 3)
-            )
+        self.postprocess.draw()
 
         # Интерфейс
         self.draw_hud()
@@ -1280,7 +1107,7 @@ class Level1MazeView(arcade.View):
             )
 
             # Текст подсказки
-            arcade.draw_text(
+            draw_text(
                 "Управление: W A S D  |  ПРОБЕЛ - щит  |  ESC - меню",
                 self.window.width // 2, self.window.height - 60,
                 (255, 255, 200, hint_alpha), 20,
@@ -1289,8 +1116,42 @@ class Level1MazeView(arcade.View):
             )
 
 
+    def init_hud_layer(self):
+        """Интерфейс в offscreen-текстуре, элементы перерисовываются при изменении"""
+        self.hud_layer = HudLayer()
+        self.hud_layer.add('status', self.draw_hud_status, lambda w, h: (20, 20, 330, 100))
+        self.hud_layer.add('shield', self.draw_hud_shield, lambda w, h: (w - 150, 18, 150, 26))
+        self.hud_layer.add('best', self.draw_hud_best, lambda w, h: (w - 200, 45, 200, 42))
+        self.hud_layer.add('time', self.draw_hud_time, lambda w, h: (w - 150, h - 36, 150, 32))
+        self.hud_layer.add('hint', self.draw_hud_hint, lambda w, h: (w // 2 - 300, h - 36, 600, 34))
+
     def draw_hud(self):
         """Интерфейс"""
+        stress = int(self.stress)
+        play_time = int(time.time() - self.start_time)
+
+        # Пульсация стресса квантуется до 8 шагов
+        pulse = None
+        if stress > 80:
+            pulse = int((math.sin(time.time() * 8) + 1) / 2 * 8)
+
+        hint_color = (255, 100, 100) if stress > 70 else (255, 200, 100) if stress > 50 else (200, 200, 255)
+
+        shield = None
+        if self.shield_active:
+            shield = (int(self.shield_timer), self.shield_timer < 3 and int(time.time() * 2) % 2 == 0)
+
+        self.hud_layer.draw({
+            'status': (stress, pulse, int(self.sanity), self.scares_triggered),
+            'shield': shield,
+            'best': (int(self.best_time) if self.best_time else None, self.best_scares),
+            'time': play_time,
+            'hint': (play_time // 10, hint_color, self.scares_triggered)
+        })
+
+    def draw_hud_status(self, value):
+        """Стресс, рассудок и счетчик скримеров"""
+        stress, pulse, sanity, scares_triggered = value
         arcade.draw_lrbt_rectangle_filled(
             20, 350,
             20, 120,
@@ -1298,11 +1159,10 @@ class Level1MazeView(arcade.View):
         )
 
         # Стресс
-        stress_width = 320 * (self.stress / 100)
-        if self.stress > 80:
-            pulse = (math.sin(time.time() * 8) + 1) / 2
-            stress_color = (255, 50 + int(50 * pulse), 50)
-        elif self.stress > 60:
+        stress_width = 320 * (stress / 100)
+        if stress > 80:
+            stress_color = (255, 50 + int(50 * pulse / 8), 50)
+        elif stress > 60:
             stress_color = (255, 150, 50)
         else:
             stress_color = (255, 255, 100)
@@ -1314,8 +1174,8 @@ class Level1MazeView(arcade.View):
         )
 
         # Рассудок
-        sanity_width = 320 * (self.sanity / 100)
-        sanity_color = (100, 200, 255) if self.sanity > 50 else (255, 150, 100)
+        sanity_width = 320 * (sanity / 100)
+        sanity_color = (100, 200, 255) if sanity > 50 else (255, 150, 100)
 
         arcade.draw_lrbt_rectangle_filled(
             30, 30 + sanity_width,
@@ -1323,76 +1183,81 @@ class Level1MazeView(arcade.View):
             sanity_color
         )
 
-        arcade.draw_text(
-            f"СТРЕСС: {int(self.stress)}%",
+        draw_text(
+            f"СТРЕСС: {stress}%",
             30, 80,
             arcade.color.WHITE, 20
         )
 
-        arcade.draw_text(
-            f"РАССУДОК: {int(self.sanity)}%",
+        draw_text(
+            f"РАССУДОК: {sanity}%",
             30, 50,
             arcade.color.WHITE, 20
         )
 
-        arcade.draw_text(
-            f"СКРИМЕРОВ: {self.scares_triggered}/10",
+        draw_text(
+            f"СКРИМЕРОВ: {scares_triggered}/10",
             30, 25,
-            (255, 100, 100) if self.scares_triggered > 0 else (200, 200, 200), 16
+            (255, 100, 100) if scares_triggered > 0 else (200, 200, 200), 16
         )
 
-        # Статус щита
-        if self.shield_active:
-            shield_text = f"ЩИТ: {int(self.shield_timer)}с"
-            shield_color = (100, 200, 255)
-
-            # Мигание при заканчивающемся щите
-            if self.shield_timer < 3:
-                if int(time.time() * 2) % 2 == 0:
-                    shield_color = (255, 100, 100)
-
-            arcade.draw_text(
-                shield_text,
-                self.window.width - 150, 25,
-                shield_color, 16
-            )
+    def draw_hud_shield(self, value):
+        """Статус щита"""
+        if value is None:
+            return
 
-        # Лучший результат
-        if self.best_time:
-            arcade.draw_text(
-                f"ЛУЧШЕЕ ВРЕМЯ: {int(self.best_time)}с",
+        shield_timer, blink = value
+        shield_color = (100, 200, 255)
+
+        # Мигание при заканчивающемся щите
+        if blink:
+            shield_color = (255, 100, 100)
+
+        draw_text(
+            f"ЩИТ: {shield_timer}с",
+            self.window.width - 150, 25,
+            shield_color, 16
+        )
+
+    def draw_hud_best(self, value):
+        """Лучший результат"""
+        best_time, best_scares = value
+        if best_time:
+            draw_text(
+                f"ЛУЧШЕЕ ВРЕМЯ: {best_time}с",
                 self.window.width - 200, 50,
                 (255, 215, 0), 14
             )
 
-        if self.best_scares > 0:
-            arcade.draw_text(
-                f"ЛУЧШИЙ РЕЗУЛЬТАТ: {self.best_scares}/10",
+        if best_scares > 0:
+            draw_text(
+                f"ЛУЧШИЙ РЕЗУЛЬТАТ: {best_scares}/10",
                 self.window.width - 200, 70,
                 (255, 100, 100), 14
             )
 
-        # Время
-        play_time = int(time.time() - self.start_time)
-        arcade.draw_text(
+    def draw_hud_time(self, play_time):
+        """Время"""
+        draw_text(
             f"ВРЕМЯ: {play_time}с",
             self.window.width - 150, self.window.height - 30,
             arcade.color.LIGHT_GRAY, 16
         )
 
-        # Подсказка
+    def draw_hud_hint(self, value):
+        """Подсказка"""
+        hint_step, hint_color, scares_triggered = value
         hints = [
             "ИЩИТЕ КРАСНЫЙ ВЫХОД",
             "СКРИМЕРОВ: 10 ШТУК",
             "СИНИЕ СФЕРЫ - ЩИТЫ",
             "LEVEL 1: ТОЛЬКО СКРИМЕРЫ",
-            f"Найдено скримеров: {self.scares_triggered}/10"
+            f"Найдено скримеров: {scares_triggered}/10"
         ]
 
-        hint_index = (play_time // 10) % len(hints)
-        hint_color = (255, 100, 100) if self.stress > 70 else (255, 200, 100) if self.stress > 50 else (200, 200, 255)
+        hint_index = hint_step % len(hints)
 
-        arcade.draw_text(
+        draw_text(
             hints[hint_index],
             self.window.width // 2, self.window.height - 30,
             hint_color, 22,
@@ -1431,6 +1296,11 @@ class Level1MazeView(arcade.View):
             visible_count = sum(1 for s in self.jumpscares if s.get('visible', False))
             triggered_count = sum(1 for s in self.jumpscares if s['triggered'])
 
+    def on_resize(self, width: int, height: int):
+        """Подстроить камеру мира под новый размер окна"""
+        super().on_resize(width, height)
+        self.world_camera.match_window()
+
     def on_key_release(self, symbol: int, modifiers: int):
         """Отпускание клавиши"""
         if symbol in self.keys_pressed:
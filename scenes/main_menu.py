@@ -1,5 +1,7 @@
 import arcade
 from arcade.gui import UIManager, UILabel, UIAnchorLayout, UIBoxLayout, UIFlatButton
+from sound_manager import preload_sounds_async
+from text_cache import draw_text
 
 
 class MainMenuView(arcade.View):
@@ -8,6 +10,7 @@ class MainMenuView(arcade.View):
     def __init__(self):
         super().__init__()
         self.ui_manager = UIManager()
+        self.sound_loading = None
         self.setup_ui()
 
     def setup_ui(self):
@@ -68,6 +71,9 @@ class MainMenuView(arcade.View):
     def on_show_view(self):
         """При показе"""
         self.ui_manager.enable()
+        # Пока игрок в меню, звуки уровней декодируются в фоне
+        if self.sound_loading is None:
+            self.sound_loading = preload_sounds_async()
 
     def on_hide_view(self):
         """При скрытии"""
@@ -79,7 +85,7 @@ class MainMenuView(arcade.View):
         arcade.set_background_color((0, 0, 0))
 
         # Добавляем атмосферные элементы
-        arcade.draw_text(
+        draw_text(
             "Внимание: игра анализирует ваши реакции мыши и клавиатуры",
             self.window.width // 2,
             100,
@@ -88,6 +94,16 @@ class MainMenuView(arcade.View):
             anchor_x="center"
         )
 
+        if self.sound_loading and not self.sound_loading.done:
+            draw_text(
+                f"Загрузка звуков: {int(self.sound_loading.progress * 100)}%",
+                self.window.width // 2,
+                70,
+                (80, 80, 80),
+                12,
+                anchor_x="center"
+            )
+
         self.ui_manager.draw()
 
     def on_mouse_press(self, x: float, y: float, button: int, modifiers: int):
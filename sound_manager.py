@@ -1,103 +1,279 @@
-import arcade
 import os
 import random
+import re
+from typing import Dict, List, Optional
+
+from audio_registry import AudioRegistry, PreloadBatch, audio_registry, should_stream
+from sound_manifest import SOUND_CATEGORIES, SoundManifest, sound_manifest
+from voice_manager import SoundBed, VoiceManager
+
+
+# Порядок фоновой загрузки по категориям: скримеры и сердцебиение нужны
+# сцене сразу (CRITICAL_PRIORITY), фон и музыка могут подождать
+SOUND_PRIORITIES = {
+    'scream': 0,
+    'heartbeat': 1,
+    'sudden': 2,
+    'monster': 2,
+    'whisper': 3,
+    'footstep': 3,
+    'door': 4,
+    'drip': 4,
+    'ambient': 5,
+    'music': 6,
+}
+DEFAULT_PRIORITY = 5
+
+# Где искать звук по имени: цепочка "category:", "tag:" или "folder:" + значение,
+# берется первое непустое. Имя без цепочки ищется как категория, затем как тег
+# (теги без цифр, поэтому coin1 или upgrade4 находятся только через цепочку).
+# Пустой результат объявленной цепочки - тишина без сообщения "не найден".
+SOUND_FALLBACKS: Dict[str, List[str]] = {
+    'jumpscare': ['folder:jumpscare', 'category:scream'],
+    'sudden': ['category:sudden', 'tag:impact'],
+    'impact': ['tag:impact', 'category:sudden'],
+    'wind': ['tag:wind', 'category:ambient'],
+    # Капли лежат в папке ambient, поэтому категория drip обычно пуста
+    'drip': ['category:drip', 'tag:dripping', 'tag:water'],
+    # Ключ, выход и щит: своих файлов нет, берем похожие
+    'coin1': ['tag:coin', 'tag:chain', 'tag:clang'],
+    'upgrade4': ['tag:upgrade', 'tag:slam', 'category:door'],
+    'shield': ['tag:shield', 'tag:metal', 'tag:clang'],
+    # Щелчок фонарика: только если есть свой файл, лязг на каждое нажатие хуже тишины
+    'flashlight_on': ['tag:flashlight', 'tag:click'],
+    'flashlight_off': ['tag:flashlight', 'tag:click'],
+    # Зацикленные подложки: папка предпочтительнее категории, где есть лишние файлы
+    'heartbeat_bed': ['folder:heartbeat', 'category:heartbeat'],
+    'ambience_bed': ['folder:ambient', 'category:ambient'],
+    'breathing_bed': ['tag:breathing', 'category:monster'],
+}
+
+# Имена, о которых уже сообщили, что звука нет (на весь процесс)
+_reported_missing = set()
+
+
+def sound_tags(name: str) -> List[str]:
+    """Теги звука - слова имени файла без цифр: step_stone1.wav -> step, stone"""
+    stem = os.path.splitext(name)[0].lower()
+    return [word for word in re.split(r'[^a-z]+', stem) if word]
+
+
+class SoundIndex:
+    """Звуки по категориям, тегам и папкам, собранные один раз при загрузке
+
+    resolve() проходит цепочку поиска из SOUND_FALLBACKS и запоминает
+    результат, поэтому выбор звука - один random.choice по готовому списку.
+    """
+
+    def __init__(self, categories=SOUND_CATEGORIES, fallbacks: Dict[str, List[str]] = SOUND_FALLBACKS):
+        self.categories: Dict[str, List[dict]] = {category: [] for category in categories}
+        self.tags: Dict[str, List[dict]] = {}
+        self.folders: Dict[str, List[dict]] = {}
+        self.fallbacks = fallbacks
+        self._resolved: Dict[str, List[dict]] = {}
+
+    def add(self, sound_data: dict, category: str):
+        self.categories.setdefault(category, []).append(sound_data)
+        for tag in set(sound_tags(sound_data['name'])):
+            self.tags.setdefault(tag, []).append(sound_data)
+        folder = os.path.basename(os.path.dirname(sound_data['path']))
+        self.folders.setdefault(folder, []).append(sound_data)
+        self._resolved.clear()
+
+    def lookup(self, kind: str, value: str) -> List[dict]:
+        table = {'category': self.categories, 'tag': self.tags, 'folder': self.folders}.get(kind, {})
+        return table.get(value, [])
+
+    def resolve(self, name: str) -> List[dict]:
+        """Звуки для имени по цепочке поиска (пустой список, если нет)"""
+        sounds = self._resolved.get(name)
+        if sounds is None:
+            chain = self.fallbacks.get(name, [f"category:{name}", f"tag:{name}"])
+            sounds = []
+            for step in chain:
+                kind, _, value = step.partition(':')
+                sounds = self.lookup(kind, value)
+                if sounds:
+                    break
+            self._resolved[name] = sounds
+        return sounds
 
 
 class SoundManager:
-    """Менеджер звуков"""
+    """Менеджер звуков
 
-    def __init__(self, sound_mode="level2"):
+    Список звуков и их категории берутся из манифеста sound_manifest и
+    раскладываются в индекс SoundIndex (категории, теги, папки), а
+    сами звуки - из общего реестра audio_registry: файлы декодируются
+    при первом воспроизведении (или в preload) один раз на весь процесс,
+    поэтому создание сцены ничего не загружает. Звучащие плееры ведет
+    VoiceManager с ограничением голосов на категорию.
+    """
+
+    def __init__(self, sound_mode="level2", registry: AudioRegistry = audio_registry,
+                 manifest: SoundManifest = sound_manifest):
         """
         sound_mode:
         - "level1": ТОЛЬКО скримеры
         - "level2": ВСЕ звуки
         """
-        self.sounds = {}
+        self.index = SoundIndex()
+        self.sounds = self.index.categories
         self.sound_volume = 1.0
         self.sound_mode = sound_mode
+        self.registry = registry
+        self.manifest = manifest
+        self.handles = []
+        self.acquired = False
+        self.loading = None
+        self.voices = VoiceManager()
+        self.beds: Dict[str, SoundBed] = {}
 
         self.load_all_sounds()
 
     def load_custom_sounds(self):
-        """Загрузить кастомные звуки"""
+        """Разложить кастомные звуки по категориям из манифеста (без декодирования)
+
+        Длинные клипы (фон, долгие крики) берутся потоковыми, короткие
+        декодируются в память реестра.
+        """
         custom_folder = "custom_sounds"
 
-        if not os.path.exists(custom_folder):
-            return False
-
-        sound_categories = {
-            'scream': ['scare', 'scream', 'terror', 'demonic', 'distorted', 'quick', 'long'],
-            'ambient': ['ambient', 'creepy', 'wind', 'howl', 'distant', 'echo'],
-            'music': ['music', 'theme', 'panic', 'tension', 'menu'],
-            'monster': ['monster', 'growl', 'breathing', 'moan', 'demon', 'claws'],
-            'footstep': ['step', 'footstep', 'drag', 'quick', 'stone', 'wood'],
-            'heartbeat': ['heartbeat', 'pulse', 'slow', 'fast', 'panic'],
-            'door': ['door', 'creak', 'slam'],
-            'whisper': ['whisper', 'nonsense'],
-            'drip': ['drip', 'water', 'book', 'drop'],
-            'sudden': ['sudden', 'impact', 'glass', 'metal', 'break', 'clang', 'chain']
-        }
-
-        for category in sound_categories.keys():
-            self.sounds[category] = []
-
-        total_files = 0
-
-        for root, dirs, files in os.walk(custom_folder):
-            for file in files:
-                file_lower = file.lower()
-
-                if not file_lower.endswith(('.wav', '.ogg', '.mp3')):
-                    continue
-
-                file_path = os.path.join(root, file)
-                file_assigned = False
-
-                for category, keywords in sound_categories.items():
-                    for keyword in keywords:
-                        if keyword in file_lower:
-                            try:
-                                sound = arcade.load_sound(file_path)
-                                self.sounds[category].append({
-                                    'sound': sound,
-                                    'path': file_path,
-                                    'name': file
-                                })
-                                total_files += 1
-                                file_assigned = True
-                                break
-                            except:
-                                file_assigned = True
-                                break
-                    if file_assigned:
-                        break
-
-        return total_files > 0
+        for entry in self.manifest.sounds(custom_folder):
+            category = entry['category']
+            if category not in self.sounds:
+                continue
+            streaming = should_stream(entry['duration'], entry['size'])
+            handle = self.registry.acquire(entry['path'], streaming, group=category)
+            self.handles.append(handle)
+            self.index.add({
+                'handle': handle,
+                'path': entry['path'],
+                'name': entry['name'],
+                'category': category,
+                'duration': entry['duration']
+            }, category)
+
+        self.acquired = True
+        return len(self.handles) > 0
 
     def load_all_sounds(self):
         """Загрузить все звуки"""
         self.load_custom_sounds()
 
+    def playable_categories(self):
+        """Категории, которые звучат в текущем режиме"""
+        if self.sound_mode == "level1":
+            return ['scream']
+        return list(self.sounds.keys())
+
+    def preload(self):
+        """Декодировать заранее звуки, которые могут прозвучать в режиме"""
+        for category in self.playable_categories():
+            self.registry.preload(sound_data['handle'] for sound_data in self.sounds.get(category, []))
+
+    def preload_async(self) -> PreloadBatch:
+        """Декодировать звуки режима в фоне, сначала критичные"""
+        handles = []
+        for category in self.playable_categories():
+            priority = SOUND_PRIORITIES.get(category, DEFAULT_PRIORITY)
+            handles.extend((sound_data['handle'], priority) for sound_data in self.sounds.get(category, []))
+        self.loading = self.registry.preload_async(handles)
+        return self.loading
+
+    def acquire(self):
+        """Снова взять ссылки на звуки (сцена вернулась на экран)"""
+        if not self.acquired:
+            for handle in self.handles:
+                self.registry.acquire(handle.path, handle.streaming, handle.group)
+            self.acquired = True
+
+    def release(self):
+        """Отдать ссылки на звуки реестру (сцена ушла с экрана)"""
+        for bed in self.beds.values():
+            bed.stop()
+        if self.acquired:
+            for handle in self.handles:
+                self.registry.release(handle)
+            self.acquired = False
+
+    def has_sound(self, name: str) -> bool:
+        return bool(self.index.resolve(name))
+
+    def choose(self, name: str) -> Optional[dict]:
+        """Случайный готовый звук по имени (категория, тег или цепочка из SOUND_FALLBACKS)"""
+        sounds = self.index.resolve(name)
+        if not sounds:
+            if name not in _reported_missing and name not in self.index.fallbacks:
+                _reported_missing.add(name)
+                print(f"Звук '{name}' не найден")
+            return None
+
+        sound_data = random.choice(sounds)
+        if sound_data['handle'].pending:
+            # Звуки, которые еще декодируются в фоне, пропускаем
+            available = [other for other in sounds if not other['handle'].pending]
+            if not available:
+                return None
+            sound_data = random.choice(available)
+        return sound_data
+
     def play_sound(self, sound_type: str, volume: float = 1.0):
         """Воспроизвести звук"""
+        return self.play_voice(sound_type, volume) is not None
+
+    def play_voice(self, sound_type: str, volume: float = 1.0):
+        """Воспроизвести звук и вернуть его плеер (None, если не зазвучал)"""
         # LEVEL 1: только скримеры
         if self.sound_mode == "level1" and sound_type != 'scream':
-            return False
+            return None
+
+        sound_data = self.choose(sound_type)
+        if sound_data is None:
+            return None
 
-        if sound_type not in self.sounds:
-            return False
+        return self._play_data(sound_data, volume)
 
-        if not self.sounds[sound_type]:
-            return False
+    def play_sound_data(self, sound_data: dict, volume: float = 1.0):
+        """Воспроизвести выбранный звук через менеджер голосов его категории"""
+        return self._play_data(sound_data, volume) is not None
 
+    def _play_data(self, sound_data: dict, volume: float):
         try:
-            sound_data = random.choice(self.sounds[sound_type])
             final_volume = self.sound_volume * volume
-            sound_data['sound'].play(volume=final_volume)
-            return True
+            return self.voices.play(sound_data['category'], sound_data['handle'], final_volume)
         except:
-            return False
+            return None
+
+    def update_bed(self, name: str, volume: float, rate: float = 1.0, delta_time: float = 0.0):
+        """Задать громкость и темп зацикленной подложки name (звук ищется по "<name>_bed")"""
+        if self.sound_mode == "level1":
+            return
+
+        bed = self.beds.get(name)
+        if bed is not None and bed.handle.failed:
+            # Файл не декодировался - выберем другой
+            del self.beds[name]
+            bed = None
+        if bed is None:
+            if volume <= 0:
+                return
+            sounds = [sound_data for sound_data in self.index.resolve(f"{name}_bed")
+                      if not sound_data['handle'].failed]
+            if not sounds:
+                return
+            bed = SoundBed(random.choice(sounds)['handle'])
+            self.beds[name] = bed
+        bed.update(volume * self.sound_volume, rate, delta_time)
 
     def set_volume(self, volume: float):
         """Установить громкость"""
-        self.sound_volume = max(0.0, min(1.0, volume))
\ No newline at end of file
+        self.sound_volume = max(0.0, min(1.0, volume))
+
+
+def preload_sounds_async(sound_mode: str = "level2") -> PreloadBatch:
+    """Начать фоновую загрузку звуков режима заранее (например, из меню)"""
+    manager = SoundManager(sound_mode)
+    loading = manager.preload_async()
+    manager.release()
+    return loading
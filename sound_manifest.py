@@ -0,0 +1,210 @@
+import json
+import os
+import re
+import wave
+from typing import Dict, List, Optional, Tuple
+
+from audio_registry import AUDIO_EXTENSIONS
+
+
+# Категории звуков и ключевые слова в именах файлов (порядок важен: побеждает первая)
+SOUND_CATEGORIES: Dict[str, List[str]] = {
+    'scream': ['scare', 'scream', 'terror', 'demonic', 'distorted', 'quick', 'long'],
+    'ambient': ['ambient', 'creepy', 'wind', 'howl', 'distant', 'echo'],
+    'music': ['music', 'theme', 'panic', 'tension', 'menu'],
+    'monster': ['monster', 'growl', 'breathing', 'moan', 'demon', 'claws'],
+    'footstep': ['step', 'footstep', 'drag', 'quick', 'stone', 'wood'],
+    'heartbeat': ['heartbeat', 'pulse', 'slow', 'fast', 'panic'],
+    'door': ['door', 'creak', 'slam'],
+    'whisper': ['whisper', 'nonsense'],
+    'drip': ['drip', 'water', 'book', 'drop'],
+    'sudden': ['sudden', 'impact', 'glass', 'metal', 'break', 'clang', 'chain']
+}
+
+# Папки custom_sounds/<папка>/, имя которых не совпадает с категорией
+FOLDER_CATEGORIES: Dict[str, str] = {
+    'footsteps': 'footstep',
+    'jumpscare': 'scream',
+}
+
+MANIFEST_VERSION = 2
+
+
+class CategoryMatcher:
+    """Категория звука по папке и имени файла
+
+    Файл в папке категории (custom_sounds/door/...) относится к ней, что бы
+    ни было в имени: door_creak_fast.wav - это дверь, а не сердцебиение.
+    Ключевые слова нужны только для файлов вне таких папок. Они собраны в
+    одно регулярное выражение на категорию; категории проверяются по
+    порядку и побеждает первая совпавшая, поэтому неоднозначные слова
+    ("quick", "panic", "slow") относят файл к более ранней категории;
+    matches() показывает все подходящие.
+    """
+
+    def __init__(self, categories: Dict[str, List[str]] = SOUND_CATEGORIES,
+                 folders: Dict[str, str] = FOLDER_CATEGORIES):
+        self.categories = list(categories)
+        self.keywords = {category: list(keywords) for category, keywords in categories.items()}
+        self.folders = dict(folders)
+        self._patterns: List[Tuple[str, re.Pattern]] = [
+            (category, re.compile('|'.join(re.escape(keyword.lower()) for keyword in keywords)))
+            for category, keywords in categories.items() if keywords
+        ]
+
+    def folder_category(self, folder: Optional[str]) -> Optional[str]:
+        """Категория папки (имя категории или псевдоним из FOLDER_CATEGORIES) или None"""
+        if not folder:
+            return None
+        name = folder.lower()
+        if name in self.folders:
+            return self.folders[name]
+        return name if name in self.keywords else None
+
+    def classify(self, filename: str, folder: Optional[str] = None) -> Optional[str]:
+        """Категория папки folder, иначе первая подходящая по имени, иначе None"""
+        category = self.folder_category(folder)
+        if category is not None:
+            return category
+
+        name = filename.lower()
+        for category, pattern in self._patterns:
+            if pattern.search(name):
+                return category
+        return None
+
+    def matches(self, filename: str) -> List[str]:
+        """Все подходящие по имени категории по порядку"""
+        name = filename.lower()
+        return [category for category, pattern in self._patterns if pattern.search(name)]
+
+
+def probe_audio(path: str) -> Dict[str, Optional[float]]:
+    """Длительность, частота и число каналов по заголовку файла (без декодирования)"""
+    info = {'duration': None, 'sample_rate': None, 'channels': None}
+    try:
+        with wave.open(path, 'rb') as f:
+            rate = f.getframerate()
+            info['sample_rate'] = rate
+            info['channels'] = f.getnchannels()
+            info['duration'] = f.getnframes() / rate if rate else None
+        return info
+    except (wave.Error, EOFError, OSError):
+        pass
+
+    # Не WAV - спрашиваем потоковый декодер pyglet, он читает только заголовок
+    try:
+        from pyglet import media
+        source = media.load(path, streaming=True)
+        audio_format = source.audio_format
+        info['duration'] = source.duration
+        if audio_format:
+            info['sample_rate'] = audio_format.sample_rate
+            info['channels'] = audio_format.channels
+        source.delete()
+    except Exception:
+        pass
+    return info
+
+
+class SoundManifest:
+    """Индекс звуковых файлов на диске
+
+    Хранит путь, категорию, длительность, частоту, каналы, размер и время
+    изменения каждого файла. Строится один раз обходом папки, а при
+    следующих запусках проверяется только по времени изменения папок:
+    добавление, удаление или переименование файла меняет mtime его папки.
+    """
+
+    def __init__(self, path: Optional[str] = 'data/sound_manifest.json',
+                 matcher: Optional[CategoryMatcher] = None):
+        self.path = path
+        self.matcher = matcher or CategoryMatcher()
+        self._sounds: Dict[str, List[dict]] = {}
+
+    def sounds(self, folder: str) -> List[dict]:
+        """Записи о звуках папки (из манифеста или после пересборки)"""
+        key = os.path.normpath(folder)
+        sounds = self._sounds.get(key)
+        if sounds is None:
+            data = self._load()
+            if data is None or not self._is_valid(data, key):
+                data = self.build(folder)
+                self._save(data)
+            sounds = data['sounds']
+            self._sounds[key] = sounds
+        return sounds
+
+    def build(self, folder: str) -> dict:
+        """Обойти папку и составить манифест"""
+        directories = {}
+        sounds = []
+        if os.path.isdir(folder):
+            for root, dirs, files in os.walk(folder):
+                dirs.sort()
+                directories[os.path.normpath(root)] = os.stat(root).st_mtime
+                # Категорию задает папка первого уровня: custom_sounds/<категория>/...
+                relative = os.path.relpath(root, folder)
+                category_folder = None if relative == os.curdir else relative.split(os.sep)[0]
+                for file in sorted(files):
+                    if not file.lower().endswith(AUDIO_EXTENSIONS):
+                        continue
+                    path = os.path.join(root, file)
+                    stat = os.stat(path)
+                    entry = {
+                        'path': path,
+                        'name': file,
+                        'category': self.matcher.classify(file, category_folder),
+                        'size': stat.st_size,
+                        'mtime': stat.st_mtime
+                    }
+                    entry.update(probe_audio(path))
+                    sounds.append(entry)
+
+        return {
+            'version': MANIFEST_VERSION,
+            'folder': os.path.normpath(folder),
+            'categories': self.matcher.keywords,
+            'folders': self.matcher.folders,
+            'directories': directories,
+            'sounds': sounds
+        }
+
+    def _is_valid(self, data: dict, folder: str) -> bool:
+        """Манифест той же версии и папки, и ни одна папка не менялась"""
+        if data.get('version') != MANIFEST_VERSION or data.get('folder') != folder:
+            return False
+        if data.get('categories') != self.matcher.keywords or data.get('folders') != self.matcher.folders:
+            return False
+        directories = data.get('directories') or {}
+        if not directories:
+            return not os.path.isdir(folder)
+        for directory, mtime in directories.items():
+            try:
+                if os.stat(directory).st_mtime != mtime:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def _load(self) -> Optional[dict]:
+        if not self.path or not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, data: dict):
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+        except OSError as e:
+            print(f"Не удалось сохранить манифест звуков: {e}")
+
+
+sound_manifest = SoundManifest()
@@ -0,0 +1,115 @@
+import math
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from pyglet import media
+
+from maze_helper import distance_window
+
+
+# Слышимость: дальше HEARING_STEPS шагов по проходам источник не слышен,
+# на REFERENCE_DISTANCE клеток громкость падает вдвое
+HEARING_STEPS = 14
+REFERENCE_DISTANCE = 4.0
+MIN_AUDIBLE = 0.05
+
+# Громкость и панорама пересчитываются с этой частотой, а не на каждый звук
+SPATIAL_UPDATE_RATE = 10.0
+
+
+def attenuation(distances: np.ndarray) -> np.ndarray:
+    """Затухание по расстоянию в клетках (отрицательное - не слышно)"""
+    gains = 1.0 / (1.0 + (np.maximum(distances, 0.0) / REFERENCE_DISTANCE) ** 2)
+    return np.where(distances >= 0, gains, 0.0)
+
+
+def stereo_pan(dx: np.ndarray, dy: np.ndarray, angle: float) -> np.ndarray:
+    """Панорама -1 (слева) .. 1 (справа) относительно направления взгляда"""
+    return np.sin(np.arctan2(dy, dx) - angle)
+
+
+def apply_spatial(player: media.Player, volume: float, pan: float):
+    """Громкость и панорама плеера (панорама - позицией, как в arcade.Sound.play)"""
+    player.volume = volume
+    player.position = (pan, 0.0, math.sqrt(max(0.0, 1.0 - pan * pan)))
+
+
+class SpatialAudio:
+    """Пространственный звук источников на карте (монстров)
+
+    Раз в 1 / update_rate секунды для всех источников сразу считается
+    громкость - по пути через лабиринт от игрока (distance_window), так что
+    звук огибает углы и глохнет за стенами, - и панорама по углу к
+    направлению взгляда. Привязанные к источникам плееры обновляются
+    с той же частотой.
+    """
+
+    def __init__(self, update_rate: float = SPATIAL_UPDATE_RATE):
+        self.interval = 1.0 / update_rate
+        self.timer = self.interval
+        self.emitters: List[object] = []
+        self.gains = np.zeros(0)
+        self.pans = np.zeros(0)
+        self._index: Dict[int, int] = {}
+        self._voices: List[Tuple[object, media.Player, object, float]] = []
+
+    def update(self, delta_time: float, grid, x: float, y: float, angle: float,
+               emitters: Sequence[object]) -> bool:
+        """Пересчитать источники, если подошло время; True - пересчитали"""
+        self.timer += delta_time
+        if self.timer < self.interval:
+            return False
+        self.timer = 0.0
+
+        self.emitters = list(emitters)
+        self._index = {id(emitter): i for i, emitter in enumerate(self.emitters)}
+        self._compute(grid, x, y, angle)
+        self._apply()
+        return True
+
+    def gain(self, emitter) -> float:
+        index = self._index.get(id(emitter))
+        return float(self.gains[index]) if index is not None else 0.0
+
+    def pan(self, emitter) -> float:
+        index = self._index.get(id(emitter))
+        return float(self.pans[index]) if index is not None else 0.0
+
+    def attach(self, emitter, player: media.Player, volume: float):
+        """Привязать звучащий плеер к источнику"""
+        self._voices.append((emitter, player, player.source, volume))
+        apply_spatial(player, volume * self.gain(emitter), self.pan(emitter))
+
+    def _compute(self, grid, x: float, y: float, angle: float):
+        if not self.emitters:
+            self.gains = np.zeros(0)
+            self.pans = np.zeros(0)
+            return
+
+        xs = np.array([emitter.x for emitter in self.emitters], dtype=np.float64)
+        ys = np.array([emitter.y for emitter in self.emitters], dtype=np.float64)
+
+        steps_map, row_start = distance_window(grid, (int(x), int(y)), HEARING_STEPS)
+        cell_x = xs.astype(np.int64)
+        cell_y = ys.astype(np.int64) - row_start
+        height, width = steps_map.shape
+        inside = (cell_x >= 0) & (cell_x < width) & (cell_y >= 0) & (cell_y < height)
+        steps = np.full(len(xs), -1, dtype=np.int32)
+        steps[inside] = steps_map[cell_y[inside], cell_x[inside]]
+
+        dx, dy = xs - x, ys - y
+        # Путь по проходам не короче прямой; прямая сглаживает шаги по клеткам
+        distances = np.where(steps >= 0, np.maximum(np.hypot(dx, dy), steps), -1.0)
+        self.gains = attenuation(distances)
+        self.pans = stereo_pan(dx, dy, angle)
+
+    def _apply(self):
+        """Обновить привязанные плееры, забыть закончившиеся"""
+        alive = []
+        for emitter, player, source, volume in self._voices:
+            # Плеер закончил звук или отдан другому звуку менеджером голосов
+            if player.source is None or player.source is not source:
+                continue
+            apply_spatial(player, volume * self.gain(emitter), self.pan(emitter))
+            alive.append((emitter, player, source, volume))
+        self._voices = alive
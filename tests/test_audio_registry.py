@@ -0,0 +1,63 @@
+import os
+import time
+
+os.environ.setdefault("ARCADE_HEADLESS", "1")
+
+import pyglet
+
+pyglet.options.headless = True
+pyglet.options.audio = ("silent",)
+
+import arcade  # noqa: F401  (arcade настраивает pyglet до импорта media)
+from pyglet.media.codecs.base import AudioFormat
+
+import audio_registry
+from audio_pack import PackedSound, _PackedSource
+from audio_registry import AudioLoader, AudioRegistry, resident_size
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOUND_A = os.path.join(ROOT, 'custom_sounds', 'door', 'door_creak_fast.wav')
+SOUND_B = os.path.join(ROOT, 'custom_sounds', 'door', 'door_creak_slow.wav')
+
+
+def test_loader_survives_stale_entry_of_evicted_sound():
+    registry = AudioRegistry(budget=1)
+    registry.loader = AudioLoader(workers=1)
+    a = registry.acquire(SOUND_A)
+    b = registry.acquire(SOUND_B)
+
+    # Единственный поток ждет замок A, пока в очереди копятся записи:
+    # A (в работе), B, затем повторный запрос A
+    with a._lock:
+        first = registry.loader.submit(a, 0)
+        registry.loader.submit(b, 1)
+        registry.loader.submit(a, 2)
+    deadline = time.time() + 5
+    while registry.loader._queue.unfinished_tasks and time.time() < deadline:
+        time.sleep(0.01)
+
+    # B вытеснил A из бюджета, и старая запись A досталась потоку без future
+    assert first.result(timeout=5) is a
+    assert not a.loaded and a.future is None
+    assert all(thread.is_alive() for thread in registry.loader._threads)
+    assert registry.loader.submit(a, 0).result(timeout=5) is a
+
+
+def test_packed_sounds_do_not_use_budget(monkeypatch):
+    def packed_only_a(path):
+        if path != SOUND_A:
+            return None
+        return PackedSound(path, _PackedSource(memoryview(bytes(88200)), AudioFormat(1, 16, 44100)))
+
+    monkeypatch.setattr(audio_registry.audio_pack, 'sound', packed_only_a)
+    registry = AudioRegistry(budget=1)
+    a = registry.acquire(SOUND_A)
+    b = registry.acquire(SOUND_B)
+
+    assert isinstance(a.sound, PackedSound)
+    assert resident_size(a.sound) == 0 and registry.resident_bytes == 0
+
+    # Декодированный в кучу B превышает бюджет, но A вытеснять бессмысленно
+    assert b.sound is not None
+    assert registry.resident_bytes == b.size > 0
+    assert a.loaded and registry.evicted == 0
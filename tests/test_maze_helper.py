@@ -0,0 +1,51 @@
+import random
+
+import numpy as np
+import pytest
+
+from maze_helper import WALL, ChunkedMazeGrid, LightMap, MazeGenerator, MazeGrid, distance_field
+
+
+def passable(grid) -> np.ndarray:
+    return np.frombuffer(bytes(grid.cells), dtype=np.uint8).reshape(grid.height, grid.width) != WALL
+
+
+@pytest.mark.parametrize("algorithm", MazeGenerator.available_algorithms())
+@pytest.mark.parametrize("width, height", [(15, 15), (31, 21), (9, 41)])
+@pytest.mark.parametrize("seed", [0, 1, 7])
+def test_algorithm_builds_connected_perfect_maze(algorithm, width, height, seed):
+    grid = MazeGenerator.generate(width, height, algorithm, seed=seed)
+    open_cells = passable(grid)
+
+    # Все комнаты открыты и достижимы из угла
+    assert open_cells[1::2, 1::2].all()
+    assert ((distance_field(grid, (1, 1)) >= 0) == open_cells).all()
+
+    # Идеальный лабиринт - дерево: проходов между комнатами на один меньше, чем комнат
+    rooms = ((width - 1) // 2) * ((height - 1) // 2)
+    assert int(open_cells.sum()) == 2 * rooms - 1
+
+
+@pytest.mark.parametrize("algorithm", MazeGenerator.available_algorithms())
+def test_braid_keeps_maze_connected(algorithm):
+    grid = MazeGenerator.generate(31, 31, algorithm, seed=3)
+    MazeGenerator.braid(grid, random.Random(3))
+    assert ((distance_field(grid, (1, 1)) >= 0) == passable(grid)).all()
+
+
+def test_chunked_light_map_matches_full_bake():
+    grid = ChunkedMazeGrid(31, seed=5, keep_behind=100)
+    chunked = LightMap(grid.width, seed=5)
+    chunked.bake(grid, 0, grid.height)
+    for y in range(1, 96, 4):
+        for row_start, row_end in grid.ensure_around(y):
+            chunked.bake(grid, row_start, row_end)
+
+    # Та же сетка целиком и те же лампы, запеченные за один проход
+    full = MazeGrid.from_bytes(grid.width, grid.height, b''.join(bytes(grid[y]) for y in range(grid.height)))
+    reference = LightMap(grid.width, grid.height)
+    reference.lights = list(chunked.lights)
+    reference.relight(full, 0, full.height)
+
+    assert len(chunked.lights) > 0
+    np.testing.assert_allclose(chunked.values, reference.values, atol=1e-6)
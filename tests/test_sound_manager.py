@@ -0,0 +1,40 @@
+import os
+
+os.environ.setdefault("ARCADE_HEADLESS", "1")
+
+import pyglet
+
+pyglet.options.headless = True
+pyglet.options.audio = ("silent",)
+
+import arcade  # noqa: F401  (arcade настраивает pyglet до импорта media)
+import pytest
+
+from sound_manager import SoundIndex
+from sound_manifest import SoundManifest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="module")
+def index():
+    """Индекс по звукам из custom_sounds без загрузки файлов"""
+    index = SoundIndex()
+    for entry in SoundManifest(path=None).build(os.path.join(ROOT, 'custom_sounds'))['sounds']:
+        if entry['category']:
+            index.add(dict(entry, handle=None), entry['category'])
+    return index
+
+
+@pytest.mark.parametrize("name", [
+    'scream', 'sudden', 'monster', 'whisper', 'footstep', 'drip',
+    'jumpscare', 'impact', 'wind', 'coin1', 'upgrade4', 'shield',
+    'heartbeat_bed', 'ambience_bed', 'breathing_bed',
+])
+def test_played_names_resolve(index, name):
+    assert index.resolve(name)
+
+
+@pytest.mark.parametrize("name", ['flashlight_on', 'flashlight_off'])
+def test_optional_names_are_declared(index, name):
+    assert name in index.fallbacks
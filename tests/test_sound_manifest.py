@@ -0,0 +1,50 @@
+import os
+
+os.environ.setdefault("ARCADE_HEADLESS", "1")
+
+import pyglet
+
+pyglet.options.headless = True
+pyglet.options.audio = ("silent",)
+
+import arcade  # noqa: F401  (arcade настраивает pyglet до импорта media)
+import pytest
+
+from sound_manifest import CategoryMatcher, SoundManifest
+
+
+@pytest.mark.parametrize("folder, filename, category", [
+    ('heartbeat', 'heartbeat_panic.wav', 'heartbeat'),
+    ('footsteps', 'step_quick.wav', 'footstep'),
+    ('door', 'door_creak_fast.wav', 'door'),
+    ('door', 'door_creak_slow.wav', 'door'),
+    ('jumpscare', 'sudden_impact.wav', 'scream'),
+    ('sudden', 'door_slam.wav', 'sudden'),
+    ('Music', 'anything.ogg', 'music'),
+])
+def test_folder_decides_category(folder, filename, category):
+    assert CategoryMatcher().classify(filename, folder) == category
+
+
+@pytest.mark.parametrize("folder", [None, '', 'misc'])
+def test_loose_files_fall_back_to_keywords(folder):
+    matcher = CategoryMatcher()
+    assert matcher.classify('door_slam.wav', folder) == 'door'
+    assert matcher.classify('growl_deep.wav', folder) == 'monster'
+    assert matcher.classify('silence.wav', folder) is None
+
+
+def test_manifest_uses_top_level_folder(tmp_path):
+    for relative in ('heartbeat/heartbeat_panic.wav', 'door/old/door_creak_slow.wav', 'step_quick.wav'):
+        path = tmp_path / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b'')
+
+    sounds = SoundManifest(path=None).build(str(tmp_path))['sounds']
+    categories = {entry['name']: entry['category'] for entry in sounds}
+
+    assert categories == {
+        'heartbeat_panic.wav': 'heartbeat',
+        'door_creak_slow.wav': 'door',
+        'step_quick.wav': 'scream',
+    }
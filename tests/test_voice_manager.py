@@ -0,0 +1,81 @@
+import os
+from types import SimpleNamespace
+
+os.environ.setdefault("ARCADE_HEADLESS", "1")
+
+import pyglet
+
+pyglet.options.headless = True
+pyglet.options.audio = ("silent",)
+
+import arcade  # noqa: F401  (arcade настраивает pyglet до импорта media)
+from pyglet.media.codecs.base import StaticSource
+from pyglet.media.synthesis import Silence
+
+from spatial_audio import apply_spatial
+from voice_manager import VoiceManager
+
+
+def make_handle():
+    """Готовая к воспроизведению ссылка на короткую тишину"""
+    return SimpleNamespace(pending=False, sound=SimpleNamespace(source=StaticSource(Silence(0.5))))
+
+
+def test_recycled_player_is_centred():
+    voices = VoiceManager(limits={'monster': (1, 'oldest'), 'footstep': (1, 'oldest')}, max_voices=1)
+
+    monster = voices.play('monster', make_handle(), volume=0.8)
+    apply_spatial(monster, 0.8, 0.9)
+    monster.pitch = 1.3
+
+    # Общий предел - один голос: шаг забирает плеер монстра
+    footstep = voices.play('footstep', make_handle(), volume=0.8)
+
+    assert footstep is monster
+    assert tuple(footstep.position) == (0.0, 0.0, 1.0)
+    assert footstep.pitch == 1.0
+
+
+def test_category_cap_drops_quieter_sound():
+    voices = VoiceManager(limits={'whisper': (2, 'quietest')})
+
+    assert voices.play('whisper', make_handle(), volume=0.5) is not None
+    assert voices.play('whisper', make_handle(), volume=0.6) is not None
+    # Категория заполнена, а новый звук тише всех звучащих
+    assert voices.play('whisper', make_handle(), volume=0.2) is None
+    assert voices.active_count('whisper') == 2
+
+
+def test_oldest_voice_is_stolen():
+    voices = VoiceManager(limits={'footstep': (2, 'oldest')})
+
+    first = voices.play('footstep', make_handle())
+    second = voices.play('footstep', make_handle())
+    third = voices.play('footstep', make_handle())
+
+    assert third is first
+    assert voices.active_count('footstep') == 2
+    assert {voice.player for voice in voices.voices} == {second, third}
+
+
+def test_quietest_voice_is_stolen():
+    voices = VoiceManager(limits={'monster': (2, 'quietest')})
+
+    quiet = voices.play('monster', make_handle(), volume=0.3)
+    loud = voices.play('monster', make_handle(), volume=0.9)
+    louder = voices.play('monster', make_handle(), volume=0.5)
+
+    assert louder is quiet
+    assert sorted(voice.volume for voice in voices.voices) == [0.5, 0.9]
+    assert loud in {voice.player for voice in voices.voices}
+
+
+def test_global_voice_limit():
+    voices = VoiceManager(limits={'drip': (4, 'oldest'), 'door': (4, 'oldest')}, max_voices=3)
+
+    for volume in (0.4, 0.5, 0.6):
+        voices.play('drip', make_handle(), volume=volume)
+    assert voices.play('door', make_handle(), volume=0.3) is None
+    assert voices.play('door', make_handle(), volume=0.7) is not None
+    assert voices.active_count() == 3
+    assert voices.active_count('drip') == 2
@@ -0,0 +1,75 @@
+from collections import OrderedDict
+
+import arcade
+from arcade.types import Color
+
+
+DEFAULT_FONT = ('calibri', 'arial')
+
+
+class TextCache:
+    """LRU-кэш объектов arcade.Text
+
+    Раскладка глифов строится один раз на строку и стиль. Позиция и цвет
+    меняются на готовом объекте, а редко используемые динамические строки
+    (таймеры, счетчики) вытесняются при переполнении.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.labels = OrderedDict()
+        self.max_entries = max_entries
+        self.misses = 0
+
+    def get(self, text, font_size=12.0, font_name=DEFAULT_FONT, bold=False, italic=False,
+            anchor_x='left', anchor_y='baseline', width=None, align='left',
+            multiline=False, rotation=0) -> arcade.Text:
+        """Получить готовый объект текста для строки и стиля"""
+        text = str(text)
+        key = (text, font_name, font_size, bold, italic, anchor_x, anchor_y, width, align, multiline, rotation)
+
+        label = self.labels.get(key)
+        if label is not None:
+            self.labels.move_to_end(key)
+            return label
+
+        self.misses += 1
+        label = arcade.Text(
+            text, 0, 0,
+            font_size=font_size,
+            font_name=font_name,
+            bold=bold,
+            italic=italic,
+            anchor_x=anchor_x,
+            anchor_y=anchor_y,
+            width=width,
+            align=align,
+            multiline=multiline,
+            rotation=rotation
+        )
+        self.labels[key] = label
+        if len(self.labels) > self.max_entries:
+            self.labels.popitem(last=False)
+        return label
+
+    def draw(self, text, x, y, color=arcade.color.WHITE, font_size=12.0, **style):
+        """Нарисовать строку, как arcade.draw_text, но без повторной раскладки"""
+        label = self.get(text, font_size, **style)
+        color = Color.from_iterable(color)
+
+        if label.x != x or label.y != y:
+            label.position = x, y
+        if label.color != color:
+            label.color = color
+
+        label.draw()
+
+    def clear(self):
+        self.labels.clear()
+
+
+text_cache = TextCache()
+
+
+def draw_text(text, x, y, color=arcade.color.WHITE, font_size=12.0, **style):
+    """Замена arcade.draw_text с кэшем раскладки"""
+    text_cache.draw(text, x, y, color, font_size, **style)
@@ -0,0 +1,203 @@
+import time
+from typing import Dict, List, Optional, Tuple
+
+from pyglet import media
+
+from audio_registry import AudioHandle
+
+
+# Сколько звуков категории может звучать одновременно и кого вытеснять:
+# 'oldest' - самый давний голос, 'quietest' - самый тихий (если новый звук
+# тише всех звучащих, он просто не играет)
+VOICE_LIMITS: Dict[str, Tuple[int, str]] = {
+    'heartbeat': (1, 'oldest'),
+    'footstep': (2, 'oldest'),
+    'scream': (2, 'quietest'),
+    'sudden': (2, 'quietest'),
+    'monster': (2, 'quietest'),
+    'whisper': (2, 'quietest'),
+    'ambient': (2, 'oldest'),
+    'drip': (1, 'oldest'),
+    'door': (1, 'oldest'),
+    'music': (1, 'oldest'),
+}
+DEFAULT_VOICE_LIMIT = (2, 'quietest')
+
+# Общий предел голосов и запас свободных плееров для повторного использования
+MAX_VOICES = 10
+MAX_IDLE_PLAYERS = 6
+
+
+class Voice:
+    """Звучащий звук: плеер, категория, громкость и время запуска"""
+
+    def __init__(self, player: media.Player, category: str, volume: float):
+        self.player = player
+        self.category = category
+        self.volume = volume
+        self.started = time.time()
+
+    @property
+    def finished(self) -> bool:
+        return self.player.source is None
+
+
+class VoiceManager:
+    """Живые плееры по категориям с ограничением полифонии
+
+    Перед запуском звука закончившиеся голоса возвращаются в запас плееров.
+    Если категория (или весь микшер) заполнена, вытесняется самый давний
+    или самый тихий голос, и его плеер переиспользуется, поэтому в самый
+    напряженный момент число одновременно декодируемых звуков ограничено.
+    """
+
+    def __init__(self, limits: Dict[str, Tuple[int, str]] = VOICE_LIMITS, max_voices: int = MAX_VOICES):
+        self.limits = limits
+        self.max_voices = max_voices
+        self.voices: List[Voice] = []
+        self._idle: List[media.Player] = []
+
+    def play(self, category: str, handle: AudioHandle, volume: float = 1.0,
+             loop: bool = False) -> Optional[media.Player]:
+        """Запустить звук в категории, вернуть плеер (или None, если звук не играет)"""
+        if handle.pending:
+            return None
+        sound = handle.sound
+        if sound is None:
+            return None
+
+        self._reap()
+        limit, policy = self.limits.get(category, DEFAULT_VOICE_LIMIT)
+        if limit <= 0:
+            return None
+
+        player = None
+        same = [voice for voice in self.voices if voice.category == category]
+        if len(same) >= limit:
+            victim = self._victim(same, policy, volume)
+            if victim is None:
+                return None
+            player = self._steal(victim)
+
+        if player is None and len(self.voices) >= self.max_voices:
+            victim = self._victim(self.voices, 'quietest', volume)
+            if victim is None:
+                return None
+            player = self._steal(victim)
+
+        if player is None:
+            player = self._idle.pop() if self._idle else media.Player()
+
+        player.volume = volume
+        player.loop = loop
+        player.queue(sound.source)
+        player.play()
+        self.voices.append(Voice(player, category, volume))
+        return player
+
+    def active_count(self, category: Optional[str] = None) -> int:
+        self._reap()
+        if category is None:
+            return len(self.voices)
+        return sum(1 for voice in self.voices if voice.category == category)
+
+    def stop_all(self):
+        for voice in self.voices:
+            self._recycle(voice.player)
+        self.voices = []
+
+    def _victim(self, voices: List[Voice], policy: str, volume: float) -> Optional[Voice]:
+        """Голос, который уступит место новому"""
+        if policy == 'quietest':
+            quietest = min(voices, key=lambda voice: voice.volume)
+            return quietest if quietest.volume <= volume else None
+        return min(voices, key=lambda voice: voice.started)
+
+    def _steal(self, victim: Voice) -> media.Player:
+        self.voices.remove(victim)
+        self._clear(victim.player)
+        return victim.player
+
+    def _reap(self):
+        """Вернуть плееры закончившихся голосов в запас"""
+        finished = [voice for voice in self.voices if voice.finished]
+        if finished:
+            self.voices = [voice for voice in self.voices if not voice.finished]
+            for voice in finished:
+                self._recycle(voice.player)
+
+    def _recycle(self, player: media.Player):
+        self._clear(player)
+        if len(self._idle) < MAX_IDLE_PLAYERS:
+            self._idle.append(player)
+        else:
+            player.delete()
+
+    @staticmethod
+    def _clear(player: media.Player):
+        """Остановить плеер, убрать его очередь и сбросить панораму и темп"""
+        player.pause()
+        while player.source is not None:
+            player.next_source()
+        # Плеер уйдет другому звуку: панорама монстра не должна к нему перейти
+        player.position = (0.0, 0.0, 1.0)
+        player.pitch = 1.0
+
+
+# Скорость изменения громкости подложки (доля в секунду) и плавность темпа
+BED_FADE_SPEED = 1.5
+BED_RATE_SMOOTHING = 4.0
+
+
+class SoundBed:
+    """Зацикленная подложка (сердцебиение, фон, дыхание) на постоянном плеере
+
+    Плеер создается один раз; update() каждый кадр плавно подводит громкость
+    и темп к целевым. При нулевой громкости плеер ставится на паузу, а не
+    удаляется, и продолжает с того же места.
+    """
+
+    def __init__(self, handle: AudioHandle):
+        self.handle = handle
+        self.player: Optional[media.Player] = None
+        self.volume = 0.0
+        self.rate = 1.0
+
+    @property
+    def playing(self) -> bool:
+        return self.player is not None and self.player.playing
+
+    def update(self, volume: float, rate: float, delta_time: float):
+        """Подвести громкость и темп к целевым"""
+        step = BED_FADE_SPEED * delta_time
+        self.volume += max(-step, min(step, volume - self.volume))
+        self.rate += (rate - self.rate) * min(1.0, delta_time * BED_RATE_SMOOTHING)
+
+        if self.volume <= 0.001:
+            self.volume = 0.0
+            self.pause()
+            return
+
+        if self.player is None:
+            sound = None if self.handle.pending else self.handle.sound
+            if sound is None:
+                return
+            self.player = media.Player()
+            self.player.loop = True
+            self.player.queue(sound.source)
+
+        self.player.volume = self.volume
+        self.player.pitch = self.rate
+        if not self.player.playing:
+            self.player.play()
+
+    def pause(self):
+        if self.player is not None and self.player.playing:
+            self.player.pause()
+
+    def stop(self):
+        if self.player is not None:
+            self.player.pause()
+            self.player.delete()
+            self.player = None
+        self.volume = 0.0